@@ -0,0 +1,169 @@
+import collections
+import gc
+import hashlib
+import os
+import pickle
+import struct
+import zlib
+
+CACHE_DIR_NAME = '__mcache__'
+GRAMMAR_FILES = ('ast.py', 'mparser.py', 'scanner.py')
+MAGIC = b'MAST1'
+# hits and misses of every run that asked for them, kept next to the entries
+STATS = struct.Struct('<QQ')
+
+
+def grammar_version():
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in GRAMMAR_FILES:
+        with open(os.path.join(directory, name), 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+class ASTCache(object):
+
+    def __init__(self, directory=None, keep_stats=False):
+        self.directory = directory
+        self.keep_stats = keep_stats
+        self.version = grammar_version()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def cache_dir(self, filename):
+        if self.directory is not None:
+            return self.directory
+        return os.path.join(os.path.dirname(os.path.abspath(filename)), CACHE_DIR_NAME)
+
+    def key(self, text):
+        digest = hashlib.sha256(self.version.encode('ascii'))
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def entry_path(self, filename, text):
+        return os.path.join(self.cache_dir(filename),
+                            '{0}.{1}.mast'.format(os.path.basename(filename), self.key(text)))
+
+    def load(self, filename, text):
+        path = self.entry_path(filename, text)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            header = MAGIC + self.version.encode('ascii')
+            if not data.startswith(header):
+                raise ValueError("stale cache entry")
+            ast = self.unpickle(zlib.decompress(data[len(header):]))
+        except FileNotFoundError:
+            self.record(filename, False)
+            return None
+        except Exception:
+            self.errors += 1
+            self.record(filename, False)
+            self.remove(path)
+            return None
+        self.record(filename, True)
+        return ast
+
+    def unpickle(self, data):
+        # the tree is acyclic, so collector passes while it is rebuilt are pure overhead
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(data)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def store(self, filename, text, ast):
+        path = self.entry_path(filename, text)
+        directory = os.path.dirname(path)
+        prefix = os.path.basename(filename) + '.'
+        tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+        try:
+            os.makedirs(directory, exist_ok=True)
+            data = zlib.compress(pickle.dumps(ast, pickle.HIGHEST_PROTOCOL))
+            with open(tmp_path, 'wb') as file:
+                file.write(MAGIC + self.version.encode('ascii') + data)
+            os.replace(tmp_path, path)
+            for name in os.listdir(directory):
+                if name.startswith(prefix) and name.endswith('.mast') and name != os.path.basename(path):
+                    self.remove(os.path.join(directory, name))
+        except (OSError, pickle.PicklingError, RecursionError):
+            self.errors += 1
+            self.remove(tmp_path)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def record(self, filename, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if not self.keep_stats:
+            return
+        hits, misses = self.total_stats(filename)
+        try:
+            directory = self.cache_dir(filename)
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, 'stats'), 'wb') as file:
+                file.write(STATS.pack(hits + hit, misses + (not hit)))
+        except OSError:
+            pass
+
+    def total_stats(self, filename):
+        # anything but a pair of counters (none yet, the old log of one byte per load)
+        # starts again from zero
+        try:
+            with open(os.path.join(self.cache_dir(filename), 'stats'), 'rb') as file:
+                data = file.read()
+        except OSError:
+            return 0, 0
+        if len(data) != STATS.size:
+            return 0, 0
+        return STATS.unpack(data)
+
+    def report(self, filename):
+        hits, misses = self.total_stats(filename)
+        total = hits + misses
+        rate = 100.0 * hits / total if total else 0.0
+        return "AST cache: {0} hits, {1} misses this run; {2} hits, {3} misses in {4} ({5:.1f}% hit rate)".format(
+            self.hits, self.misses, hits, misses, self.cache_dir(filename), rate)
+
+
+class MemoryASTCache(ASTCache):
+    # keeps the most recently used trees pickled in memory, for a process that outlives
+    # many scripts; each load unpickles a fresh copy, as the optimizer changes trees in place
+
+    def __init__(self, size=256):
+        super(MemoryASTCache, self).__init__()
+        self.size = size
+        self.entries = collections.OrderedDict()
+
+    def load(self, filename, text):
+        key = self.key(text)
+        data = self.entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return self.unpickle(data)
+
+    def store(self, filename, text, ast):
+        try:
+            data = pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError):
+            self.errors += 1
+            return
+        self.entries[self.key(text)] = data
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def report(self, filename=None):
+        return "AST cache: {0} hits, {1} misses, {2} trees in memory".format(self.hits, self.misses, len(self.entries))
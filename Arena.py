@@ -0,0 +1,212 @@
+import array
+import ast
+
+# per node kind: the child attributes in storage order (a trailing '*' marks a
+# list, which is then the only child attribute) and the attribute kept as payload
+LAYOUT = (
+    (ast.ConstValueNode, (), 'value'),
+    (ast.IdNode, (), 'value'),
+    (ast.ProgramNode, ('instructions*',), None),
+    (ast.BlockNode, ('instructions*',), None),
+    (ast.RangeNode, ('start', 'end', 'jump'), None),
+    (ast.ForNode, ('id', 'range', 'body'), None),
+    (ast.WhileNode, ('condition', 'body'), None),
+    (ast.IfNode, ('condition', 'body'), None),
+    (ast.IfElseNode, ('condition', 'body', 'else_body'), None),
+    (ast.BreakNode, (), None),
+    (ast.ContinueNode, (), None),
+    (ast.ReturnNode, ('result',), None),
+    (ast.PrintNode, ('printable',), None),
+    (ast.ConditionNode, ('left', 'right'), 'operator'),
+    (ast.AssignmentNode, ('left', 'right'), 'operator'),
+    (ast.AssignToNode, ('id',), None),
+    (ast.AccessNode, ('id', 'specifier'), None),
+    (ast.ExpressionNode, ('left', 'right'), 'operator'),
+    (ast.TranspositionNode, ('value',), None),
+    (ast.NegationNode, ('value',), None),
+    (ast.FunctionNode, ('argument',), 'name'),
+    (ast.MatrixNode, ('rows*',), None),
+    (ast.SequenceNode, ('values*',), None),
+    (ast.HoistedNode, ('value',), 'name'),
+    (ast.SharedNode, ('value',), 'name'),
+    (ast.FusedNode, ('operands*',), 'kernel'),
+    (ast.ErrorNode, (), None),
+)
+
+KINDS = {cls: kind for kind, (cls, fields, payload) in enumerate(LAYOUT)}
+
+# per node kind: the attributes the arrays above hold, so the rest are annotations
+STORED = [frozenset([field.rstrip('*') for field in fields] + [payload, 'lineno'])
+          for cls, fields, payload in LAYOUT]
+
+NONE = -1
+MISSING = object()
+
+# views made since the cache was last emptied; a loop body run over and over keeps
+# getting the same views, while a walk of the whole tree never holds one per node
+CACHED_VIEWS = 4096
+
+
+class Arena(object):
+    # the whole tree in parallel arrays; node i has kind kinds[i], line lines[i],
+    # payload values[i] and children children[first[i]:first[i] + count[i]]
+    def __init__(self):
+        self.kinds = array.array('B')
+        self.lines = array.array('i')
+        self.first = array.array('i')
+        self.count = array.array('i')
+        self.children = array.array('i')
+        self.values = []
+        self.annotations = {}
+        self.root = NONE
+        self.views = {}
+        self.lists = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, node):
+        # children are stored before their parent, so the root ends up last; a view of
+        # this arena is already stored, which lets a rewritten node keep its children
+        if node is None:
+            return NONE
+        if isinstance(node, NodeView) and node.arena is self:
+            return node.index
+        kind = KINDS[node.__class__]
+        cls, fields, payload = LAYOUT[kind]
+        if fields and fields[0].endswith('*'):
+            indices = [self.add(child) for child in getattr(node, fields[0][:-1])]
+        else:
+            indices = [self.add(getattr(node, field)) for field in fields]
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.lines.append(getattr(node, 'lineno', 0))
+        self.first.append(len(self.children))
+        self.count.append(len(indices))
+        self.children.extend(indices)
+        self.values.append(getattr(node, payload) if payload is not None else None)
+        for name in cls.__slots__:
+            if name not in STORED[kind] and hasattr(node, name):
+                self.annotate(name, index, getattr(node, name))
+        return index
+
+    def child_list(self, index):
+        children = self.lists.get(index)
+        if children is None:
+            start = self.first[index]
+            children = [self.view(child) for child in self.children[start:start + self.count[index]]]
+            self.cache(self.lists, index, children)
+        return children
+
+    def replace_child(self, index, position, node):
+        self.children[self.first[index] + position] = self.add(node)
+        self.lists.pop(index, None)
+
+    def replace_child_list(self, index, nodes):
+        # a list no longer than the old one is written over it, a longer one appended
+        indices = array.array('i', [self.add(node) for node in nodes])
+        if len(indices) <= self.count[index]:
+            start = self.first[index]
+            self.children[start:start + len(indices)] = indices
+        else:
+            self.first[index] = len(self.children)
+            self.children.extend(indices)
+        self.count[index] = len(indices)
+        self.lists.pop(index, None)
+
+    def view(self, index):
+        view = self.views.get(index)
+        if view is None:
+            if index == NONE:
+                return None
+            view = self.cache(self.views, index, VIEWS[self.kinds[index]](self, index))
+        return view
+
+    @staticmethod
+    def cache(table, index, value):
+        if len(table) >= CACHED_VIEWS:
+            table.clear()
+        table[index] = value
+        return value
+
+    def tree(self):
+        return self.view(self.root)
+
+    def annotate(self, name, index, value):
+        annotation = self.annotations.setdefault(name, [])
+        if len(annotation) <= index:
+            annotation.extend([MISSING] * (len(self.kinds) - len(annotation)))
+        annotation[index] = value
+
+    def nbytes(self):
+        size = sum(a.itemsize * len(a) for a in (self.kinds, self.lines, self.first, self.count, self.children))
+        return size + 8 * (len(self.values) + sum(len(a) for a in self.annotations.values()))
+
+
+def flatten(node):
+    arena = Arena()
+    arena.root = arena.add(node)
+    return arena
+
+
+class NodeView(object):
+    # a stand-in for one arena entry; it subclasses the node class it replaces, so every
+    # visitor dispatches on it unchanged, and assigning a child stores it in the arena
+    __slots__ = ()
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+
+def child_property(position):
+    # read through the cached list of children: the tree engine reads a child on every step
+    def get(self):
+        children = self.arena.lists.get(self.index)
+        if children is None:
+            children = self.arena.child_list(self.index)
+        return children[position]
+    return property(get, lambda self, node: self.arena.replace_child(self.index, position, node))
+
+
+def list_property():
+    def get(self):
+        children = self.arena.lists.get(self.index)
+        return children if children is not None else self.arena.child_list(self.index)
+    return property(get, lambda self, nodes: self.arena.replace_child_list(self.index, nodes))
+
+
+def payload_property():
+    return property(lambda self: self.arena.values[self.index])
+
+
+def annotation_property(name):
+    def get(self):
+        values = self.arena.annotations.get(name)
+        value = values[self.index] if values is not None and self.index < len(values) else MISSING
+        if value is MISSING:
+            raise AttributeError(name)
+        return value
+    return property(get,
+                    lambda self, value: self.arena.annotate(name, self.index, value))
+
+
+def make_view(cls, fields, payload):
+    namespace = {
+        '__slots__': ('arena', 'index'),
+        'lineno': property(lambda self: self.arena.lines[self.index]),
+    }
+    for position, field in enumerate(fields):
+        if field.endswith('*'):
+            namespace[field[:-1]] = list_property()
+        else:
+            namespace[field] = child_property(position)
+    if payload is not None:
+        namespace[payload] = payload_property()
+    for name in cls.__slots__:
+        if name not in namespace:
+            namespace[name] = annotation_property(name)
+    return type(cls.__name__ + 'View', (NodeView, cls), namespace)
+
+
+VIEWS = [make_view(cls, fields, payload) for cls, fields, payload in LAYOUT]
@@ -0,0 +1,132 @@
+import collections
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+import traceback
+
+from ASTCache import ASTCache, CACHE_DIR_NAME
+from Interpreter import use_backend
+from mparser import make_parser
+from Session import Session, optimize
+from TypeChecker import TypeChecker
+
+SUFFIX = '.m'
+
+Result = collections.namedtuple('Result', 'path status output elapsed')
+
+# the runner of this process; forked workers inherit the parent's, parser tables included
+runner = None
+
+
+def collect(target):
+    # a directory is searched for .m files, anything else is a manifest listing one path
+    # per line, relative to the manifest itself
+    if os.path.isdir(target):
+        paths = []
+        for directory, names, files in os.walk(target):
+            names[:] = sorted(name for name in names if name != CACHE_DIR_NAME)
+            paths.extend(os.path.join(directory, name) for name in sorted(files) if name.endswith(SUFFIX))
+        return paths
+    base = os.path.dirname(os.path.abspath(target))
+    with open(target) as file:
+        lines = [line.strip() for line in file]
+    return [os.path.join(base, line) for line in lines if line and not line.startswith('#')]
+
+
+class BatchRunner(object):
+    # runs every script the way main.py would, but in a pool of long-lived workers that
+    # share one set of parser tables instead of paying start-up once per script
+
+    def __init__(self, engine='tree', optimize=True, cache=True, jobs=None, backend='python'):
+        self.engine = engine
+        self.backend = backend
+        self.optimize = optimize
+        self.cache = ASTCache() if cache else None
+        self.jobs = jobs or os.cpu_count() or 1
+        self.m_parser, self.parser = make_parser()
+
+    def parse(self, path, text):
+        ast = self.cache.load(path, text) if self.cache is not None else None
+        if ast is None:
+            m_parser = self.m_parser
+            m_parser.error = False
+            m_parser.scanner.lexer.lineno = 1
+            ast = self.parser.parse(text, lexer=m_parser.scanner)
+            if m_parser.error:
+                return None
+            if self.cache is not None:
+                self.cache.store(path, text, ast)
+        return ast
+
+    def execute(self, path):
+        # the exit status main.py would have finished with
+        try:
+            with open(path) as file:
+                text = file.read()
+        except IOError:
+            print("Cannot open {0} file".format(path))
+            return 0
+        return self.execute_source(path, text)
+
+    def execute_source(self, path, text):
+        try:
+            ast = self.parse(path, text)
+            if ast is None:
+                return 1
+            type_checker = TypeChecker()
+            type_checker.visit(ast)
+            if type_checker.errors:
+                return 1
+            if self.optimize:
+                ast = optimize(ast)
+            Session(self.engine).execute(ast)
+        except Exception:
+            traceback.print_exc()
+            return 1
+        return 0
+
+    def capture(self, path, execute, *arguments):
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            status = execute(*arguments)
+        return Result(path, status, output.getvalue(), time.perf_counter() - start)
+
+    def run_file(self, path):
+        return self.capture(path, self.execute, path)
+
+    def run_source(self, path, text):
+        return self.capture(path, self.execute_source, path, text)
+
+    def run(self, paths):
+        # results come back in the order of paths, while the workers keep busy out of order
+        global runner
+        if self.jobs == 1:
+            for path in paths:
+                yield self.run_file(path)
+            return
+        runner = self
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+            initializer, arguments = None, ()
+        else:
+            context = multiprocessing.get_context()
+            initializer = start_worker
+            arguments = self.engine, self.optimize, self.cache is not None, self.backend
+        chunk_size = max(1, min(16, len(paths) // (self.jobs * 8)))
+        with context.Pool(self.jobs, initializer, arguments) as pool:
+            for result in pool.imap(run_in_worker, paths, chunk_size):
+                yield result
+
+
+def start_worker(engine, optimize, cache, backend):
+    # only needed where workers cannot be forked and start from nothing
+    global runner
+    use_backend(backend)
+    runner = BatchRunner(engine, optimize, cache, 1, backend)
+
+
+def run_in_worker(path):
+    return runner.run_file(path)
@@ -0,0 +1,349 @@
+import ast
+from Interpreter import ExpressionDict, AssignmentDict, FunctionDict, ConditionDict, get_backend, store_item
+from Exceptions import *
+from Memory import UNSET, FrameStack, locate
+from Output import Output
+from visit import *
+
+
+def run_all(statements):
+    if len(statements) == 1:
+        return statements[0]
+
+    def run(env):
+        for statement in statements:
+            status = statement(env)
+            if status:
+                return status
+        return NORMAL
+
+    return run
+
+
+def in_frame(fn, size):
+    def run(env):
+        env.append([UNSET] * size)
+        try:
+            return fn(env)
+        finally:
+            env.pop()
+
+    return run
+
+
+def binary(operator, left, right):
+    if operator == '+':
+        return lambda env: left(env) + right(env)
+    if operator == '-':
+        return lambda env: left(env) - right(env)
+    if operator == '<':
+        return lambda env: left(env) < right(env)
+    if operator == '>':
+        return lambda env: left(env) > right(env)
+    if operator == '<=':
+        return lambda env: left(env) <= right(env)
+    if operator == '>=':
+        return lambda env: left(env) >= right(env)
+    if operator == '==':
+        return lambda env: left(env) == right(env)
+    if operator == '!=':
+        return lambda env: left(env) != right(env)
+    op = ExpressionDict[operator] if operator in ExpressionDict else ConditionDict[operator]
+    return lambda env: op(left(env), right(env))
+
+
+def load(slots):
+    if not slots:
+        return lambda env: None
+    if len(slots) == 1:
+        (depth, slot), = slots
+
+        def run(env):
+            value = env[depth][slot]
+            return None if value is UNSET else value
+
+        return run
+
+    def run(env):
+        for depth, slot in slots:
+            value = env[depth][slot]
+            if value is not UNSET:
+                return value
+        return None
+
+    return run
+
+
+class ClosureCompiler(object):
+
+    def __init__(self, output=None):
+        self.backend = get_backend()
+        self.loop_depth = 0
+        self.frames = FrameStack()
+        self.output = output if output is not None else Output()
+
+    def compile(self, node):
+        return node.accept(self)
+
+    def loop_body(self, node):
+        self.loop_depth += 1
+        try:
+            return node.accept(self)
+        finally:
+            self.loop_depth -= 1
+
+    def run(self, node):
+        self.frames.reserve(node.frame_size)
+        self.compile(node)(self.frames.frames)
+
+    @on('node')
+    def visit(self, node):
+        pass
+
+    @when(ast.ConstValueNode)
+    def visit(self, node):
+        value = node.value
+        return lambda env: value
+
+    @when(ast.IdNode)
+    def visit(self, node):
+        return load(node.slots)
+
+    @when(ast.ProgramNode)
+    def visit(self, node):
+        return run_all([instruction.accept(self) for instruction in node.instructions])
+
+    @when(ast.BlockNode)
+    def visit(self, node):
+        return run_all([instruction.accept(self) for instruction in node.instructions])
+
+    @when(ast.RangeNode)
+    def visit(self, node):
+        start = node.start.accept(self)
+        end = node.end.accept(self)
+        jump = node.jump.accept(self)
+        return lambda env: range(start(env), end(env) + 1, jump(env))
+
+    @when(ast.ForNode)
+    def visit(self, node):
+        slot = node.slot
+        size = node.frame_size
+        values = node.range.accept(self)
+        body = self.loop_body(node.body)
+
+        def run(env):
+            frame = [UNSET] * size
+            env.append(frame)
+            try:
+                for i in values(env):
+                    frame[slot] = i
+                    status = body(env)
+                    if status and status != CONTINUE:
+                        break
+            finally:
+                env.pop()
+
+        return run
+
+    @when(ast.WhileNode)
+    def visit(self, node):
+        condition = node.condition.accept(self)
+        body = self.loop_body(node.body)
+        size = node.frame_size
+
+        def run(env):
+            env.append([UNSET] * size)
+            try:
+                while condition(env):
+                    status = body(env)
+                    if status and status != CONTINUE:
+                        break
+            finally:
+                env.pop()
+
+        return run
+
+    @when(ast.IfNode)
+    def visit(self, node):
+        condition = node.condition.accept(self)
+        body = node.body.accept(self)
+
+        def run(env):
+            if condition(env):
+                return body(env)
+
+        return in_frame(run, node.frame_size)
+
+    @when(ast.IfElseNode)
+    def visit(self, node):
+        condition = node.condition.accept(self)
+        body = node.body.accept(self)
+        else_body = node.else_body.accept(self)
+
+        def run(env):
+            if condition(env):
+                return body(env)
+            return else_body(env)
+
+        return in_frame(run, node.frame_size)
+
+    @when(ast.BreakNode)
+    def visit(self, node):
+        if not self.loop_depth:
+            def fail(env):
+                raise BreakException()
+
+            return fail
+        return lambda env: BREAK
+
+    @when(ast.ContinueNode)
+    def visit(self, node):
+        if not self.loop_depth:
+            def fail(env):
+                raise ContinueException()
+
+            return fail
+        return lambda env: CONTINUE
+
+    @when(ast.ReturnNode)
+    def visit(self, node):
+        result = node.result.accept(self)
+        if not self.loop_depth:
+            def fail(env):
+                raise ReturnValueException(result(env))
+
+            return fail
+
+        def run(env):
+            # return only leaves the innermost loop, so its value is never observed
+            result(env)
+            return RETURN
+
+        return run
+
+    @when(ast.PrintNode)
+    def visit(self, node):
+        printable = node.printable.accept(self)
+        convert = self.backend.printable
+        line = self.output.line
+
+        def run(env):
+            line(printable(env), convert)
+
+        return run
+
+    @when(ast.ConditionNode)
+    def visit(self, node):
+        return binary(node.operator, node.left.accept(self), node.right.accept(self))
+
+    @when(ast.AssignmentNode)
+    def visit(self, node):
+        target = node.left.id
+        if isinstance(target, ast.AccessNode):
+            right = node.right.accept(self)
+            specifier = target.specifier.accept(self)
+            slots = target.id.slots
+            op = AssignmentDict[node.operator]
+
+            def run(env):
+                indices = specifier(env)
+                value = right(env)
+                frame, slot = locate(env, slots)
+                store_item(frame, slot, indices, op, value)
+
+            return run
+        try:
+            depth, slot = node.left.depth, node.left.slot
+        except AttributeError as e:
+            error = e
+
+            def fail(env):
+                raise error
+
+            return fail
+        right = node.right.accept(self)
+        if node.operator == '=':
+            def run(env):
+                env[depth][slot] = right(env)
+        else:
+            left = load(node.left.id.slots)
+            op = AssignmentDict[node.operator]
+
+            def run(env):
+                env[depth][slot] = op(left(env), right(env))
+
+        return run
+
+    @when(ast.AccessNode)
+    def visit(self, node):
+        matrix = node.id.accept(self)
+        specifier = node.specifier.accept(self)
+        index = self.backend.index
+        return lambda env: index(matrix(env), specifier(env))
+
+    @when(ast.ExpressionNode)
+    def visit(self, node):
+        return binary(node.operator, node.left.accept(self), node.right.accept(self))
+
+    @when(ast.TranspositionNode)
+    def visit(self, node):
+        value = node.value.accept(self)
+        transpose = self.backend.transpose
+        return lambda env: transpose(value(env))
+
+    @when(ast.NegationNode)
+    def visit(self, node):
+        value = node.value.accept(self)
+        return lambda env: -value(env)
+
+    @when(ast.FunctionNode)
+    def visit(self, node):
+        fn = FunctionDict[node.name]
+        argument = node.argument.accept(self)
+        return lambda env: fn(argument(env))
+
+    @when(ast.MatrixNode)
+    def visit(self, node):
+        rows = [row.accept(self) for row in node.rows]
+        matrix = self.backend.matrix
+        return lambda env: matrix([row(env) for row in rows])
+
+    @when(ast.SequenceNode)
+    def visit(self, node):
+        values = [value.accept(self) for value in node.values]
+        return lambda env: [value(env) for value in values]
+
+    @when(ast.HoistedNode)
+    def visit(self, node):
+        value = node.value.accept(self)
+        depth, slot = node.depth, node.slot
+
+        def run(env):
+            frame = env[depth]
+            cached = frame[slot]
+            if cached is UNSET:
+                cached = frame[slot] = value(env)
+            return cached
+
+        return run
+
+    @when(ast.SharedNode)
+    def visit(self, node):
+        value = node.value.accept(self)
+        depth, slot = node.depth, node.slot
+
+        def run(env):
+            result = env[depth][slot] = value(env)
+            return result
+
+        return run
+
+    @when(ast.FusedNode)
+    def visit(self, node):
+        operands = [operand.accept(self) for operand in node.operands]
+        kernel = node.kernel
+        return lambda env: kernel([operand(env) for operand in operands])
+
+    @when(ast.ErrorNode)
+    def visit(self, node):
+        return lambda env: None
@@ -0,0 +1,374 @@
+import ast
+from Interpreter import ExpressionDict, AssignmentDict, FunctionDict, bounded_range
+from visit import *
+
+(LOAD_CONST, LOAD_NAME, STORE_NAME, POP_TOP,
+ BINARY_ADD, BINARY_SUBTRACT, BINARY_OP,
+ COMPARE_LT, COMPARE_LE, COMPARE_GT, COMPARE_GE, COMPARE_EQ, COMPARE_NE,
+ UNARY_NEGATIVE, TRANSPOSE, CALL_FUNCTION, BUILD_LIST, BUILD_MATRIX, INDEX, STORE_ITEM, PRINT,
+ PUSH_FRAME, POP_FRAMES, JUMP, POP_JUMP_IF_FALSE, GET_RANGE, FOR_ITER,
+ RAISE_BREAK, RAISE_CONTINUE, RAISE_RETURN, RAISE_ERROR,
+ LOAD_CACHED, JUMP_IF_CACHED, DUP_TOP, HALT, LOAD_SLOT) = range(36)
+
+OPNAMES = ['LOAD_CONST', 'LOAD_NAME', 'STORE_NAME', 'POP_TOP',
+           'BINARY_ADD', 'BINARY_SUBTRACT', 'BINARY_OP',
+           'COMPARE_LT', 'COMPARE_LE', 'COMPARE_GT', 'COMPARE_GE', 'COMPARE_EQ', 'COMPARE_NE',
+           'UNARY_NEGATIVE', 'TRANSPOSE', 'CALL_FUNCTION', 'BUILD_LIST', 'BUILD_MATRIX', 'INDEX', 'STORE_ITEM', 'PRINT',
+           'PUSH_FRAME', 'POP_FRAMES', 'JUMP', 'POP_JUMP_IF_FALSE', 'GET_RANGE', 'FOR_ITER',
+           'RAISE_BREAK', 'RAISE_CONTINUE', 'RAISE_RETURN', 'RAISE_ERROR',
+           'LOAD_CACHED', 'JUMP_IF_CACHED', 'DUP_TOP', 'HALT', 'LOAD_SLOT']
+
+CompareOpcodes = {
+    '<': COMPARE_LT,
+    '<=': COMPARE_LE,
+    '>': COMPARE_GT,
+    '>=': COMPARE_GE,
+    '==': COMPARE_EQ,
+    '!=': COMPARE_NE,
+}
+
+
+class CodeObject(object):
+    def __init__(self, ops, args, lines, consts, names, slots, frame_size):
+        self.ops = ops
+        self.args = args
+        self.lines = lines
+        self.consts = consts
+        self.names = names
+        self.slots = slots
+        self.frame_size = frame_size
+
+    def __len__(self):
+        return len(self.ops)
+
+
+class Loop(object):
+    def __init__(self, depth, has_iterator):
+        self.depth = depth
+        self.has_iterator = has_iterator
+        self.break_jumps = []
+        self.continue_jumps = []
+
+
+class Compiler(object):
+
+    def __init__(self):
+        self.ops = []
+        self.args = []
+        self.lines = []
+        self.consts = []
+        self.const_index = {}
+        self.names = []
+        self.slots = []
+        self.name_index = {}
+        self.loops = []
+        self.depth = 0
+
+    def compile(self, node):
+        node.accept(self)
+        self.emit(HALT, 0, getattr(node, 'lineno', 0))
+        return CodeObject(self.ops, self.args, self.lines, self.consts, self.names, self.slots,
+                          getattr(node, 'frame_size', 0))
+
+    def emit(self, op, arg, lineno):
+        self.ops.append(op)
+        self.args.append(arg)
+        self.lines.append(lineno)
+        return len(self.ops) - 1
+
+    def patch(self, position, target=None):
+        self.args[position] = len(self.ops) if target is None else target
+
+    def const(self, value):
+        if callable(value):
+            key = id(value)
+        elif type(value) is float:
+            # 0.0 == -0.0, but they print differently
+            key = (float, repr(value))
+        else:
+            key = (type(value), value)
+        if key not in self.const_index:
+            self.const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return self.const_index[key]
+
+    def name(self, name, slots):
+        # one entry per distinct candidate list, so a name may appear more than once
+        key = (name, slots)
+        if key not in self.name_index:
+            self.name_index[key] = len(self.names)
+            self.names.append(name)
+            self.slots.append(slots)
+        return self.name_index[key]
+
+    def load(self, name, slots, lineno):
+        # a name only one frame can hold is read from that slot, without a search
+        self.emit(LOAD_SLOT if len(slots) == 1 else LOAD_NAME, self.name(name, slots), lineno)
+
+    def unwind(self, loop, lineno):
+        if self.depth > loop.depth:
+            self.emit(POP_FRAMES, self.depth - loop.depth, lineno)
+
+    def leave_loop(self, lineno):
+        loop = self.loops[-1]
+        self.unwind(loop, lineno)
+        if loop.has_iterator:
+            self.emit(POP_TOP, 0, lineno)
+        loop.break_jumps.append(self.emit(JUMP, 0, lineno))
+
+    @on('node')
+    def visit(self, node):
+        pass
+
+    @when(ast.ConstValueNode)
+    def visit(self, node):
+        self.emit(LOAD_CONST, self.const(node.value), node.lineno)
+
+    @when(ast.IdNode)
+    def visit(self, node):
+        self.load(node.value, node.slots, node.lineno)
+
+    @when(ast.ProgramNode)
+    def visit(self, node):
+        for instruction in node.instructions:
+            instruction.accept(self)
+
+    @when(ast.BlockNode)
+    def visit(self, node):
+        for instruction in node.instructions:
+            instruction.accept(self)
+
+    @when(ast.RangeNode)
+    def visit(self, node):
+        node.start.accept(self)
+        node.end.accept(self)
+        node.jump.accept(self)
+        self.emit(GET_RANGE, 0, node.lineno)
+
+    @when(ast.ForNode)
+    def visit(self, node):
+        self.emit(PUSH_FRAME, node.frame_size, node.lineno)
+        self.depth += 1
+        node.range.accept(self)
+        loop = Loop(self.depth, True)
+        start = self.emit(FOR_ITER, 0, node.lineno)
+        self.emit(STORE_NAME, self.name(node.id.value, ((self.depth, node.slot),)), node.lineno)
+        self.loops.append(loop)
+        node.body.accept(self)
+        self.loops.pop()
+        self.emit(JUMP, start, node.lineno)
+        self.patch(start)
+        for position in loop.break_jumps:
+            self.patch(position)
+        for position in loop.continue_jumps:
+            self.patch(position, start)
+        self.depth -= 1
+        self.emit(POP_FRAMES, 1, node.lineno)
+
+    @when(ast.WhileNode)
+    def visit(self, node):
+        self.emit(PUSH_FRAME, node.frame_size, node.lineno)
+        self.depth += 1
+        loop = Loop(self.depth, False)
+        start = len(self.ops)
+        node.condition.accept(self)
+        exit_jump = self.emit(POP_JUMP_IF_FALSE, 0, node.lineno)
+        self.loops.append(loop)
+        node.body.accept(self)
+        self.loops.pop()
+        self.emit(JUMP, start, node.lineno)
+        self.patch(exit_jump)
+        for position in loop.break_jumps:
+            self.patch(position)
+        for position in loop.continue_jumps:
+            self.patch(position, start)
+        self.depth -= 1
+        self.emit(POP_FRAMES, 1, node.lineno)
+
+    @when(ast.IfNode)
+    def visit(self, node):
+        self.emit(PUSH_FRAME, node.frame_size, node.lineno)
+        self.depth += 1
+        node.condition.accept(self)
+        skip_jump = self.emit(POP_JUMP_IF_FALSE, 0, node.lineno)
+        node.body.accept(self)
+        self.patch(skip_jump)
+        self.depth -= 1
+        self.emit(POP_FRAMES, 1, node.lineno)
+
+    @when(ast.IfElseNode)
+    def visit(self, node):
+        self.emit(PUSH_FRAME, node.frame_size, node.lineno)
+        self.depth += 1
+        node.condition.accept(self)
+        else_jump = self.emit(POP_JUMP_IF_FALSE, 0, node.lineno)
+        node.body.accept(self)
+        end_jump = self.emit(JUMP, 0, node.lineno)
+        self.patch(else_jump)
+        node.else_body.accept(self)
+        self.patch(end_jump)
+        self.depth -= 1
+        self.emit(POP_FRAMES, 1, node.lineno)
+
+    @when(ast.BreakNode)
+    def visit(self, node):
+        if not self.loops:
+            self.emit(RAISE_BREAK, 0, node.lineno)
+        else:
+            self.leave_loop(node.lineno)
+
+    @when(ast.ContinueNode)
+    def visit(self, node):
+        if not self.loops:
+            self.emit(RAISE_CONTINUE, 0, node.lineno)
+        else:
+            loop = self.loops[-1]
+            self.unwind(loop, node.lineno)
+            loop.continue_jumps.append(self.emit(JUMP, 0, node.lineno))
+
+    @when(ast.ReturnNode)
+    def visit(self, node):
+        node.result.accept(self)
+        if not self.loops:
+            self.emit(RAISE_RETURN, 0, node.lineno)
+        else:
+            # like the tree interpreter, return only leaves the innermost loop
+            self.emit(POP_TOP, 0, node.lineno)
+            self.leave_loop(node.lineno)
+
+    @when(ast.PrintNode)
+    def visit(self, node):
+        for value in node.printable.values:
+            value.accept(self)
+        self.emit(PRINT, len(node.printable.values), node.lineno)
+
+    @when(ast.ConditionNode)
+    def visit(self, node):
+        node.left.accept(self)
+        node.right.accept(self)
+        self.emit(CompareOpcodes[node.operator], 0, node.lineno)
+
+    @when(ast.AssignmentNode)
+    def visit(self, node):
+        target = node.left.id
+        if isinstance(target, ast.AccessNode):
+            # indices, value and the op= function, stored through the matrix's own slots
+            self.indices(target.specifier)
+            self.emit(BUILD_LIST, len(target.specifier.values), node.lineno)
+            node.right.accept(self)
+            self.emit(LOAD_CONST, self.const(AssignmentDict[node.operator]), node.lineno)
+            self.emit(STORE_ITEM, self.name(target.id.value, target.id.slots), node.lineno)
+            return
+        try:
+            name = self.name(node.left.id.value, ((node.left.depth, node.left.slot),))
+        except AttributeError as e:
+            # the tree interpreter fails at runtime here, so defer the error too
+            self.emit(RAISE_ERROR, self.const(e), node.lineno)
+            return
+        if node.operator == '=':
+            node.right.accept(self)
+        else:
+            self.load(node.left.id.value, node.left.id.slots, node.lineno)
+            node.right.accept(self)
+            self.emit(BINARY_OP, self.const(AssignmentDict[node.operator]), node.lineno)
+        self.emit(STORE_NAME, name, node.lineno)
+
+    @when(ast.AccessNode)
+    def visit(self, node):
+        node.id.accept(self)
+        self.indices(node.specifier)
+        self.emit(INDEX, len(node.specifier.values), node.lineno)
+
+    def indices(self, specifier):
+        for value in specifier.values:
+            if isinstance(value, ast.RangeNode):
+                # a range to slice with, not an iterator like a for loop's
+                value.start.accept(self)
+                value.end.accept(self)
+                value.jump.accept(self)
+                self.emit(BUILD_LIST, 3, value.lineno)
+                self.emit(CALL_FUNCTION, self.const(bounded_range), value.lineno)
+            else:
+                value.accept(self)
+
+    @when(ast.ExpressionNode)
+    def visit(self, node):
+        node.left.accept(self)
+        node.right.accept(self)
+        if node.operator == '+':
+            self.emit(BINARY_ADD, 0, node.lineno)
+        elif node.operator == '-':
+            self.emit(BINARY_SUBTRACT, 0, node.lineno)
+        else:
+            self.emit(BINARY_OP, self.const(ExpressionDict[node.operator]), node.lineno)
+
+    @when(ast.TranspositionNode)
+    def visit(self, node):
+        node.value.accept(self)
+        self.emit(TRANSPOSE, 0, node.lineno)
+
+    @when(ast.NegationNode)
+    def visit(self, node):
+        node.value.accept(self)
+        self.emit(UNARY_NEGATIVE, 0, node.lineno)
+
+    @when(ast.FunctionNode)
+    def visit(self, node):
+        node.argument.accept(self)
+        self.emit(CALL_FUNCTION, self.const(FunctionDict[node.name]), node.lineno)
+        if node.name == 'save':
+            # a statement, so nothing takes what the call leaves
+            self.emit(POP_TOP, 0, node.lineno)
+
+    @when(ast.MatrixNode)
+    def visit(self, node):
+        for row in node.rows:
+            row.accept(self)
+        self.emit(BUILD_MATRIX, len(node.rows), node.lineno)
+
+    @when(ast.SequenceNode)
+    def visit(self, node):
+        for value in node.values:
+            value.accept(self)
+        self.emit(BUILD_LIST, len(node.values), node.lineno)
+
+    @when(ast.HoistedNode)
+    def visit(self, node):
+        name = self.name(node.name, ((node.depth, node.slot),))
+        self.emit(LOAD_CACHED, name, node.lineno)
+        cached_jump = self.emit(JUMP_IF_CACHED, 0, node.lineno)
+        node.value.accept(self)
+        self.emit(DUP_TOP, 0, node.lineno)
+        self.emit(STORE_NAME, name, node.lineno)
+        self.patch(cached_jump)
+
+    @when(ast.SharedNode)
+    def visit(self, node):
+        node.value.accept(self)
+        self.emit(DUP_TOP, 0, node.lineno)
+        self.emit(STORE_NAME, self.name(node.name, ((node.depth, node.slot),)), node.lineno)
+
+    @when(ast.FusedNode)
+    def visit(self, node):
+        for operand in node.operands:
+            operand.accept(self)
+        self.emit(BUILD_LIST, len(node.operands), node.lineno)
+        self.emit(CALL_FUNCTION, self.const(node.kernel), node.lineno)
+
+    @when(ast.ErrorNode)
+    def visit(self, node):
+        pass
+
+
+def disassemble(code):
+    lines = []
+    for pc in range(len(code)):
+        op, arg = code.ops[pc], code.args[pc]
+        if op == LOAD_CONST:
+            detail = repr(code.consts[arg])
+        elif op in (LOAD_NAME, LOAD_SLOT, STORE_NAME, LOAD_CACHED, STORE_ITEM):
+            detail = '{0} {1}'.format(code.names[arg], code.slots[arg])
+        else:
+            detail = str(arg)
+        lines.append('{0:4} {1:5} {2:18} {3}'.format(code.lines[pc], pc, OPNAMES[op], detail))
+    return '\n'.join(lines)
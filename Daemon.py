@@ -0,0 +1,136 @@
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import threading
+
+
+# every message is a JSON object preceded by its length as a 4 byte big-endian integer
+HEADER = struct.Struct('>I')
+
+
+def send_message(connection, message):
+    data = json.dumps(message).encode('utf-8')
+    connection.sendall(HEADER.pack(len(data)) + data)
+
+
+def receive_exactly(connection, size):
+    chunks = []
+    while size:
+        chunk = connection.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def receive_message(connection):
+    header = receive_exactly(connection, HEADER.size)
+    if header is None:
+        return None
+    data = receive_exactly(connection, HEADER.unpack(header)[0])
+    if data is None:
+        return None
+    return json.loads(data.decode('utf-8'))
+
+
+def remove_stale_socket(path):
+    # a socket nothing answers on is left over from a daemon that did not shut down
+    # cleanly; a live daemon's socket, or anything that is not a socket, stays
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError("{0} exists and is not a socket".format(path))
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.remove(path)
+        return
+    finally:
+        probe.close()
+    raise FileExistsError("a daemon is already serving {0}".format(path))
+
+
+class RequestHandler(socketserver.BaseRequestHandler):
+    # a connection may send any number of requests: {"name": ..., "source": ...}
+    # each one is answered with {"status": ..., "output": ..., "elapsed": ...}
+
+    def handle(self):
+        while True:
+            try:
+                request = receive_message(self.request)
+            except ValueError:
+                send_message(self.request, {'error': 'malformed request'})
+                return
+            if request is None:
+                return
+            send_message(self.request, self.server.execute(request))
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    # parser tables, dispatch tables and parsed trees stay warm between requests; every
+    # script still gets its own session, so nothing leaks from one request to the next.
+    # Connections are served by threads, scripts run one at a time, since output is
+    # captured by swapping the process wide sys.stdout
+
+    daemon_threads = True
+
+    def __init__(self, path, engine='tree', optimize=True, cache=True, backend='python'):
+        # the engines and the cache only in the daemon, not in a client talking to it
+        from ASTCache import MemoryASTCache
+        from Batch import BatchRunner
+        self.runner = BatchRunner(engine, optimize, False, 1, backend)
+        if cache:
+            self.runner.cache = MemoryASTCache()
+        self.lock = threading.Lock()
+        remove_stale_socket(path)
+        socketserver.UnixStreamServer.__init__(self, path, RequestHandler)
+
+    def execute(self, request):
+        if not isinstance(request, dict):
+            return {'error': 'a request has to be an object'}
+        name = request.get('name', '<request>')
+        source = request.get('source')
+        if not isinstance(source, str):
+            return {'error': 'request has no source'}
+        if not isinstance(name, str):
+            return {'error': 'request name has to be a string'}
+        with self.lock:
+            result = self.runner.run_source(name, source)
+        return {'status': result.status, 'output': result.output, 'elapsed': result.elapsed}
+
+    def serve(self):
+        # a plain kill cleans up like ^C does
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server_close()
+            os.remove(self.server_address)
+
+
+class Client(object):
+
+    def __init__(self, path):
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(path)
+
+    def run(self, source, name='<request>'):
+        send_message(self.connection, {'name': name, 'source': source})
+        response = receive_message(self.connection)
+        if response is None:
+            raise ConnectionError("daemon closed the connection")
+        return response
+
+    def close(self):
+        self.connection.close()
@@ -9,3 +9,16 @@ class BreakException(Exception):
 
 class ContinueException(Exception):
     pass
+
+
+# completion status returned by statements; anything false means the statement finished normally
+NORMAL, BREAK, CONTINUE, RETURN = range(4)
+
+
+def signal_exception(status, value=None):
+    # a break/continue/return that escaped every loop still fails like it always has
+    if status == BREAK:
+        return BreakException()
+    if status == CONTINUE:
+        return ContinueException()
+    return ReturnValueException(value)
@@ -0,0 +1,172 @@
+import ast
+from Interpreter import ExpressionDict, get_backend
+from visit import *
+
+# the element-wise operators and what the python backend does to every pair of entries
+ELEMENTWISE = {'.+': '+', '.-': '-', '.*': '*', './': '/'}
+
+
+def elementwise(node):
+    return isinstance(node, ast.ExpressionNode) and node.operator in ELEMENTWISE
+
+
+def formula(shape, names, operators=None):
+    # shape is an operand index or (operator, left shape, right shape)
+    if isinstance(shape, int):
+        return names[shape]
+    operator, left, right = shape
+    if operators is not None:
+        operator = operators[operator]
+    return '({0} {1} {2})'.format(formula(left, names, operators), operator, formula(right, names, operators))
+
+
+def operator_count(shape):
+    if isinstance(shape, int):
+        return 0
+    return 1 + operator_count(shape[1]) + operator_count(shape[2])
+
+
+def rectangular(values):
+    # plain lists of rows that all have the same, non-empty shape
+    first = values[0]
+    if type(first) is not list or not first or type(first[0]) is not list or not first[0]:
+        return False
+    height, width = len(first), len(first[0])
+    for value in values:
+        if type(value) is not list or len(value) != height:
+            return False
+        for row in value:
+            if type(row) is not list or len(row) != width:
+                return False
+    return True
+
+
+class FusedKernel(object):
+    # computes a chain of element-wise operators entry by entry, so only the result is
+    # built; whatever that single pass could not reproduce exactly (another backend,
+    # structured or ragged operands, an entry that fails) runs the operators one by one
+
+    def __init__(self, shape, count):
+        self.shape = shape
+        names = ['a{0}'.format(i) for i in range(count)]
+        self.entry = eval('lambda {0}: {1}'.format(', '.join(names), formula(shape, names, ELEMENTWISE)))
+
+    def __call__(self, values):
+        if get_backend().name == 'python' and rectangular(values):
+            entry = self.entry
+            try:
+                return [[entry(*entries) for entries in zip(*rows)] for rows in zip(*values)]
+            except Exception:
+                pass
+        return self.stepwise(self.shape, values)
+
+    def stepwise(self, shape, values):
+        if isinstance(shape, int):
+            return values[shape]
+        operator, left, right = shape
+        return ExpressionDict[operator](self.stepwise(left, values), self.stepwise(right, values))
+
+    def __repr__(self):
+        return formula(self.shape, ['#{0}'.format(i) for i in range(operator_count(self.shape) + 1)])
+
+
+class ExpressionFuser(object):
+    # chains of two or more element-wise operators become a single FusedNode, which
+    # evaluates its operands in the original order and hands them to one kernel
+
+    def __init__(self):
+        self.fused = 0
+        self.removed = 0
+
+    def optimize(self, node):
+        node.accept(self)
+        return node
+
+    def report(self):
+        return "element-wise fusion: {0} chains fused, {1} temporary matrices removed".format(self.fused, self.removed)
+
+    def chain(self, node, operands):
+        if elementwise(node):
+            return node.operator, self.chain(node.left, operands), self.chain(node.right, operands)
+        operand = self.expression(node)
+        operands.append(operand)
+        return len(operands) - 1
+
+    def expression(self, node):
+        if elementwise(node) and (elementwise(node.left) or elementwise(node.right)):
+            operands = []
+            shape = self.chain(node, operands)
+            self.fused += 1
+            self.removed += operator_count(shape) - 1
+            return ast.FusedNode(operands, FusedKernel(shape, len(operands)), node.lineno)
+        if isinstance(node, (ast.ExpressionNode, ast.ConditionNode)):
+            node.left = self.expression(node.left)
+            node.right = self.expression(node.right)
+        elif isinstance(node, (ast.NegationNode, ast.TranspositionNode, ast.HoistedNode, ast.SharedNode)):
+            node.value = self.expression(node.value)
+        elif isinstance(node, ast.FunctionNode):
+            node.argument = self.expression(node.argument)
+        elif isinstance(node, ast.AccessNode):
+            node.specifier = self.expression(node.specifier)
+        elif isinstance(node, ast.MatrixNode):
+            node.rows = [self.expression(row) for row in node.rows]
+        elif isinstance(node, ast.SequenceNode):
+            node.values = [self.expression(value) for value in node.values]
+        elif isinstance(node, ast.RangeNode):
+            node.start = self.expression(node.start)
+            node.end = self.expression(node.end)
+            node.jump = self.expression(node.jump)
+        return node
+
+    @on('node')
+    def visit(self, node):
+        pass
+
+    @when(ast.ProgramNode)
+    def visit(self, node):
+        for instruction in node.instructions:
+            instruction.accept(self)
+
+    @when(ast.BlockNode)
+    def visit(self, node):
+        for instruction in node.instructions:
+            instruction.accept(self)
+
+    @when(ast.ForNode)
+    def visit(self, node):
+        node.range = self.expression(node.range)
+        node.body.accept(self)
+
+    @when(ast.WhileNode)
+    def visit(self, node):
+        node.condition = self.expression(node.condition)
+        node.body.accept(self)
+
+    @when(ast.IfNode)
+    def visit(self, node):
+        node.condition = self.expression(node.condition)
+        node.body.accept(self)
+
+    @when(ast.IfElseNode)
+    def visit(self, node):
+        node.condition = self.expression(node.condition)
+        node.body.accept(self)
+        node.else_body.accept(self)
+
+    @when(ast.ReturnNode)
+    def visit(self, node):
+        node.result = self.expression(node.result)
+
+    @when(ast.PrintNode)
+    def visit(self, node):
+        node.printable = self.expression(node.printable)
+
+    @when(ast.FunctionNode)
+    def visit(self, node):
+        # save(path, A), the one call that is a statement
+        node.argument = self.expression(node.argument)
+
+    @when(ast.AssignmentNode)
+    def visit(self, node):
+        node.left.id = self.expression(node.left.id)
+        node.right = self.expression(node.right)
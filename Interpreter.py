@@ -2,33 +2,422 @@ import ast
 from Memory import *
 from Exceptions import *
 from visit import *
+from Output import Output
+from Matrices import (OPERATORS, ConstantMatrix, DiagonalMatrix, SparseMatrix, as_slice, dense_product,
+                      elementwise, position, positions, shared, slicing, sparse_copy, structured, use_dense_value, view)
 import sys
 
 sys.setrecursionlimit(10000)
 
+
+def densify(value):
+    return value.dense() if structured(value) else value
+
+
+def size(n):
+    # the sizes range() accepts, so zeros(2.5) fails and zeros(-1) is empty like before
+    return len(range(n))
+
+
+def scaled(name, x, y, operators):
+    # a matrix and a scalar, either way round: the scalar as a constant matrix of the same
+    # shape keeps a structured operand structured
+    if structured(x):
+        return elementwise(name, x, ConstantMatrix(x.height, x.width, y), operators)
+    if structured(y):
+        return elementwise(name, ConstantMatrix(y.height, y.width, x), y, operators)
+    return None
+
+
+def row_of(value, width):
+    # what A[i] = value puts in the row: a one row matrix, or a row read out of a matrix
+    value = densify(value)
+    if isinstance(value, list) and value and isinstance(value[0], list):
+        if len(value) != 1:
+            raise ValueError("a row cannot be assigned a matrix of {0} rows".format(len(value)))
+        value = value[0]
+    if not isinstance(value, list) or len(value) != width:
+        raise ValueError("a row of {0} entries cannot be assigned {1!r}".format(width, value))
+    return list(value)
+
+
+def store_rows(m, indices, op, value):
+    # m is a list of rows (or a single row) that this store may change; a row it shares
+    # with another matrix is copied before it is written
+    if len(indices) == 1:
+        i = indices[0]
+        if m and isinstance(m[0], list):
+            m[i] = row_of(op([m[i]], value), len(m[i]))
+        else:
+            m[i] = op(m[i], value)
+    elif len(indices) == 2:
+        i, j = indices
+        if shared(m, i):
+            m[i] = list(m[i])
+        row = m[i]
+        row[j] = op(row[j], value)
+    else:
+        raise IndexError("a matrix takes one or two indices, not {0}".format(len(indices)))
+
+
+def store_structured(m, indices, op, value, dense):
+    # a constant or diagonal matrix becomes a sparse one, which turns into the backend's
+    # dense matrix once most of it is set
+    i, j = position(indices[0], m.height), position(indices[1], m.width)
+    if not isinstance(m, SparseMatrix):
+        m = sparse_copy(m)
+    m.put(i, j, op(m.get(i, j), value))
+    if m.count() * 2 > m.height * m.width:
+        return dense(m)
+    return m
+
+
+def sparse_store(m, indices):
+    # constant, diagonal and sparse matrices take single entries without being built;
+    # a view or a loaded matrix is built, which is the copy a store to it makes anyway
+    return isinstance(m, (ConstantMatrix, DiagonalMatrix, SparseMatrix)) and len(indices) == 2
+
+
+def copy_matrix(m):
+    # a copy a store can change without the original seeing it; rows are only copied
+    # once they are written
+    if type(m) is list:
+        return list(m)
+    if isinstance(m, SparseMatrix):
+        return sparse_copy(m)
+    return m
+
+
+class PythonMatrixBackend(object):
+    name = 'python'
+
+    def dense(self, value):
+        return densify(value)
+
+    def add(self, x, y):
+        result = elementwise('add', x, y)
+        if result is not None:
+            return result
+        x, y = densify(x), densify(y)
+        return [[x[i][j] + y[i][j] for j in range(len(x[0]))] for i in range(len(x))]
+
+    def subtract(self, x, y):
+        result = elementwise('subtract', x, y)
+        if result is not None:
+            return result
+        x, y = densify(x), densify(y)
+        return [[x[i][j] - y[i][j] for j in range(len(x[0]))] for i in range(len(x))]
+
+    def multiply(self, x, y):
+        result = elementwise('multiply', x, y)
+        if result is not None:
+            return result
+        x, y = densify(x), densify(y)
+        return [[x[i][j] * y[i][j] for j in range(len(x[0]))] for i in range(len(x))]
+
+    def divide(self, x, y):
+        result = elementwise('divide', x, y)
+        if result is not None:
+            return result
+        x, y = densify(x), densify(y)
+        return [[x[i][j] / y[i][j] for j in range(len(x[0]))] for i in range(len(x))]
+
+    def product(self, x, y):
+        if self.is_matrix(x) and self.is_matrix(y):
+            return dense_product(densify(x), densify(y))
+        result = scaled('multiply', x, y, OPERATORS)
+        if result is not None:
+            return result
+        x, y = densify(x), densify(y)
+        if self.is_matrix(x):
+            return [[value * y for value in row] for row in x]
+        return [[x * value for value in row] for row in y]
+
+    def is_matrix(self, value):
+        return type(value) is list or structured(value)
+
+    def copy(self, m):
+        return copy_matrix(m)
+
+    def store(self, m, indices, op, value):
+        if sparse_store(m, indices):
+            return store_structured(m, indices, op, value, self.dense)
+        m = densify(m)
+        store_rows(m, indices, op, value)
+        return m
+
+    def zeros(self, n):
+        n = size(n)
+        return ConstantMatrix(n, n, 0)
+
+    def ones(self, n):
+        n = size(n)
+        return ConstantMatrix(n, n, 1)
+
+    def eye(self, n):
+        return DiagonalMatrix(size(n), 1)
+
+    # MatrixFile, and mmap and tempfile with it, only for the scripts that load or save
+
+    def load(self, path):
+        from MatrixFile import load_matrix
+        return load_matrix(path)
+
+    def save(self, path, m):
+        from MatrixFile import save_matrix
+        save_matrix(path, m)
+
+    def transpose(self, m):
+        if structured(m):
+            return m.transpose()
+        return [list(x) for x in zip(*m)]
+
+    def matrix(self, rows):
+        return rows
+
+    def index(self, m, indices):
+        # a range or ':' among the indices fails as a plain index and is sliced instead
+        try:
+            if structured(m):
+                return m.index(indices)
+            value = m
+            for index in indices:
+                value = value[index]
+            return value
+        except TypeError:
+            if not slicing(indices):
+                raise
+        return view(m, indices)
+
+    def printable(self, value):
+        return densify(value)
+
+
+class NumpyMatrixBackend(object):
+    name = 'numpy'
+
+    def __init__(self):
+        import numpy
+        self.np = numpy
+        # numpy's rules for single entries too (1/0 is inf, not an exception)
+        self.operators = {
+            'add': lambda x, y: numpy.add(x, y).item(),
+            'subtract': lambda x, y: numpy.subtract(x, y).item(),
+            'multiply': lambda x, y: numpy.multiply(x, y).item(),
+            'divide': lambda x, y: numpy.true_divide(x, y).item(),
+        }
+
+    def dense(self, value):
+        return self.matrix(value.dense()) if structured(value) else value
+
+    def add(self, x, y):
+        result = elementwise('add', x, y, self.operators)
+        if result is not None:
+            return result
+        return self.np.add(self.dense(x), self.dense(y))
+
+    def subtract(self, x, y):
+        result = elementwise('subtract', x, y, self.operators)
+        if result is not None:
+            return result
+        return self.np.subtract(self.dense(x), self.dense(y))
+
+    def multiply(self, x, y):
+        result = elementwise('multiply', x, y, self.operators)
+        if result is not None:
+            return result
+        return self.np.multiply(self.dense(x), self.dense(y))
+
+    def divide(self, x, y):
+        result = elementwise('divide', x, y, self.operators)
+        if result is not None:
+            return result
+        return self.np.true_divide(self.dense(x), self.dense(y))
+
+    def product(self, x, y):
+        if self.is_matrix(x) and self.is_matrix(y):
+            return self.np.matmul(self.dense(x), self.dense(y))
+        result = scaled('multiply', x, y, self.operators)
+        if result is not None:
+            return result
+        return self.np.multiply(self.dense(x), self.dense(y))
+
+    def is_matrix(self, value):
+        return isinstance(value, (list, self.np.ndarray)) or structured(value)
+
+    def copy(self, m):
+        if isinstance(m, self.np.ndarray):
+            return m.copy()
+        return copy_matrix(m)
+
+    def store(self, m, indices, op, value):
+        if sparse_store(m, indices):
+            return store_structured(m, indices, op, value, self.dense)
+        m = self.dense(m)
+        if not isinstance(m, self.np.ndarray):
+            store_rows(m, indices, op, value)
+            return m
+        if len(indices) not in (1, 2):
+            raise IndexError("a matrix takes one or two indices, not {0}".format(len(indices)))
+        # a view writes through to the array it was taken from
+        if m.base is not None:
+            m = m.copy()
+        current = self.index(m, indices)
+        if len(indices) == m.ndim:
+            value = op(current, value)
+            values = [value]
+        else:
+            value = row_of(self.printable(op([current.tolist()], self.printable(value))), m.shape[1])
+            values = value
+        m = self.fit(m, values)
+        m[tuple(indices)] = value
+        return m
+
+    def fit(self, m, values):
+        # an int array only takes ints and a float array only floats, so no entry changes
+        # the way it prints; anything else turns the array into an object one
+        types = set(type(value) for value in values)
+        kind = m.dtype.kind
+        if kind == 'O' or (kind == 'i' and types <= {int}) or (kind == 'f' and types <= {float}):
+            return m
+        return m.astype(object)
+
+    # structured like the python backend's; they only become arrays once combined with one
+    def zeros(self, n):
+        n = size(n)
+        return ConstantMatrix(n, n, 0)
+
+    def ones(self, n):
+        n = size(n)
+        return ConstantMatrix(n, n, 1)
+
+    def eye(self, n):
+        return DiagonalMatrix(size(n), 1)
+
+    def load(self, path):
+        # a read only array over the mapped file, copied by the first store to it
+        from MatrixFile import DTYPES, HEADER, map_file
+        mapped, code, height, width = map_file(path)
+        return self.np.frombuffer(mapped, DTYPES[code], height * width, HEADER.size).reshape(height, width)
+
+    def save(self, path, m):
+        from MatrixFile import DTYPES, save_matrix, write_file
+        if not isinstance(m, self.np.ndarray):
+            save_matrix(path, m)
+        elif m.dtype.kind not in 'bif':
+            save_matrix(path, m.tolist())
+        else:
+            code = 'd' if m.dtype.kind == 'f' else 'q'
+            m = self.np.ascontiguousarray(m.reshape(1, -1) if m.ndim == 1 else m, DTYPES[code])
+            write_file(path, code, m.shape[0], m.shape[1], [m])
+
+    def transpose(self, m):
+        if structured(m):
+            return m.transpose()
+        if not isinstance(m, self.np.ndarray):
+            return [list(x) for x in zip(*m)]
+        return m.T
+
+    def matrix(self, rows):
+        if len(set(len(row) for row in rows)) != 1:
+            return rows
+        types = set(type(value) for row in rows for value in row)
+        if types == {int}:
+            return self.np.array(rows, dtype=int)
+        if types == {float}:
+            return self.np.array(rows, dtype=float)
+        # keep mixed and string matrices printing exactly like python lists
+        return self.np.array(rows, dtype=object)
+
+    def index(self, m, indices):
+        if not isinstance(m, self.np.ndarray):
+            return PythonMatrixBackend.index(self, m, indices)
+        if slicing(indices):
+            if len(indices) > m.ndim:
+                raise IndexError("a matrix takes one or two indices, not {0}".format(len(indices)))
+            # numpy's own slices are views already
+            return m[tuple(as_slice(positions(index, size)) for index, size in zip(indices, m.shape))]
+        m = m[tuple(indices)]
+        if isinstance(m, self.np.generic):
+            return m.item()
+        return m
+
+    def printable(self, value):
+        if isinstance(value, self.np.ndarray):
+            return value.tolist()
+        return densify(value)
+
+
+MatrixBackends = {
+    'python': PythonMatrixBackend,
+    'numpy': NumpyMatrixBackend,
+}
+
+matrix_backend = PythonMatrixBackend()
+
+
+def use_backend(name):
+    global matrix_backend
+    matrix_backend = MatrixBackends[name]()
+    use_dense_value(matrix_backend.dense)
+    return matrix_backend
+
+
+def get_backend():
+    return matrix_backend
+
+
+# values * leaves to python; with a matrix on either side it is a matrix product
+SCALARS = frozenset((int, float, str, bool))
+
+
+def product(x, y):
+    if type(x) in SCALARS and type(y) in SCALARS:
+        return x * y
+    return matrix_backend.product(x, y)
+
+
+def bounded_range(bounds):
+    # start:end:jump as an index, from the values the VM collected for it
+    start, end, jump = bounds
+    return range(start, end + 1, jump)
+
+
+def store_item(frame, slot, indices, op, value):
+    # A[i, j] = value, and its op= forms, change the matrix where it is stored; one that
+    # something else still refers to (another name, an optimizer temporary) is copied
+    # first, so no other name sees the change
+    if shared(frame, slot):
+        frame[slot] = matrix_backend.copy(frame[slot])
+    frame[slot] = matrix_backend.store(frame[slot], indices, op, value)
+
+
 ExpressionDict = {
     '+': lambda x, y: x + y,
     '-': lambda x, y: x - y,
-    '*': lambda x, y: x * y,
+    '*': product,
     '/': lambda x, y: x / y,
-    '.+': lambda x, y: [[x[i][j] + y[i][j] for j in range(len(x[0]))] for i in range(len(x))],
-    '.-': lambda x, y: [[x[i][j] - y[i][j] for j in range(len(x[0]))] for i in range(len(x))],
-    '.*': lambda x, y: [[x[i][j] * y[i][j] for j in range(len(x[0]))] for i in range(len(x))],
-    './': lambda x, y: [[x[i][j] / y[i][j] for j in range(len(x[0]))] for i in range(len(x))],
+    '.+': lambda x, y: matrix_backend.add(x, y),
+    '.-': lambda x, y: matrix_backend.subtract(x, y),
+    '.*': lambda x, y: matrix_backend.multiply(x, y),
+    './': lambda x, y: matrix_backend.divide(x, y),
 }
 
 AssignmentDict = {
     '=': lambda x, y: y,
     '+=': lambda x, y: x + y,
     '-=': lambda x, y: x - y,
-    '*=': lambda x, y: x * y,
+    '*=': product,
     '/=': lambda x, y: x / y,
 }
 
 FunctionDict = {
-    'zeros': lambda x: [[0 for _ in range(x)] for _ in range(x)],
-    'ones': lambda x: [[1 for _ in range(x)] for _ in range(x)],
-    'eye': lambda x: [[1 if j == i else 0 for j in range(x)] for i in range(x)],
+    'zeros': lambda x: matrix_backend.zeros(x),
+    'ones': lambda x: matrix_backend.ones(x),
+    'eye': lambda x: matrix_backend.eye(x),
+    'load': lambda x: matrix_backend.load(x),
+    # save(path, A) is a statement; its arguments come as a list
+    'save': lambda x: matrix_backend.save(*x),
 }
 
 ConditionDict = {
@@ -43,8 +432,10 @@ ConditionDict = {
 
 class Interpreter(object):
 
-    def __init__(self):
-        self.memory_stack = MemoryStack()
+    def __init__(self, output=None):
+        self.memory_stack = FrameStack()
+        self.return_value = None
+        self.output = output if output is not None else Output()
 
     @on('node')
     def visit(self, node):
@@ -56,17 +447,23 @@ class Interpreter(object):
 
     @when(ast.IdNode)
     def visit(self, node):
-        return self.memory_stack.get(node.value)
+        return self.memory_stack.load(node.slots)
 
     @when(ast.ProgramNode)
     def visit(self, node):
+        self.memory_stack.reserve(node.frame_size)
         for instruction in node.instructions:
-            instruction.accept(self)
+            status = instruction.accept(self)
+            if status:
+                raise signal_exception(status, self.return_value)
 
     @when(ast.BlockNode)
     def visit(self, node):
         for instruction in node.instructions:
-            instruction.accept(self)
+            status = instruction.accept(self)
+            if status:
+                return status
+        return NORMAL
 
     @when(ast.RangeNode)
     def visit(self, node):
@@ -74,70 +471,66 @@ class Interpreter(object):
 
     @when(ast.ForNode)
     def visit(self, node):
-        r = None
-        self.memory_stack.push()
-        for i in node.range.accept(self):
-            self.memory_stack.insert(node.id.value, i)
-            try:
-                r = node.body.accept(self)
-            except ContinueException as e:
-                continue
-            except BreakException as e:
-                break
-            except ReturnValueException as e:
-                return e.value
-        self.memory_stack.pop()
-        return r
+        self.memory_stack.push(node.frame_size)
+        frame = self.memory_stack.peek()
+        try:
+            for i in node.range.accept(self):
+                frame[node.slot] = i
+                status = node.body.accept(self)
+                if status and status != CONTINUE:
+                    break
+        finally:
+            self.memory_stack.pop()
+        return NORMAL
 
     @when(ast.WhileNode)
     def visit(self, node):
-        r = None
-        self.memory_stack.push()
-        while node.condition.accept(self):
-            try:
-                r = node.body.accept(self)
-            except ContinueException as e:
-                continue
-            except BreakException as e:
-                break
-            except ReturnValueException as e:
-                return e.value
-        self.memory_stack.pop()
-        return r
+        self.memory_stack.push(node.frame_size)
+        try:
+            while node.condition.accept(self):
+                status = node.body.accept(self)
+                if status and status != CONTINUE:
+                    break
+        finally:
+            self.memory_stack.pop()
+        return NORMAL
 
     @when(ast.IfNode)
     def visit(self, node):
-        self.memory_stack.push()
-        if node.condition.accept(self):
-            node.body.accept(self)
-        self.memory_stack.pop()
+        self.memory_stack.push(node.frame_size)
+        try:
+            if node.condition.accept(self):
+                return node.body.accept(self)
+        finally:
+            self.memory_stack.pop()
 
     @when(ast.IfElseNode)
     def visit(self, node):
-        self.memory_stack.push()
-        if node.condition.accept(self):
-            node.body.accept(self)
-        else:
-            node.else_body.accept(self)
-        self.memory_stack.pop()
+        self.memory_stack.push(node.frame_size)
+        try:
+            if node.condition.accept(self):
+                return node.body.accept(self)
+            return node.else_body.accept(self)
+        finally:
+            self.memory_stack.pop()
 
     @when(ast.BreakNode)
     def visit(self, node):
-        raise BreakException()
+        return BREAK
 
     @when(ast.ContinueNode)
     def visit(self, node):
-        raise ContinueException()
+        return CONTINUE
 
     @when(ast.ReturnNode)
     def visit(self, node):
-        raise ReturnValueException(node.result.accept(self))
+        # return only leaves the innermost loop; the value is kept for a top-level return
+        self.return_value = node.result.accept(self)
+        return RETURN
 
     @when(ast.PrintNode)
     def visit(self, node):
-        for value in node.printable.accept(self):
-            print(value, end=' ')
-        print('\b')
+        self.output.line(node.printable.accept(self), matrix_backend.printable)
 
     @when(ast.ConditionNode)
     def visit(self, node):
@@ -147,20 +540,25 @@ class Interpreter(object):
 
     @when(ast.AssignmentNode)
     def visit(self, node):
+        target = node.left.id
+        if isinstance(target, ast.AccessNode):
+            # the indices before the value, the order the optimizer passes assume
+            indices = target.specifier.accept(self)
+            value = node.right.accept(self)
+            frame, slot = self.memory_stack.locate(target.id.slots)
+            store_item(frame, slot, indices, AssignmentDict[node.operator], value)
+            return
         r1 = node.left.accept(self)
         r2 = node.right.accept(self)
-        self.memory_stack.insert(node.left.id.value, AssignmentDict[node.operator](r1, r2))
+        self.memory_stack.store(node.left.depth, node.left.slot, AssignmentDict[node.operator](r1, r2))
 
     @when(ast.AssignToNode)
     def visit(self, node):
-        return self.memory_stack.get(node.id.value)
+        return self.memory_stack.load(node.id.slots)
 
     @when(ast.AccessNode)
     def visit(self, node):
-        m = node.id.accept(self)
-        for value in node.specifier.accept(self):
-            m = m[value]
-        return m
+        return matrix_backend.index(node.id.accept(self), node.specifier.accept(self))
 
     @when(ast.ExpressionNode)
     def visit(self, node):
@@ -170,7 +568,7 @@ class Interpreter(object):
 
     @when(ast.TranspositionNode)
     def visit(self, node):
-        return [list(x) for x in zip(*node.value.accept(self))]
+        return matrix_backend.transpose(node.value.accept(self))
 
     @when(ast.NegationNode)
     def visit(self, node):
@@ -185,7 +583,7 @@ class Interpreter(object):
         l = []
         for row in node.rows:
             l.append(row.accept(self))
-        return l
+        return matrix_backend.matrix(l)
 
     @when(ast.SequenceNode)
     def visit(self, node):
@@ -194,6 +592,24 @@ class Interpreter(object):
             l.append(value.accept(self))
         return l
 
+    @when(ast.HoistedNode)
+    def visit(self, node):
+        frame = self.memory_stack.frames[node.depth]
+        value = frame[node.slot]
+        if value is UNSET:
+            value = frame[node.slot] = node.value.accept(self)
+        return value
+
+    @when(ast.SharedNode)
+    def visit(self, node):
+        value = node.value.accept(self)
+        self.memory_stack.store(node.depth, node.slot, value)
+        return value
+
+    @when(ast.FusedNode)
+    def visit(self, node):
+        return node.kernel([operand.accept(self) for operand in node.operands])
+
     @when(ast.ErrorNode)
     def visit(self, node):
         pass
@@ -0,0 +1,211 @@
+import ast
+from visit import *
+
+PURE = (ast.ConstValueNode, ast.IdNode, ast.ExpressionNode, ast.NegationNode, ast.TranspositionNode,
+        ast.FunctionNode, ast.MatrixNode, ast.SequenceNode, ast.AccessNode, ast.ConditionNode)
+
+# builtins that use files: the same call can give a different matrix every time
+IMPURE = ('load', 'save')
+
+
+def children(node):
+    if isinstance(node, (ast.ExpressionNode, ast.ConditionNode)):
+        return [node.left, node.right]
+    if isinstance(node, (ast.NegationNode, ast.TranspositionNode)):
+        return [node.value]
+    if isinstance(node, ast.FunctionNode):
+        return [node.argument]
+    if isinstance(node, ast.MatrixNode):
+        return node.rows
+    if isinstance(node, ast.SequenceNode):
+        return node.values
+    if isinstance(node, ast.AccessNode):
+        return [node.id, node.specifier]
+    return []
+
+
+def reads(node, names):
+    # names the expression depends on, or None when it is not a pure expression
+    if not isinstance(node, PURE):
+        return None
+    if isinstance(node, ast.FunctionNode) and node.name in IMPURE:
+        return None
+    if isinstance(node, ast.IdNode):
+        names.add(node.value)
+    for child in children(node):
+        if reads(child, names) is None:
+            return None
+    return names
+
+
+def target_name(left):
+    target = left.id
+    if isinstance(target, ast.AccessNode):
+        target = target.id
+    return target.value if isinstance(target, ast.IdNode) else None
+
+
+def writes(node, names):
+    # every name a statement may assign, however deeply nested
+    if isinstance(node, (ast.ProgramNode, ast.BlockNode)):
+        for instruction in node.instructions:
+            writes(instruction, names)
+    elif isinstance(node, ast.AssignmentNode):
+        names.add(target_name(node.left))
+    elif isinstance(node, ast.ForNode):
+        names.add(node.id.value)
+        writes(node.body, names)
+    elif isinstance(node, ast.WhileNode):
+        writes(node.body, names)
+    elif isinstance(node, ast.IfNode):
+        writes(node.body, names)
+    elif isinstance(node, ast.IfElseNode):
+        writes(node.body, names)
+        writes(node.else_body, names)
+    return names
+
+
+class Loop(object):
+    def __init__(self, node, names):
+        self.node = node
+        self.writes = names
+
+
+class LoopHoister(object):
+    # an invariant expression is evaluated once per entry into the outermost loop it
+    # does not depend on and cached in that loop's frame; it is computed where it was
+    # first needed, so a loop that never reaches it never evaluates it
+
+    def __init__(self):
+        self.loops = []
+        self.hoisted = 0
+
+    def optimize(self, node):
+        node.accept(self)
+        return node
+
+    def report(self):
+        return "loop hoisting: {0} expressions hoisted".format(self.hoisted)
+
+    def target(self, names):
+        for loop in self.loops:
+            if not names & loop.writes:
+                return loop
+        return None
+
+    def expression(self, node):
+        if not self.loops or isinstance(node, (ast.ConstValueNode, ast.IdNode)):
+            return node
+        names = reads(node, set())
+        loop = self.target(names) if names is not None else None
+        if loop is not None:
+            name = '$licm{0}'.format(self.hoisted)
+            self.hoisted += 1
+            loop.node.temps = getattr(loop.node, 'temps', ()) + (name,)
+            return ast.HoistedNode(node, name, node.lineno)
+        return node.accept(self)
+
+    def loop(self, node):
+        self.loops.append(Loop(node, writes(node, set())))
+
+    @on('node')
+    def visit(self, node):
+        return node
+
+    @when(ast.ProgramNode)
+    def visit(self, node):
+        for instruction in node.instructions:
+            instruction.accept(self)
+
+    @when(ast.BlockNode)
+    def visit(self, node):
+        for instruction in node.instructions:
+            instruction.accept(self)
+
+    @when(ast.RangeNode)
+    def visit(self, node):
+        node.start = self.expression(node.start)
+        node.end = self.expression(node.end)
+        node.jump = self.expression(node.jump)
+
+    @when(ast.ForNode)
+    def visit(self, node):
+        node.range.accept(self)
+        self.loop(node)
+        node.body.accept(self)
+        self.loops.pop()
+
+    @when(ast.WhileNode)
+    def visit(self, node):
+        self.loop(node)
+        node.condition = self.expression(node.condition)
+        node.body.accept(self)
+        self.loops.pop()
+
+    @when(ast.IfNode)
+    def visit(self, node):
+        node.condition = self.expression(node.condition)
+        node.body.accept(self)
+
+    @when(ast.IfElseNode)
+    def visit(self, node):
+        node.condition = self.expression(node.condition)
+        node.body.accept(self)
+        node.else_body.accept(self)
+
+    @when(ast.ReturnNode)
+    def visit(self, node):
+        node.result = self.expression(node.result)
+
+    @when(ast.PrintNode)
+    def visit(self, node):
+        node.printable.accept(self)
+
+    @when(ast.AssignmentNode)
+    def visit(self, node):
+        if isinstance(node.left.id, ast.AccessNode):
+            node.left.id.specifier.accept(self)
+        node.right = self.expression(node.right)
+
+    @when(ast.ConditionNode)
+    def visit(self, node):
+        node.left = self.expression(node.left)
+        node.right = self.expression(node.right)
+        return node
+
+    @when(ast.AccessNode)
+    def visit(self, node):
+        node.specifier.accept(self)
+        return node
+
+    @when(ast.ExpressionNode)
+    def visit(self, node):
+        node.left = self.expression(node.left)
+        node.right = self.expression(node.right)
+        return node
+
+    @when(ast.TranspositionNode)
+    def visit(self, node):
+        node.value = self.expression(node.value)
+        return node
+
+    @when(ast.NegationNode)
+    def visit(self, node):
+        node.value = self.expression(node.value)
+        return node
+
+    @when(ast.FunctionNode)
+    def visit(self, node):
+        node.argument = self.expression(node.argument)
+        return node
+
+    @when(ast.MatrixNode)
+    def visit(self, node):
+        for row in node.rows:
+            row.accept(self)
+        return node
+
+    @when(ast.SequenceNode)
+    def visit(self, node):
+        node.values = [self.expression(value) for value in node.values]
+        return node
@@ -0,0 +1,380 @@
+import operator
+import sys
+
+# everything without a structured counterpart (+ concatenating lists, comparisons, len, ...)
+# behaves exactly like the dense value the active backend would have built instead
+DENSE_OPERATORS = {
+    '__add__': operator.add,
+    '__sub__': operator.sub,
+    '__mul__': operator.mul,
+    '__truediv__': operator.truediv,
+    '__eq__': operator.eq,
+    '__ne__': operator.ne,
+    '__lt__': operator.lt,
+    '__le__': operator.le,
+    '__gt__': operator.gt,
+    '__ge__': operator.ge,
+    '__contains__': operator.contains,
+}
+
+# columns of the right operand a product works on at a time
+PRODUCT_BLOCK = 32
+
+OPERATORS = {
+    'add': operator.add,
+    'subtract': operator.sub,
+    'multiply': operator.mul,
+    'divide': operator.truediv,
+}
+
+
+class Whole(object):
+    # the index ':', every row or every column
+
+    def __repr__(self):
+        return ':'
+
+    def __reduce__(self):
+        return 'WHOLE'
+
+
+WHOLE = Whole()
+
+
+def rows(m):
+    return m.dense()
+
+
+# turns a structured matrix into the backend's dense value; set along with the backend
+dense_value = rows
+
+
+def use_dense_value(convert):
+    global dense_value
+    dense_value = convert
+
+
+def value_of(value):
+    return dense_value(value) if isinstance(value, StructuredMatrix) else value
+
+
+def references(container, key):
+    # how many references container[key] has, counting those of this call
+    value = container[key]
+    return sys.getrefcount(value)
+
+
+# the count for a value that container[key] is the only reference to
+UNSHARED = references([object()], 0)
+
+
+def shared(container, key):
+    return references(container, key) > UNSHARED
+
+
+def position(index, size):
+    # the same indices a list accepts, negative ones included
+    if not isinstance(index, int):
+        raise TypeError("list indices must be integers or slices, not {0}".format(type(index).__name__))
+    if index < 0:
+        index += size
+    if not 0 <= index < size:
+        raise IndexError("list index out of range")
+    return index
+
+
+def positions(index, size):
+    # the rows (or columns) an index of a slice picks, as a range of non-negative
+    # positions: ':' is all of them, a range each of its indices, a number just that one
+    if index is WHOLE:
+        return range(size)
+    if not isinstance(index, range):
+        first = position(index, size)
+        return range(first, first + 1)
+    if not index:
+        return range(0)
+    first = position(index[0], size)
+    if position(index[-1], size) - first != index[-1] - index[0]:
+        raise IndexError("list index out of range")
+    return range(first, first + len(index) * index.step, index.step)
+
+
+def compose(outer, inner):
+    # the positions of outer that inner picks
+    if not inner:
+        return range(0)
+    first = outer[inner[0]]
+    step = outer.step * inner.step
+    return range(first, first + len(inner) * step, step)
+
+
+def as_slice(positions):
+    return slice(positions.start, positions.stop if positions.stop >= 0 else None, positions.step)
+
+
+def slicing(indices):
+    return any(index is WHOLE or isinstance(index, range) for index in indices)
+
+
+class StructuredMatrix(object):
+    # a matrix stored as a fill value and the entries that differ from it, so memory grows
+    # with the number of those entries; reading it as rows builds them on demand
+
+    __slots__ = ('height', 'width', 'fill')
+    __hash__ = None
+
+    def __init__(self, height, width, fill):
+        self.height = height
+        self.width = width
+        self.fill = fill
+
+    def get(self, i, j):
+        raise NotImplementedError
+
+    def entries(self):
+        # (i, j), value for every entry that may differ from fill
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    def transpose(self):
+        raise NotImplementedError
+
+    def row(self, i):
+        i = position(i, self.height)
+        return [self.get(i, j) for j in range(self.width)]
+
+    def dense(self):
+        rows = [[self.fill] * self.width for _ in range(self.height)]
+        for (i, j), value in self.entries():
+            rows[i][j] = value
+        return rows
+
+    def index(self, indices):
+        if len(indices) == 1:
+            return self.row(indices[0])
+        value = self.get(position(indices[0], self.height), position(indices[1], self.width))
+        for index in indices[2:]:
+            value = value[index]
+        return value
+
+    def __getitem__(self, i):
+        return self.row(i)
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        return iter(value_of(self))
+
+    def __neg__(self):
+        return -value_of(self)
+
+    def __radd__(self, other):
+        return other + value_of(self)
+
+    def __rsub__(self, other):
+        return other - value_of(self)
+
+    def __rmul__(self, other):
+        return other * value_of(self)
+
+    def __rtruediv__(self, other):
+        return other / value_of(self)
+
+    def __repr__(self):
+        return repr(self.dense())
+
+
+def dense_method(op):
+    def method(self, other):
+        return op(value_of(self), value_of(other))
+
+    return method
+
+
+for name, op in DENSE_OPERATORS.items():
+    setattr(StructuredMatrix, name, dense_method(op))
+
+
+class ConstantMatrix(StructuredMatrix):
+    __slots__ = ()
+
+    def get(self, i, j):
+        return self.fill
+
+    def entries(self):
+        return iter(())
+
+    def count(self):
+        return 0
+
+    def transpose(self):
+        return ConstantMatrix(self.width, self.height, self.fill)
+
+
+class DiagonalMatrix(StructuredMatrix):
+    # value on the diagonal of a square matrix, fill everywhere else
+    __slots__ = ('value',)
+
+    def __init__(self, size, value, fill=0):
+        super(DiagonalMatrix, self).__init__(size, size, fill)
+        self.value = value
+
+    def get(self, i, j):
+        return self.value if i == j else self.fill
+
+    def entries(self):
+        value = self.value
+        return (((i, i), value) for i in range(self.height))
+
+    def count(self):
+        return self.height
+
+    def transpose(self):
+        return self
+
+
+class SparseMatrix(StructuredMatrix):
+    # dictionary of keys: (i, j) -> value for the entries that differ from fill
+    __slots__ = ('values',)
+
+    def __init__(self, height, width, values, fill=0):
+        super(SparseMatrix, self).__init__(height, width, fill)
+        self.values = values
+
+    def get(self, i, j):
+        return self.values.get((i, j), self.fill)
+
+    def put(self, i, j, value):
+        if value == self.fill and type(value) is type(self.fill):
+            self.values.pop((i, j), None)
+        else:
+            self.values[i, j] = value
+
+    def entries(self):
+        return iter(self.values.items())
+
+    def count(self):
+        return len(self.values)
+
+    def transpose(self):
+        return SparseMatrix(self.width, self.height, {(j, i): value for (i, j), value in self.values.items()},
+                            self.fill)
+
+
+class MatrixView(StructuredMatrix):
+    # some rows and columns of another matrix, read through to it; the matrix it shares is
+    # copied by a store to it like it is for any other name that refers to it
+    __slots__ = ('source', 'rows', 'columns')
+
+    def __init__(self, source, rows, columns):
+        super(MatrixView, self).__init__(len(rows), len(columns), None)
+        self.source = source
+        self.rows = rows
+        self.columns = columns
+
+    def get(self, i, j):
+        if structured(self.source):
+            return self.source.get(self.rows[i], self.columns[j])
+        return self.source[self.rows[i]][self.columns[j]]
+
+    def entries(self):
+        for i, row in enumerate(self.dense()):
+            for j, value in enumerate(row):
+                yield (i, j), value
+
+    def count(self):
+        return self.height * self.width
+
+    def transpose(self):
+        return [list(column) for column in zip(*self.dense())]
+
+    def dense(self):
+        source, columns = self.source, self.columns
+        if structured(source):
+            return [[source.get(i, j) for j in columns] for i in self.rows]
+        if columns.step > 0:
+            cut = as_slice(columns)
+            return [source[i][cut] for i in self.rows]
+        return [[source[i][j] for j in columns] for i in self.rows]
+
+
+def view(m, indices):
+    # m[indices] with ':' or a range among them; a matrix gives a view of it, a single row
+    # the entries it picks
+    if len(indices) > 2:
+        raise IndexError("a matrix takes one or two indices, not {0}".format(len(indices)))
+    if structured(m):
+        height, width = m.height, m.width
+    else:
+        height = len(m)
+        if height and not isinstance(m[0], list):
+            if len(indices) != 1:
+                raise IndexError("a row takes a single index, not {0}".format(len(indices)))
+            return [m[i] for i in positions(indices[0], height)]
+        width = len(m[0]) if height else 0
+    rows = positions(indices[0], height)
+    columns = positions(indices[1], width) if len(indices) == 2 else range(width)
+    if isinstance(m, MatrixView):
+        return MatrixView(m.source, compose(m.rows, rows), compose(m.columns, columns))
+    return MatrixView(m, rows, columns)
+
+
+def structured(value):
+    return isinstance(value, StructuredMatrix)
+
+
+def sparse_copy(m):
+    return SparseMatrix(m.height, m.width, dict(m.entries()), m.fill)
+
+
+def elementwise(name, x, y, operators=OPERATORS):
+    # x .op y without building either matrix, or None when the result has no structure
+    # to keep (different shapes, a dense operand) and the caller has to densify
+    if not (structured(x) and structured(y)) or (x.height, x.width) != (y.height, y.width):
+        return None
+    if x.height <= 0 or x.width <= 0:
+        return None
+    if max(x.count(), y.count()) >= x.height * x.width:
+        return None
+    op = operators[name]
+    if isinstance(x, ConstantMatrix) and isinstance(y, ConstantMatrix):
+        return ConstantMatrix(x.height, x.width, op(x.fill, y.fill))
+    # op is only ever applied to values some position actually holds, so it fails
+    # exactly when the dense computation would
+    diagonal = (DiagonalMatrix, ConstantMatrix)
+    if isinstance(x, diagonal) and isinstance(y, diagonal) and x.height > 1:
+        return DiagonalMatrix(x.height, op(x.get(0, 0), y.get(0, 0)), op(x.fill, y.fill))
+    keys = set(key for key, _ in x.entries())
+    keys.update(key for key, _ in y.entries())
+    if len(keys) == x.height * x.width:
+        return None
+    fill = op(x.fill, y.fill)
+    values = {}
+    for i, j in keys:
+        value = op(x.get(i, j), y.get(i, j))
+        if value != fill or type(value) is not type(fill):
+            values[i, j] = value
+    return SparseMatrix(x.height, x.width, values, fill)
+
+
+def dense_product(x, y, block=PRODUCT_BLOCK):
+    # x (h x n) times y (n x w), both lists of rows. y is transposed once, so every entry
+    # is the dot product of a row and a column, summed by sum(map(mul)) without a python
+    # level loop; the columns are taken a block at a time, which keeps the block in cache
+    # while every row of x passes over it
+    n = len(y)
+    widths = set(len(row) for row in y)
+    if len(widths) > 1 or any(len(row) != n for row in x):
+        raise ValueError("matrices of sizes {0}x{1} and {2}x{3} cannot be multiplied".format(
+            len(x), len(x[0]) if x else 0, n, max(widths) if widths else 0))
+    columns = list(zip(*y))
+    mul = operator.mul
+    result = [[] for _ in x]
+    for start in range(0, len(columns), block):
+        tile = columns[start:start + block]
+        for row, out in zip(x, result):
+            out.extend([sum(map(mul, row, column)) for column in tile])
+    return result
@@ -0,0 +1,157 @@
+import array
+import itertools
+import mmap
+import os
+import struct
+import sys
+
+from Matrices import StructuredMatrix, position, structured
+
+# a matrix file is a header (magic, entry type, height, width) followed by the entries
+# row after row, little-endian: 'q' for 64 bit ints, 'd' for doubles
+HEADER = struct.Struct('<4sc3xQQ')
+MAGIC = b'KMAT'
+DTYPES = {'q': '<i8', 'd': '<f8'}
+NATIVE = sys.byteorder == 'little'
+
+# numbers the temporary files of this process's saves
+SAVES = itertools.count()
+
+
+def filename(path):
+    # a string constant keeps the quotes it was written with
+    if not isinstance(path, str):
+        raise TypeError("a file name has to be a string, not {0!r}".format(path))
+    if len(path) >= 2 and path[0] == path[-1] == '"':
+        path = path[1:-1]
+    return path
+
+
+def entry_type(rows):
+    types = set()
+    for row in rows:
+        types.update(map(type, row))
+    if not types <= {int, float, bool}:
+        raise TypeError("only matrices of numbers can be saved, not of {0}".format(
+            ', '.join(sorted(t.__name__ for t in types - {int, float, bool}))))
+    return 'd' if float in types else 'q'
+
+
+def create_temporary(path):
+    # a new file next to path, with the permissions open() would give it: the kernel
+    # applies the umask to 0o666, so nothing here has to read or change it
+    while True:
+        temporary = '{0}.{1}.{2}.tmp'.format(path, os.getpid(), next(SAVES))
+        try:
+            return os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temporary
+        except FileExistsError:
+            # left behind by an earlier process with the same pid
+            continue
+
+
+def write_file(path, code, height, width, chunks):
+    # written next to the file and moved over it, so a matrix still mapped from the old
+    # file keeps reading the old entries instead of a truncated file; every save has a
+    # file of its own, so two saves to one path never publish each other's half
+    path = filename(path)
+    descriptor, temporary = create_temporary(path)
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, code.encode(), height, width))
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def map_file(path):
+    # the file mapped read only: (map, entry type, height, width)
+    path = filename(path)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError("{0} is not a matrix file".format(path))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, code, height, width = HEADER.unpack_from(mapped)
+    code = code.decode('latin-1')
+    if magic != MAGIC or code not in DTYPES:
+        raise ValueError("{0} is not a matrix file".format(path))
+    if size < HEADER.size + height * width * 8:
+        raise ValueError("{0} ends before its {1}x{2} entries".format(path, height, width))
+    return mapped, code, height, width
+
+
+class MappedMatrix(StructuredMatrix):
+    # the entries of a matrix file, read from the mapped file only when they are used;
+    # nothing of it is in memory until then, and a store makes a dense copy like it
+    # does for a view
+    __slots__ = ('data',)
+
+    def __init__(self, height, width, data):
+        super(MappedMatrix, self).__init__(height, width, None)
+        self.data = data
+
+    def get(self, i, j):
+        return self.data[i * self.width + j]
+
+    def entries(self):
+        for i, row in enumerate(self.dense()):
+            for j, value in enumerate(row):
+                yield (i, j), value
+
+    def count(self):
+        return self.height * self.width
+
+    def transpose(self):
+        return [list(column) for column in zip(*self.dense())]
+
+    def row(self, i):
+        i, width = position(i, self.height), self.width
+        return self.data[i * width:(i + 1) * width].tolist()
+
+    def dense(self):
+        data, width = self.data, self.width
+        return [data[i * width:(i + 1) * width].tolist() for i in range(self.height)]
+
+
+def load_matrix(path):
+    mapped, code, height, width = map_file(path)
+    if NATIVE:
+        data = memoryview(mapped)[HEADER.size:HEADER.size + height * width * 8].cast(code)
+    else:
+        data = array.array(code, mapped[HEADER.size:HEADER.size + height * width * 8])
+        data.byteswap()
+    return MappedMatrix(height, width, data)
+
+
+def save_matrix(path, m):
+    # a matrix, or a single row of one, as the lists of rows the python backend uses
+    if isinstance(m, MappedMatrix) and NATIVE:
+        write_file(path, m.data.format, m.height, m.width, [m.data])
+        return
+    if structured(m):
+        height, width = m.height, m.width
+        rows = (m.row(i) for i in range(height))
+        code = entry_type(m.row(i) for i in range(height))
+    else:
+        if not isinstance(m, list):
+            raise TypeError("only matrices can be saved, not {0!r}".format(m))
+        if m and not isinstance(m[0], list):
+            m = [m]
+        height = len(m)
+        width = len(m[0]) if m else 0
+        if any(not isinstance(row, list) or len(row) != width for row in m):
+            raise ValueError("only matrices with rows of the same length can be saved")
+        rows = m
+        code = entry_type(m)
+    write_file(path, code, height, width, (packed(code, row) for row in rows))
+
+
+def packed(code, row):
+    row = array.array(code, row)
+    if not NATIVE:
+        row.byteswap()
+    return row
@@ -4,7 +4,7 @@ class Memory:
         self.memory = {}
 
     def has_key(self, name):
-        return name in self.memory.keys()
+        return name in self.memory
 
     def get(self, name):
         return self.memory.get(name)
@@ -49,6 +49,58 @@ class MemoryStack:
     def peek(self):
         return self.stack[-1]
 
+
+class Unset(object):
+    def __repr__(self):
+        return 'UNSET'
+
+
+UNSET = Unset()
+
+
+def locate(frames, slots):
+    # the frame and slot a read of these slots would find its value in; a name that is
+    # not set anywhere gets a stand-in holding None, so using it fails like reading it
+    for depth, slot in slots:
+        frame = frames[depth]
+        if frame[slot] is not UNSET:
+            return frame, slot
+    return [None], 0
+
+
+class FrameStack:
+    # array-backed frames addressed by the (depth, slot) pairs assigned by Resolver
+    def __init__(self, size=0):
+        self.frames = [[UNSET] * size]
+
+    def reserve(self, size):
+        frame = self.frames[0]
+        if len(frame) < size:
+            frame.extend([UNSET] * (size - len(frame)))
+
+    def load(self, slots):
+        frames = self.frames
+        for depth, slot in slots:
+            value = frames[depth][slot]
+            if value is not UNSET:
+                return value
+        return None
+
+    def store(self, depth, slot, value):
+        self.frames[depth][slot] = value
+
+    def locate(self, slots):
+        return locate(self.frames, slots)
+
+    def push(self, size):
+        self.frames.append([UNSET] * size)
+
+    def pop(self):
+        return self.frames.pop()
+
+    def peek(self):
+        return self.frames[-1]
+
 # if __name__ == "__main__":
 #     memstack = MemoryStack()
 #     memory = Memory("test")
@@ -0,0 +1,207 @@
+import ast
+from Interpreter import ExpressionDict, ConditionDict
+from Resolver import Scope, declare_writes
+from visit import *
+
+FOLDABLE = ('+', '-', '*', '/')
+
+# only numbers are folded: "a" * 1000000000 would be built before the program even ran,
+# whether or not the program ever gets to it
+NUMBERS = (int, float)
+
+
+def constant(node):
+    return isinstance(node, ast.ConstValueNode)
+
+
+def terminates(node):
+    # statements after this one in the same block can never run
+    if isinstance(node, (ast.BreakNode, ast.ContinueNode, ast.ReturnNode)):
+        return True
+    if isinstance(node, ast.BlockNode):
+        return bool(node.instructions) and terminates(node.instructions[-1])
+    if isinstance(node, ast.IfElseNode):
+        return terminates(node.body) and terminates(node.else_body)
+    return False
+
+
+def writes_own_frame(body):
+    scope = Scope()
+    declare_writes(body, scope)
+    return len(scope) > 0
+
+
+class Optimizer(object):
+
+    def __init__(self):
+        self.folded = 0
+        self.removed = 0
+
+    def optimize(self, node):
+        return node.accept(self)
+
+    def report(self):
+        return "constant folding: {0} expressions folded, {1} statements removed".format(self.folded, self.removed)
+
+    def fold(self, node, operator, *values):
+        # anything that fails here is left for the runtime to report as before
+        if not all(type(value) in NUMBERS for value in values):
+            return node
+        try:
+            value = operator(*values)
+        except Exception:
+            return node
+        self.folded += 1
+        return ast.ConstValueNode(value, node.lineno)
+
+    def statements(self, instructions):
+        result = []
+        for position, instruction in enumerate(instructions):
+            instruction = instruction.accept(self)
+            if instruction is None:
+                continue
+            result.append(instruction)
+            if terminates(instruction):
+                self.removed += len(instructions) - position - 1
+                break
+        return result
+
+    def body(self, node):
+        body = node.accept(self)
+        if body is None:
+            return ast.BlockNode([], node.lineno)
+        return body
+
+    def select(self, node, body):
+        # the taken branch still needs the if's frame when it assigns directly into it
+        if writes_own_frame(body):
+            return node
+        self.removed += 1
+        return body
+
+    @on('node')
+    def visit(self, node):
+        return node
+
+    @when(ast.ProgramNode)
+    def visit(self, node):
+        node.instructions = self.statements(node.instructions)
+        return node
+
+    @when(ast.BlockNode)
+    def visit(self, node):
+        node.instructions = self.statements(node.instructions)
+        return node
+
+    @when(ast.RangeNode)
+    def visit(self, node):
+        node.start = node.start.accept(self)
+        node.end = node.end.accept(self)
+        node.jump = node.jump.accept(self)
+        return node
+
+    @when(ast.ForNode)
+    def visit(self, node):
+        node.range = node.range.accept(self)
+        node.body = self.body(node.body)
+        return node
+
+    @when(ast.WhileNode)
+    def visit(self, node):
+        node.condition = node.condition.accept(self)
+        if constant(node.condition) and not node.condition.value:
+            self.removed += 1
+            return None
+        node.body = self.body(node.body)
+        return node
+
+    @when(ast.IfNode)
+    def visit(self, node):
+        node.condition = node.condition.accept(self)
+        node.body = self.body(node.body)
+        if constant(node.condition):
+            if node.condition.value:
+                return self.select(node, node.body)
+            self.removed += 1
+            return None
+        return node
+
+    @when(ast.IfElseNode)
+    def visit(self, node):
+        node.condition = node.condition.accept(self)
+        node.body = self.body(node.body)
+        node.else_body = self.body(node.else_body)
+        if constant(node.condition):
+            if node.condition.value:
+                return self.select(node, node.body)
+            return self.select(node, node.else_body)
+        return node
+
+    @when(ast.ReturnNode)
+    def visit(self, node):
+        node.result = node.result.accept(self)
+        return node
+
+    @when(ast.PrintNode)
+    def visit(self, node):
+        node.printable = node.printable.accept(self)
+        return node
+
+    @when(ast.ConditionNode)
+    def visit(self, node):
+        node.left = node.left.accept(self)
+        node.right = node.right.accept(self)
+        if constant(node.left) and constant(node.right):
+            return self.fold(node, ConditionDict[node.operator], node.left.value, node.right.value)
+        return node
+
+    @when(ast.AssignmentNode)
+    def visit(self, node):
+        node.left = node.left.accept(self)
+        node.right = node.right.accept(self)
+        return node
+
+    @when(ast.AssignToNode)
+    def visit(self, node):
+        node.id = node.id.accept(self)
+        return node
+
+    @when(ast.AccessNode)
+    def visit(self, node):
+        node.specifier = node.specifier.accept(self)
+        return node
+
+    @when(ast.ExpressionNode)
+    def visit(self, node):
+        node.left = node.left.accept(self)
+        node.right = node.right.accept(self)
+        if node.operator in FOLDABLE and constant(node.left) and constant(node.right):
+            return self.fold(node, ExpressionDict[node.operator], node.left.value, node.right.value)
+        return node
+
+    @when(ast.TranspositionNode)
+    def visit(self, node):
+        node.value = node.value.accept(self)
+        return node
+
+    @when(ast.NegationNode)
+    def visit(self, node):
+        node.value = node.value.accept(self)
+        if constant(node.value):
+            return self.fold(node, lambda x: -x, node.value.value)
+        return node
+
+    @when(ast.FunctionNode)
+    def visit(self, node):
+        node.argument = node.argument.accept(self)
+        return node
+
+    @when(ast.MatrixNode)
+    def visit(self, node):
+        node.rows = [row.accept(self) for row in node.rows]
+        return node
+
+    @when(ast.SequenceNode)
+    def visit(self, node):
+        node.values = [value.accept(self) for value in node.values]
+        return node
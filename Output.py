@@ -0,0 +1,85 @@
+import sys
+
+BUFFER_SIZE = 1 << 16
+
+# the text print gave each value; list.__repr__ formats a whole matrix in one C call,
+# which turned out faster than any row by row formatting done here
+FORMATS = {
+    int: int.__repr__,
+    float: float.__repr__,
+    str: str.__str__,
+    list: list.__repr__,
+}
+
+
+def format_value(value):
+    return FORMATS.get(value.__class__, str)(value)
+
+
+def format_line(values, printable):
+    # exactly what print(value, end=' ') for every value and then print('\b') wrote
+    return ''.join([format_value(printable(value)) + ' ' for value in values]) + '\b\n'
+
+
+class Output(object):
+    # printed lines are collected here and reach the stream in large writes: when the
+    # buffer fills up, and whenever a program (or a single streamed instruction) ends.
+    # With threaded set, the writes happen on a background thread, so a slow terminal
+    # or pipe does not hold up the program while it keeps printing
+
+    def __init__(self, stream=None, size=BUFFER_SIZE, threaded=False):
+        self.stream = stream if stream is not None else sys.stdout
+        self.limit = size
+        self.parts = []
+        self.size = 0
+        self.queue = None
+        if threaded:
+            # queue and threading only for --output-thread
+            import queue
+            self.queue = queue.Queue(4)
+        self.thread = None
+        self.error = None
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.limit:
+            self.flush()
+
+    def line(self, values, printable):
+        self.write(format_line(values, printable))
+
+    def flush(self):
+        if not self.parts:
+            return
+        text = ''.join(self.parts)
+        self.parts = []
+        self.size = 0
+        if self.queue is None:
+            self.stream.write(text)
+            return
+        if self.thread is None:
+            import threading
+            self.thread = threading.Thread(target=self.writer, daemon=True)
+            self.thread.start()
+        self.queue.put(text)
+
+    def drain(self):
+        # everything printed so far is in the stream once this returns
+        self.flush()
+        if self.queue is not None:
+            self.queue.join()
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    def writer(self):
+        while True:
+            text = self.queue.get()
+            try:
+                self.stream.write(text)
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
@@ -0,0 +1,221 @@
+import signal
+import time
+
+import ast
+from Interpreter import Interpreter
+
+# nodes that span several lines; their own time counts towards the line they are on
+SPANNING = (ast.ProgramNode, ast.BlockNode)
+
+# the loops a sample reports around its line
+LOOPS = (ast.ForNode, ast.WhileNode)
+
+
+class Entry(object):
+    __slots__ = ('calls', 'inclusive', 'exclusive')
+
+    def __init__(self):
+        self.calls = 0
+        self.inclusive = 0.0
+        self.exclusive = 0.0
+
+
+class Profile(object):
+    # what a ProfilingInterpreter measured: per source line, per node type and per stack
+    # of nodes. A line is called when it is entered from another line, and its inclusive
+    # time runs until that call returns; a node type is called on every visit
+
+    def __init__(self):
+        self.lines = {}
+        self.types = {}
+        self.stacks = {}
+        self.total = 0.0
+
+    @staticmethod
+    def entry(table, key):
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = Entry()
+        return entry
+
+    def share(self, seconds):
+        return 100.0 * seconds / self.total if self.total else 0.0
+
+    def listing(self, source):
+        out = ["# {0:.6f}s in {1} node visits".format(self.total, sum(e.calls for e in self.types.values())),
+               "{0:>5} {1:>9} {2:>11} {3:>11} {4:>6}  {5}".format('line', 'calls', 'inclusive', 'exclusive', '%', 'source')]
+        for number, text in enumerate(source.splitlines(), 1):
+            entry = self.lines.get(number)
+            if entry is None:
+                out.append("{0:5} {1:>9} {2:>11} {3:>11} {4:>6}  {5}".format(number, '', '', '', '', text))
+            else:
+                out.append("{0:5} {1:9} {2:10.6f}s {3:10.6f}s {4:5.1f}%  {5}".format(
+                    number, entry.calls, entry.inclusive, entry.exclusive, self.share(entry.exclusive), text))
+        out.append('')
+        out.append("{0:16} {1:>9} {2:>11} {3:>11} {4:>6}".format('node type', 'calls', 'inclusive', 'exclusive', '%'))
+        for name, entry in sorted(self.types.items(), key=lambda item: -item[1].exclusive):
+            out.append("{0:16} {1:9} {2:10.6f}s {3:10.6f}s {4:5.1f}%".format(
+                name, entry.calls, entry.inclusive, entry.exclusive, self.share(entry.exclusive)))
+        return '\n'.join(out) + '\n'
+
+    def collapsed(self):
+        # one 'frame;frame;frame microseconds' line per stack, as flamegraph.pl reads it
+        out = []
+        for stack, seconds in sorted(self.stacks.items()):
+            microseconds = int(round(seconds * 1e6))
+            if microseconds:
+                out.append("{0} {1}".format(';'.join(stack), microseconds))
+        return '\n'.join(out) + '\n' if out else ''
+
+    def write(self, prefix, source):
+        # prefix.profile is the annotated listing, prefix.folded the collapsed stacks
+        with open(prefix + '.profile', 'w') as file:
+            file.write(self.listing(source))
+        with open(prefix + '.folded', 'w') as file:
+            file.write(self.collapsed())
+
+
+class ProfilingInterpreter(Interpreter):
+    # the tree interpreter timing every node it visits: all the handlers visit their
+    # children through accept, which comes back here
+
+    def __init__(self, output=None, profile=None):
+        super(ProfilingInterpreter, self).__init__(output)
+        self.profile = profile if profile is not None else Profile()
+        self.clock = time.perf_counter
+        self.path = ['program']
+        self.line = None
+        self.children = [0.0]
+        self.active_lines = {}
+        self.active_types = {}
+
+    def visit(self, node):
+        profile = self.profile
+        kind = node.__class__.__name__
+        outer = self.line
+        spanning = isinstance(node, SPANNING)
+        line = outer if spanning else getattr(node, 'lineno', outer)
+        if not spanning:
+            self.path.append('{0}:{1}'.format(kind, line))
+        active_lines, active_types = self.active_lines, self.active_types
+        active_lines[line] = active_lines.get(line, 0) + 1
+        active_types[kind] = active_types.get(kind, 0) + 1
+        self.line = line
+        self.children.append(0.0)
+        start = self.clock()
+        try:
+            return Interpreter.visit(self, node)
+        finally:
+            elapsed = self.clock() - start
+            exclusive = elapsed - self.children.pop()
+            self.children[-1] += elapsed
+            self.line = outer
+            stack = tuple(self.path)
+            profile.stacks[stack] = profile.stacks.get(stack, 0.0) + exclusive
+            if not spanning:
+                self.path.pop()
+            kinds = profile.entry(profile.types, kind)
+            kinds.calls += 1
+            kinds.exclusive += exclusive
+            active_types[kind] -= 1
+            if not active_types[kind]:
+                kinds.inclusive += elapsed
+            active_lines[line] -= 1
+            if line is not None:
+                lines = profile.entry(profile.lines, line)
+                lines.exclusive += exclusive
+                if line != outer:
+                    lines.calls += 1
+                if not active_lines[line]:
+                    lines.inclusive += elapsed
+            if outer is None and spanning:
+                profile.total += elapsed
+
+
+def handlers(visitor):
+    # the functions @on and @when registered for the visitor's visit
+    dispatcher = visitor.visit.dispatcher
+    return [dispatcher.default] + list(dispatcher.targets.values())
+
+
+class Sampler(object):
+    # a statistical profile of the tree interpreter: every interval seconds of cpu time
+    # SIGPROF interrupts it, and the handler looks for the nodes being visited among the
+    # python frames it interrupted, so between samples nothing is slowed down at all
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.codes = frozenset(handler.__code__ for handler in handlers(Interpreter))
+        self.lines = {}
+        self.nests = {}
+        self.stacks = {}
+        self.samples = 0
+        self.outside = 0
+        # time spent in the handler itself, which is what sampling costs the run
+        self.spent = 0.0
+        self.clock = time.perf_counter
+        self.previous = None
+
+    def start(self):
+        self.previous = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self.previous)
+
+    def sample(self, signum, frame):
+        start = self.clock()
+        codes = self.codes
+        line = None
+        loops = []
+        while frame is not None:
+            if frame.f_code in codes:
+                node = frame.f_locals.get('node')
+                if line is None and not isinstance(node, SPANNING):
+                    line = getattr(node, 'lineno', None)
+                if isinstance(node, LOOPS):
+                    loops.append('{0}:{1}'.format(node.__class__.__name__, node.lineno))
+            frame = frame.f_back
+        self.samples += 1
+        if line is None:
+            # parsing, checking or anything else outside the nodes
+            self.outside += 1
+        else:
+            loops.reverse()
+            nest = tuple(loops)
+            self.lines[line] = self.lines.get(line, 0) + 1
+            self.nests[nest] = self.nests.get(nest, 0) + 1
+            stack = nest + ('line:{0}'.format(line),)
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.spent += self.clock() - start
+
+    def share(self, samples):
+        return 100.0 * samples / self.samples if self.samples else 0.0
+
+    def listing(self, source):
+        out = ["# {0} samples every {1:g}ms of cpu time, {2} outside the script; {3:.6f}s taking them".format(
+            self.samples, self.interval * 1000, self.outside, self.spent),
+            "{0:>5} {1:>9} {2:>6}  {3}".format('line', 'samples', '%', 'source')]
+        for number, text in enumerate(source.splitlines(), 1):
+            samples = self.lines.get(number)
+            if samples is None:
+                out.append("{0:5} {1:>9} {2:>6}  {3}".format(number, '', '', text))
+            else:
+                out.append("{0:5} {1:9} {2:5.1f}%  {3}".format(number, samples, self.share(samples), text))
+        out.append('')
+        out.append("{0:>9} {1:>6}  {2}".format('samples', '%', 'loops'))
+        for nest, samples in sorted(self.nests.items(), key=lambda item: -item[1]):
+            out.append("{0:9} {1:5.1f}%  {2}".format(samples, self.share(samples), ' > '.join(nest) or '(none)'))
+        return '\n'.join(out) + '\n'
+
+    def collapsed(self):
+        return ''.join("{0} {1}\n".format(';'.join(('program',) + stack), samples)
+                       for stack, samples in sorted(self.stacks.items()))
+
+    def write(self, prefix, source):
+        # prefix.samples is the annotated listing, prefix.folded the collapsed stacks
+        with open(prefix + '.samples', 'w') as file:
+            file.write(self.listing(source))
+        with open(prefix + '.folded', 'w') as file:
+            file.write(self.collapsed())
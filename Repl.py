@@ -0,0 +1,75 @@
+import sys
+
+from mparser import make_parser
+from Session import Session
+from StatementStream import Splitter, scan, parse_tokens
+
+PROMPT = '>>> '
+CONTINUATION = '... '
+
+
+class Repl(object):
+    # one parser, type checker scope and set of engine frames stay warm between lines;
+    # each instruction is parsed, checked and run as soon as it is complete, against
+    # everything that ran before it, instead of replaying the whole session
+
+    def __init__(self, engine='tree', optimize=True, output=None):
+        self.m_parser, self.parser = make_parser()
+        self.session = Session(engine, optimize, output)
+        self.splitter = Splitter()
+
+    def waiting(self):
+        # an 'if' is only run once the next line shows that no 'else' follows it
+        splitter = self.splitter
+        return bool(splitter.instruction) and not (splitter.complete and not splitter.open_if)
+
+    def feed(self, line):
+        splitter = self.splitter
+        tokens = list(scan(self.m_parser.scanner, line + '\n'))
+        if not tokens and splitter.complete:
+            self.run(splitter.take())
+        for token in tokens:
+            instruction = splitter.push(token)
+            if instruction:
+                self.run(instruction)
+        if splitter.complete and not splitter.open_if:
+            self.run(splitter.take())
+
+    def run(self, tokens):
+        program = parse_tokens(self.m_parser, self.parser, tokens)
+        if self.m_parser.error:
+            self.m_parser.error = False
+            return False
+        try:
+            return self.session.run(program)
+        except Exception as error:
+            message = str(error)
+            print("{0}: {1}".format(type(error).__name__, message) if message else type(error).__name__)
+            self.session.recover()
+            return False
+
+    def reset(self):
+        self.splitter.take()
+
+    def loop(self):
+        interactive = sys.stdin.isatty()
+        if interactive:
+            try:
+                import readline
+            except ImportError:
+                pass
+        while True:
+            prompt = CONTINUATION if self.waiting() else PROMPT
+            try:
+                line = input(prompt if interactive else '')
+            except EOFError:
+                break
+            except KeyboardInterrupt:
+                print()
+                self.reset()
+                continue
+            self.feed(line)
+        if self.splitter.instruction:
+            self.run(self.splitter.take())
+        if interactive:
+            print()
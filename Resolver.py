@@ -0,0 +1,209 @@
+import ast
+from visit import *
+
+
+class Scope(object):
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.slots = {}
+
+    def declare(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return self.slots[name]
+
+    def lookup(self, name):
+        # every enclosing frame that may hold the name, innermost first; at runtime
+        # the first one that has actually been assigned wins, like MemoryStack.get
+        candidates = []
+        scope = self
+        while scope is not None:
+            if name in scope.slots:
+                candidates.append((scope.depth, scope.slots[name]))
+            scope = scope.parent
+        return tuple(candidates)
+
+    def __len__(self):
+        return len(self.slots)
+
+
+def declare_temps(node, scope):
+    # compiler temporaries ($licm0, $cse0, ...) that the optimizer placed in this scope
+    for name in getattr(node, 'temps', ()):
+        scope.declare(name)
+
+
+def declare_writes(node, scope):
+    if isinstance(node, (ast.ProgramNode, ast.BlockNode)):
+        for instruction in node.instructions:
+            declare_writes(instruction, scope)
+    elif isinstance(node, ast.AssignmentNode) and isinstance(node.left.id, ast.IdNode):
+        scope.declare(node.left.id.value)
+
+
+class Resolver(object):
+
+    def __init__(self):
+        self.globals = Scope()
+        self.scope = self.globals
+
+    def resolve(self, node):
+        node.accept(self)
+        return node
+
+    def enter(self, node, *bodies):
+        self.scope = Scope(self.scope)
+        for body in bodies:
+            declare_writes(body, self.scope)
+        declare_temps(node, self.scope)
+        return self.scope
+
+    def leave(self, node):
+        node.frame_size = len(self.scope)
+        self.scope = self.scope.parent
+
+    @on('node')
+    def visit(self, node):
+        pass
+
+    @when(ast.ConstValueNode)
+    def visit(self, node):
+        pass
+
+    @when(ast.IdNode)
+    def visit(self, node):
+        node.slots = self.scope.lookup(node.value)
+
+    @when(ast.ProgramNode)
+    def visit(self, node):
+        declare_writes(node, self.globals)
+        declare_temps(node, self.globals)
+        for instruction in node.instructions:
+            instruction.accept(self)
+        node.frame_size = len(self.globals)
+
+    @when(ast.BlockNode)
+    def visit(self, node):
+        for instruction in node.instructions:
+            instruction.accept(self)
+
+    @when(ast.RangeNode)
+    def visit(self, node):
+        node.start.accept(self)
+        node.end.accept(self)
+        node.jump.accept(self)
+
+    @when(ast.ForNode)
+    def visit(self, node):
+        scope = self.enter(node, node.body)
+        node.slot = scope.declare(node.id.value)
+        node.range.accept(self)
+        node.body.accept(self)
+        self.leave(node)
+
+    @when(ast.WhileNode)
+    def visit(self, node):
+        self.enter(node, node.body)
+        node.condition.accept(self)
+        node.body.accept(self)
+        self.leave(node)
+
+    @when(ast.IfNode)
+    def visit(self, node):
+        self.enter(node, node.body)
+        node.condition.accept(self)
+        node.body.accept(self)
+        self.leave(node)
+
+    @when(ast.IfElseNode)
+    def visit(self, node):
+        self.enter(node, node.body, node.else_body)
+        node.condition.accept(self)
+        node.body.accept(self)
+        node.else_body.accept(self)
+        self.leave(node)
+
+    @when(ast.BreakNode)
+    def visit(self, node):
+        pass
+
+    @when(ast.ContinueNode)
+    def visit(self, node):
+        pass
+
+    @when(ast.ReturnNode)
+    def visit(self, node):
+        node.result.accept(self)
+
+    @when(ast.PrintNode)
+    def visit(self, node):
+        node.printable.accept(self)
+
+    @when(ast.ConditionNode)
+    def visit(self, node):
+        node.left.accept(self)
+        node.right.accept(self)
+
+    @when(ast.AssignmentNode)
+    def visit(self, node):
+        node.right.accept(self)
+        node.left.accept(self)
+
+    @when(ast.AssignToNode)
+    def visit(self, node):
+        node.id.accept(self)
+        if isinstance(node.id, ast.IdNode):
+            node.depth = self.scope.depth
+            node.slot = self.scope.slots[node.id.value]
+
+    @when(ast.AccessNode)
+    def visit(self, node):
+        node.id.accept(self)
+        node.specifier.accept(self)
+
+    @when(ast.ExpressionNode)
+    def visit(self, node):
+        node.left.accept(self)
+        node.right.accept(self)
+
+    @when(ast.TranspositionNode)
+    def visit(self, node):
+        node.value.accept(self)
+
+    @when(ast.NegationNode)
+    def visit(self, node):
+        node.value.accept(self)
+
+    @when(ast.FunctionNode)
+    def visit(self, node):
+        node.argument.accept(self)
+
+    @when(ast.MatrixNode)
+    def visit(self, node):
+        for row in node.rows:
+            row.accept(self)
+
+    @when(ast.SequenceNode)
+    def visit(self, node):
+        for value in node.values:
+            value.accept(self)
+
+    @when(ast.HoistedNode)
+    def visit(self, node):
+        node.value.accept(self)
+        (node.depth, node.slot), = self.scope.lookup(node.name)
+
+    @when(ast.SharedNode)
+    def visit(self, node):
+        node.value.accept(self)
+        (node.depth, node.slot), = self.scope.lookup(node.name)
+
+    @when(ast.FusedNode)
+    def visit(self, node):
+        for operand in node.operands:
+            operand.accept(self)
+
+    @when(ast.ErrorNode)
+    def visit(self, node):
+        pass
@@ -0,0 +1,78 @@
+from TypeChecker import TypeChecker
+from Resolver import Resolver
+from Output import Output
+
+
+def optimize(ast, report=None):
+    from Optimizer import Optimizer
+    from LoopHoister import LoopHoister
+    from SubexpressionEliminator import SubexpressionEliminator
+    from ExpressionFuser import ExpressionFuser
+    stages = (Optimizer(), LoopHoister(), SubexpressionEliminator(), ExpressionFuser())
+    for stage in stages:
+        ast = stage.optimize(ast)
+    if report is not None:
+        for stage in stages:
+            report(stage.report())
+    return ast
+
+
+class Session(object):
+    # type checker scopes, resolved globals and engine frames that outlive a single
+    # program, so a script can be fed in one instruction (or one line) at a time
+
+    def __init__(self, engine='tree', optimize=True, output=None, profile=None):
+        self.optimize = optimize
+        self.output = output = output if output is not None else Output()
+        self.type_checker = TypeChecker()
+        self.scope = self.type_checker.scope_table.pushScope("program")
+        self.resolver = Resolver()
+        if engine == 'vm':
+            from Compiler import Compiler
+            from VirtualMachine import VirtualMachine
+            vm = VirtualMachine(output)
+            self.frames = vm.frames
+            self.engine = lambda program: vm.run(Compiler().compile(program))
+        elif engine == 'closure':
+            from ClosureCompiler import ClosureCompiler
+            compiler = ClosureCompiler(output)
+            self.frames = compiler.frames.frames
+            self.engine = compiler.run
+        elif profile is not None:
+            from Profiler import ProfilingInterpreter
+            interpreter = ProfilingInterpreter(output, profile)
+            self.frames = interpreter.memory_stack.frames
+            self.engine = lambda program: program.accept(interpreter)
+        else:
+            from Interpreter import Interpreter
+            interpreter = Interpreter(output)
+            self.frames = interpreter.memory_stack.frames
+            self.engine = lambda program: program.accept(interpreter)
+
+    def check(self, program):
+        for instruction in program.instructions:
+            self.type_checker.visit(instruction)
+        return not self.type_checker.errors
+
+    def execute(self, program):
+        self.resolver.resolve(program)
+        try:
+            self.engine(program)
+        finally:
+            self.output.drain()
+
+    def run(self, program):
+        if not self.check(program):
+            return False
+        if self.optimize:
+            program = optimize(program)
+        self.execute(program)
+        return True
+
+    def recover(self):
+        # drop whatever an instruction that failed half way left behind, keeping the globals
+        scope_table = self.type_checker.scope_table
+        while scope_table.current_scope_number > self.scope:
+            scope_table.popScope()
+        self.resolver.scope = self.resolver.globals
+        del self.frames[1:]
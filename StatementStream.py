@@ -0,0 +1,92 @@
+import functools
+
+CHUNK_SIZE = 1 << 16
+OPENING = '([{'
+CLOSING = ')]}'
+
+
+class Splitter(object):
+    # collects tokens into top-level instructions; an instruction ends at a ';' or '}'
+    # outside any brackets unless the next token is an 'else'
+
+    def __init__(self):
+        self.instruction = []
+        self.depth = 0
+        self.complete = False
+        self.open_if = False
+
+    def push(self, token):
+        # returns the previous instruction once this token shows it is over
+        done = None
+        if self.complete and token.type != 'ELSE':
+            done = self.take()
+        self.complete = False
+        self.instruction.append(token)
+        if token.type in OPENING:
+            self.depth += 1
+        elif token.type in CLOSING:
+            self.depth -= 1
+        elif token.type == 'IF' and self.depth <= 0:
+            self.open_if = True
+        if self.depth <= 0 and token.type in (';', '}'):
+            self.depth = 0
+            self.complete = True
+        return done
+
+    def take(self):
+        instruction = self.instruction
+        self.instruction = []
+        self.depth = 0
+        self.complete = False
+        self.open_if = False
+        return instruction
+
+
+class StatementStream(object):
+    # splits a script into top-level instructions without holding more than one chunk
+    # and one instruction's tokens in memory
+
+    def __init__(self, file, scanner, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.scanner = scanner
+        self.chunk_size = chunk_size
+
+    def chunks(self):
+        # cut at line ends, so no token is ever split between two chunks
+        rest = ''
+        while True:
+            data = self.file.read(self.chunk_size)
+            if not data:
+                if rest:
+                    yield rest
+                return
+            text = rest + data
+            cut = text.rfind('\n') + 1
+            if cut:
+                yield text[:cut]
+            rest = text[cut:]
+
+    def tokens(self):
+        for chunk in self.chunks():
+            for token in scan(self.scanner, chunk):
+                yield token
+
+    def __iter__(self):
+        splitter = Splitter()
+        for token in self.tokens():
+            instruction = splitter.push(token)
+            if instruction:
+                yield instruction
+        if splitter.instruction:
+            yield splitter.take()
+
+
+def scan(scanner, text):
+    scanner.input(text)
+    for token in iter(scanner.token, None):
+        token.column = scanner.find_column(token)
+        yield token
+
+
+def parse_tokens(m_parser, parser, tokens):
+    return parser.parse(lexer=m_parser.scanner, tokenfunc=functools.partial(next, iter(tokens), None))
@@ -0,0 +1,206 @@
+import ast
+import itertools
+from LoopHoister import IMPURE, target_name, writes
+from visit import *
+
+SHAREABLE = (ast.ExpressionNode, ast.TranspositionNode, ast.FunctionNode)
+
+
+def structure(node, names):
+    # a hashable description of a pure subtree, or None when it is not one
+    if isinstance(node, ast.ConstValueNode):
+        return 'const', type(node.value), node.value
+    if isinstance(node, ast.IdNode):
+        names.add(node.value)
+        return 'id', node.value
+    if isinstance(node, (ast.ExpressionNode, ast.ConditionNode)):
+        parts = node.operator, structure(node.left, names), structure(node.right, names)
+    elif isinstance(node, ast.NegationNode):
+        parts = '-', structure(node.value, names)
+    elif isinstance(node, ast.TranspositionNode):
+        parts = "'", structure(node.value, names)
+    elif isinstance(node, ast.FunctionNode):
+        if node.name in IMPURE:
+            return None
+        parts = node.name, structure(node.argument, names)
+    elif isinstance(node, ast.AccessNode):
+        parts = '[]', structure(node.id, names), structure(node.specifier, names)
+    elif isinstance(node, ast.MatrixNode):
+        parts = ('matrix',) + tuple(structure(row, names) for row in node.rows)
+    elif isinstance(node, ast.SequenceNode):
+        parts = ('sequence',) + tuple(structure(value, names) for value in node.values)
+    else:
+        return None
+    if None in parts:
+        return None
+    return parts
+
+
+class SubexpressionEliminator(object):
+    # the tree is walked twice in evaluation order: the first walk finds repeated
+    # subtrees whose operands are unchanged, the second makes the first occurrence
+    # store its value in a temporary ($cse0, ...) and the later ones read it back;
+    # a value computed inside a branch or loop body is only reused within it
+
+    def __init__(self):
+        self.shared = 0
+        # occurrences read back from a temporary; one in a loop body saves an
+        # evaluation every time round, so this is not a count of evaluations saved
+        self.replaced = 0
+
+    def optimize(self, node):
+        self.uses = {}
+        self.use_of = {}
+        self.rewrite = False
+        self.walk(node)
+        self.temps = {}
+        self.rewrite = True
+        self.walk(node)
+        return node
+
+    def report(self):
+        return "common subexpressions: {0} shared, {1} occurrences replaced".format(self.shared, self.replaced)
+
+    def walk(self, node):
+        self.versions = {}
+        self.clock = itertools.count(1)
+        self.available = {}
+        self.occurrence = 0
+        self.scopes = []
+        node.accept(self)
+
+    def bump(self, names):
+        for name in names:
+            self.versions[name] = next(self.clock)
+
+    def region(self, scope, visit):
+        available = dict(self.available)
+        self.scopes.append(scope)
+        visit()
+        self.scopes.pop()
+        self.available = available
+
+    def expression(self, node):
+        names = set()
+        parts = structure(node, names) if isinstance(node, SHAREABLE) else None
+        if parts is None:
+            return self.children(node)
+        key = parts, tuple(sorted((name, self.versions.get(name, 0)) for name in names))
+        index = self.occurrence
+        self.occurrence += 1
+        if not self.rewrite:
+            if key in self.available:
+                first = self.available[key]
+                self.uses[first] = self.uses.get(first, 0) + 1
+                self.use_of[index] = first
+                return node
+            self.available[key] = index
+            return self.children(node)
+        if index in self.use_of:
+            self.replaced += 1
+            return ast.IdNode(self.temps[self.use_of[index]], node.lineno)
+        node = self.children(node)
+        if index in self.uses:
+            name = '$cse{0}'.format(self.shared)
+            self.shared += 1
+            self.temps[index] = name
+            scope = self.scopes[-1]
+            scope.temps = getattr(scope, 'temps', ()) + (name,)
+            return ast.SharedNode(node, name, node.lineno)
+        return node
+
+    def children(self, node):
+        # rebuilt in the order the engines evaluate them
+        if isinstance(node, (ast.ExpressionNode, ast.ConditionNode)):
+            node.left = self.expression(node.left)
+            node.right = self.expression(node.right)
+        elif isinstance(node, (ast.NegationNode, ast.TranspositionNode)):
+            node.value = self.expression(node.value)
+        elif isinstance(node, ast.FunctionNode):
+            node.argument = self.expression(node.argument)
+        elif isinstance(node, ast.AccessNode):
+            node.specifier = self.expression(node.specifier)
+        elif isinstance(node, ast.MatrixNode):
+            node.rows = [self.expression(row) for row in node.rows]
+        elif isinstance(node, ast.SequenceNode):
+            node.values = [self.expression(value) for value in node.values]
+        return node
+
+    def branches(self, node, bodies):
+        versions = self.versions
+        written = set()
+        for body in bodies:
+            self.versions = dict(versions)
+            self.region(node, lambda: body.accept(self))
+            writes(body, written)
+        self.versions = versions
+        self.bump(written)
+
+    @on('node')
+    def visit(self, node):
+        pass
+
+    @when(ast.ProgramNode)
+    def visit(self, node):
+        self.scopes.append(node)
+        for instruction in node.instructions:
+            instruction.accept(self)
+        self.scopes.pop()
+
+    @when(ast.BlockNode)
+    def visit(self, node):
+        for instruction in node.instructions:
+            instruction.accept(self)
+
+    @when(ast.ForNode)
+    def visit(self, node):
+        node.range.start = self.expression(node.range.start)
+        node.range.end = self.expression(node.range.end)
+        node.range.jump = self.expression(node.range.jump)
+        written = writes(node, set())
+        self.bump(written)
+        self.region(node, lambda: node.body.accept(self))
+        self.bump(written)
+
+    @when(ast.WhileNode)
+    def visit(self, node):
+        written = writes(node, set())
+        self.bump(written)
+
+        def visit():
+            node.condition = self.expression(node.condition)
+            node.body.accept(self)
+
+        self.region(node, visit)
+        self.bump(written)
+
+    @when(ast.IfNode)
+    def visit(self, node):
+        node.condition = self.expression(node.condition)
+        self.branches(node, [node.body])
+
+    @when(ast.IfElseNode)
+    def visit(self, node):
+        node.condition = self.expression(node.condition)
+        self.branches(node, [node.body, node.else_body])
+
+    @when(ast.ReturnNode)
+    def visit(self, node):
+        node.result = self.expression(node.result)
+
+    @when(ast.PrintNode)
+    def visit(self, node):
+        node.printable = self.expression(node.printable)
+
+    @when(ast.FunctionNode)
+    def visit(self, node):
+        # save(path, A), the one call that is a statement
+        node.argument = self.expression(node.argument)
+
+    @when(ast.AssignmentNode)
+    def visit(self, node):
+        # every engine evaluates the indices of an indexed store before its value
+        if isinstance(node.left.id, ast.AccessNode):
+            node.left.id.specifier = self.expression(node.left.id.specifier)
+        node.right = self.expression(node.right)
+        self.bump([target_name(node.left)])
@@ -141,6 +141,22 @@ class TreePrinter:
         for row in self.rows:
             row.printTree(indent+1)
 
+    @addToClass(ast.HoistedNode)
+    def printTree(self, indent=0):
+        print_with_ident("Hoisted " + self.name, indent)
+        self.value.printTree(indent + 1)
+
+    @addToClass(ast.SharedNode)
+    def printTree(self, indent=0):
+        print_with_ident("Shared " + self.name, indent)
+        self.value.printTree(indent + 1)
+
+    @addToClass(ast.FusedNode)
+    def printTree(self, indent=0):
+        print_with_ident("Fused " + repr(self.kernel), indent)
+        for operand in self.operands:
+            operand.printTree(indent + 1)
+
     @addToClass(ast.SequenceNode)
     def printTree(self, indent=0):
         print_with_ident("Sequence", indent)
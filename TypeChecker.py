@@ -1,13 +1,17 @@
 import ast
+from visit import method_table
+from Matrices import WHOLE
 from ScopeTable import ScopeTable, FloatType, StringType, IntType, VectorType, UnknownType, MatrixType, VoidType
 
 
 class NodeVisitor(object):
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.visit_table = method_table(cls, 'visit_', cls.generic_visit)
+
     def visit(self, node):
-        method = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node)
+        return self.visit_table[node.__class__](self, node)
 
     def generic_visit(self, node):
         if isinstance(node, list):
@@ -63,6 +67,35 @@ class TypeChecker(NodeVisitor):
                 return MatrixType(width=type1.width, height=type1.height)
         return None
 
+    @staticmethod
+    def shape(typ):
+        # (height, width) of a matrix type, a vector being a single row; None for scalars
+        if checkType(typ, VectorType):
+            return 1, typ.size
+        if checkType(typ, MatrixType):
+            return typ.height, typ.width
+        return None
+
+    @staticmethod
+    def checkProductType(type1, type2, lineno):
+        shape1 = TypeChecker.shape(type1)
+        shape2 = TypeChecker.shape(type2)
+        if shape1 is None or shape2 is None:
+            scalar, matrix = (type1, type2) if shape1 is None else (type2, type1)
+            if not (checkType(scalar, FloatType) or checkType(scalar, IntType)):
+                return None
+            if checkType(matrix, VectorType):
+                return VectorType(size=matrix.size)
+            return MatrixType(width=matrix.width, height=matrix.height)
+        height, inner1 = shape1
+        inner2, width = shape2
+        if inner1 and inner2 and inner1 != inner2:
+            print("Matrix {1} and {2} cannot be multiplied at line {0}".format(lineno, type1, type2))
+            return UnknownType()
+        if checkType(type1, VectorType):
+            return VectorType(size=width)
+        return MatrixType(width=width, height=height)
+
     @staticmethod
     def checkCompExprType(type1, type2, lineno):
         if checkType(type1, VectorType) and checkType(type2, VectorType):
@@ -156,6 +189,8 @@ class TypeChecker(NodeVisitor):
             result = UnknownType()
         elif op == '.+' or op == '.-' or op == '.*' or op == './':
             result = TypeChecker.checkMatrixExprType(type1, type2, lineno)
+        elif op == '*' and (TypeChecker.shape(type1) is not None or TypeChecker.shape(type2) is not None):
+            result = TypeChecker.checkProductType(type1, type2, lineno)
         elif op == "==" or op == "!=" or op == ">=" or op == "<=" or op == ">" or op == "<":
             result = TypeChecker.checkCompExprType(type1, type2, lineno)
         else:
@@ -276,13 +311,13 @@ class TypeChecker(NodeVisitor):
                 val = UnknownType()
             else:
                 val = self.checkExprType(type1, type2, node.operator[0], node.lineno)
-        if checkType(node.left.id, ast.AccessNode):
+        if isinstance(node.left.id, ast.AccessNode):
             return val
         else:
             return self.putVariable(node.left.id, val)
 
     def visit_AssignToNode(self, node):
-        if checkType(node.id, ast.AccessNode):
+        if isinstance(node.id, ast.AccessNode):
             return self.visit(node.id)
         else:
             name = node.id.value
@@ -296,6 +331,10 @@ class TypeChecker(NodeVisitor):
         typ = self.visit(node.id)
         seq = self.visit(node.specifier)
         result = None
+        if any(isinstance(value, ast.RangeNode) or checkType(value, ast.ConstValueNode) and value.value is WHOLE
+               for value in node.specifier.values):
+            # a slice, whose size is only known once the ranges are
+            return MatrixType(width=None, height=None)
         if checkType(typ, UnknownType):
             result = None
         elif checkType(typ, VectorType):
@@ -325,7 +364,7 @@ class TypeChecker(NodeVisitor):
                 j = seq.value[1].value
                 if not checkType(j, int) or not checkType(j, int):
                     result = None
-                elif i >= typ.width or j >= typ.height:
+                elif typ.width is not None and typ.height is not None and (i >= typ.width or j >= typ.height):
                     print("Index [{1},{2}] out of  boundaries at line {0}".format(node.lineno, seq.value[0],
                                                                                   seq.value[1]))
                     result = None
@@ -373,6 +412,10 @@ class TypeChecker(NodeVisitor):
         return typ
 
     def visit_FunctionNode(self, node):
+        if node.name == 'load':
+            return self.checkLoad(node)
+        if node.name == 'save':
+            return self.checkSave(node)
         typ = self.visit(node.argument)
         if checkType(typ, IntType):
             value = typ.value
@@ -387,6 +430,25 @@ class TypeChecker(NodeVisitor):
               .format(node.lineno, typ))
         return UnknownType()
 
+    def checkLoad(self, node):
+        typ = self.visit(node.argument)
+        if not (checkType(typ, StringType) or checkType(typ, UnknownType)):
+            print("Function load with wrong parameter, wanted type String, got {1} at line {0}"
+                  .format(node.lineno, typ))
+            return UnknownType()
+        # the size is only known once the file is read
+        return MatrixType(width=None, height=None)
+
+    def checkSave(self, node):
+        path, value = [self.visit(argument) for argument in node.argument.values]
+        if not (checkType(path, StringType) or checkType(path, UnknownType)):
+            print("Function save with wrong parameter, wanted type String, got {1} at line {0}"
+                  .format(node.lineno, path))
+        elif not (checkType(value, MatrixType) or checkType(value, VectorType) or checkType(value, UnknownType)):
+            print("Function save with wrong parameter, wanted a matrix, got {1} at line {0}"
+                  .format(node.lineno, value))
+        return VoidType()
+
     def visit_MatrixNode(self, node):
         values = []
         for val in node.rows:
@@ -0,0 +1,545 @@
+import operator
+
+from Compiler import *
+from Exceptions import *
+from Interpreter import get_backend, store_item
+from Memory import UNSET, locate
+from Output import Output
+
+
+class Halt(Exception):
+    pass
+
+
+class Context(object):
+    # what the handlers of one run share: the frames outlive it, the stack does not
+    def __init__(self, code, frames, output):
+        self.code = code
+        self.frames = frames
+        self.stack = []
+        self.line = output.line
+        self.backend = get_backend()
+
+
+# every instruction is bound once per run to a handler that has its argument and the
+# position of the next instruction at hand and returns where to go on, so running an
+# instruction is a single call instead of a walk down a chain of opcode tests
+
+def load_const(context, arg, following):
+    push = context.stack.append
+    value = context.code.consts[arg]
+
+    def run():
+        push(value)
+        return following
+
+    return run
+
+
+def load_slot(context, arg, following):
+    # a name the compiler found in exactly one frame
+    frames = context.frames
+    push = context.stack.append
+    (depth, slot), = context.code.slots[arg]
+
+    def run():
+        value = frames[depth][slot]
+        push(None if value is UNSET else value)
+        return following
+
+    return run
+
+
+def load_name(context, arg, following):
+    frames = context.frames
+    push = context.stack.append
+    slots = context.code.slots[arg]
+
+    def run():
+        for depth, slot in slots:
+            value = frames[depth][slot]
+            if value is not UNSET:
+                push(value)
+                return following
+        push(None)
+        return following
+
+    return run
+
+
+def store_name(context, arg, following):
+    frames = context.frames
+    pop = context.stack.pop
+    (depth, slot), = context.code.slots[arg]
+
+    def run():
+        frames[depth][slot] = pop()
+        return following
+
+    return run
+
+
+def load_cached(context, arg, following):
+    frames = context.frames
+    push = context.stack.append
+    (depth, slot), = context.code.slots[arg]
+
+    def run():
+        push(frames[depth][slot])
+        return following
+
+    return run
+
+
+def binary_add(context, arg, following):
+    stack = context.stack
+    pop = stack.pop
+
+    def run():
+        right = pop()
+        stack[-1] = stack[-1] + right
+        return following
+
+    return run
+
+
+def binary_subtract(context, arg, following):
+    stack = context.stack
+    pop = stack.pop
+
+    def run():
+        right = pop()
+        stack[-1] = stack[-1] - right
+        return following
+
+    return run
+
+
+def binary_op(context, arg, following):
+    stack = context.stack
+    pop = stack.pop
+    function = context.code.consts[arg]
+
+    def run():
+        right = pop()
+        stack[-1] = function(stack[-1], right)
+        return following
+
+    return run
+
+
+def compare(function):
+    def bind(context, arg, following):
+        stack = context.stack
+        pop = stack.pop
+
+        def run():
+            right = pop()
+            stack[-1] = function(stack[-1], right)
+            return following
+
+        return run
+
+    return bind
+
+
+Operators = {
+    BINARY_ADD: operator.add,
+    BINARY_SUBTRACT: operator.sub,
+    COMPARE_LT: operator.lt,
+    COMPARE_LE: operator.le,
+    COMPARE_GT: operator.gt,
+    COMPARE_GE: operator.ge,
+    COMPARE_EQ: operator.eq,
+    COMPARE_NE: operator.ne,
+}
+
+
+def operation(context, op, arg):
+    return context.code.consts[arg] if op == BINARY_OP else Operators[op]
+
+
+def const_operand(context, load, op, arg, following):
+    # LOAD_CONST and the operator after it in one step: the constant is the right operand
+    stack = context.stack
+    function = operation(context, op, arg)
+    value = context.code.consts[load]
+
+    def run():
+        stack[-1] = function(stack[-1], value)
+        return following
+
+    return run
+
+
+def slot_operand(context, load, op, arg, following):
+    # LOAD_SLOT and the operator after it in one step
+    stack = context.stack
+    frames = context.frames
+    function = operation(context, op, arg)
+    (depth, slot), = context.code.slots[load]
+
+    def run():
+        value = frames[depth][slot]
+        stack[-1] = function(stack[-1], None if value is UNSET else value)
+        return following
+
+    return run
+
+
+def pop_jump_if_false(context, arg, following):
+    pop = context.stack.pop
+
+    def run():
+        return following if pop() else arg
+
+    return run
+
+
+def jump(context, arg, following):
+    def run():
+        return arg
+
+    return run
+
+
+def for_iter(context, arg, following):
+    stack = context.stack
+    push = stack.append
+    pop = stack.pop
+
+    def run():
+        for value in stack[-1]:
+            push(value)
+            return following
+        pop()
+        return arg
+
+    return run
+
+
+def for_iter_store(context, arg, store, following):
+    # FOR_ITER and the STORE_NAME of the loop variable after it in one step
+    iterators = context.stack
+    pop = iterators.pop
+    frames = context.frames
+    (depth, slot), = context.code.slots[store]
+
+    def run():
+        for value in iterators[-1]:
+            frames[depth][slot] = value
+            return following
+        pop()
+        return arg
+
+    return run
+
+
+def jump_if_cached(context, arg, following):
+    stack = context.stack
+    pop = stack.pop
+
+    def run():
+        if stack[-1] is not UNSET:
+            return arg
+        pop()
+        return following
+
+    return run
+
+
+def dup_top(context, arg, following):
+    stack = context.stack
+    push = stack.append
+
+    def run():
+        push(stack[-1])
+        return following
+
+    return run
+
+
+def pop_top(context, arg, following):
+    pop = context.stack.pop
+
+    def run():
+        pop()
+        return following
+
+    return run
+
+
+def push_frame(context, arg, following):
+    push = context.frames.append
+
+    def run():
+        push([UNSET] * arg)
+        return following
+
+    return run
+
+
+def pop_frames(context, arg, following):
+    frames = context.frames
+
+    def run():
+        del frames[-arg:]
+        return following
+
+    return run
+
+
+def print_values(context, arg, following):
+    stack = context.stack
+    line = context.line
+    printable = context.backend.printable
+
+    def run():
+        values = stack[-arg:]
+        del stack[-arg:]
+        line(values, printable)
+        return following
+
+    return run
+
+
+def build_list(context, arg, following):
+    stack = context.stack
+    push = stack.append
+
+    def run():
+        if arg:
+            values = stack[-arg:]
+            del stack[-arg:]
+        else:
+            values = []
+        push(values)
+        return following
+
+    return run
+
+
+def build_matrix(context, arg, following):
+    stack = context.stack
+    push = stack.append
+    matrix = context.backend.matrix
+
+    def run():
+        rows = stack[-arg:]
+        del stack[-arg:]
+        push(matrix(rows))
+        return following
+
+    return run
+
+
+def index(context, arg, following):
+    stack = context.stack
+    lookup = context.backend.index
+
+    def run():
+        indices = stack[-arg:]
+        del stack[-arg:]
+        stack[-1] = lookup(stack[-1], indices)
+        return following
+
+    return run
+
+
+def store(context, arg, following):
+    frames = context.frames
+    pop = context.stack.pop
+    slots = context.code.slots[arg]
+
+    def run():
+        op = pop()
+        value = pop()
+        frame, slot = locate(frames, slots)
+        store_item(frame, slot, pop(), op, value)
+        return following
+
+    return run
+
+
+def unary_negative(context, arg, following):
+    stack = context.stack
+
+    def run():
+        stack[-1] = -stack[-1]
+        return following
+
+    return run
+
+
+def transpose(context, arg, following):
+    stack = context.stack
+    function = context.backend.transpose
+
+    def run():
+        stack[-1] = function(stack[-1])
+        return following
+
+    return run
+
+
+def call_function(context, arg, following):
+    stack = context.stack
+    function = context.code.consts[arg]
+
+    def run():
+        stack[-1] = function(stack[-1])
+        return following
+
+    return run
+
+
+def get_range(context, arg, following):
+    stack = context.stack
+    pop = stack.pop
+
+    def run():
+        step = pop()
+        end = pop()
+        stack[-1] = iter(range(stack[-1], end + 1, step))
+        return following
+
+    return run
+
+
+def halt(context, arg, following):
+    def run():
+        raise Halt()
+
+    return run
+
+
+def raise_break(context, arg, following):
+    def run():
+        raise BreakException()
+
+    return run
+
+
+def raise_continue(context, arg, following):
+    def run():
+        raise ContinueException()
+
+    return run
+
+
+def raise_return(context, arg, following):
+    pop = context.stack.pop
+
+    def run():
+        raise ReturnValueException(pop())
+
+    return run
+
+
+def raise_error(context, arg, following):
+    error = context.code.consts[arg]
+
+    def run():
+        raise error
+
+    return run
+
+
+Handlers = {
+    LOAD_CONST: load_const,
+    LOAD_NAME: load_name,
+    LOAD_SLOT: load_slot,
+    STORE_NAME: store_name,
+    POP_TOP: pop_top,
+    BINARY_ADD: binary_add,
+    BINARY_SUBTRACT: binary_subtract,
+    BINARY_OP: binary_op,
+    COMPARE_LT: compare(operator.lt),
+    COMPARE_LE: compare(operator.le),
+    COMPARE_GT: compare(operator.gt),
+    COMPARE_GE: compare(operator.ge),
+    COMPARE_EQ: compare(operator.eq),
+    COMPARE_NE: compare(operator.ne),
+    UNARY_NEGATIVE: unary_negative,
+    TRANSPOSE: transpose,
+    CALL_FUNCTION: call_function,
+    BUILD_LIST: build_list,
+    BUILD_MATRIX: build_matrix,
+    INDEX: index,
+    STORE_ITEM: store,
+    PRINT: print_values,
+    PUSH_FRAME: push_frame,
+    POP_FRAMES: pop_frames,
+    JUMP: jump,
+    POP_JUMP_IF_FALSE: pop_jump_if_false,
+    GET_RANGE: get_range,
+    FOR_ITER: for_iter,
+    RAISE_BREAK: raise_break,
+    RAISE_CONTINUE: raise_continue,
+    RAISE_RETURN: raise_return,
+    RAISE_ERROR: raise_error,
+    LOAD_CACHED: load_cached,
+    JUMP_IF_CACHED: jump_if_cached,
+    DUP_TOP: dup_top,
+    HALT: halt,
+}
+
+# a load these operators take their right operand from can be run as part of them
+Operands = {
+    LOAD_CONST: const_operand,
+    LOAD_SLOT: slot_operand,
+}
+
+JUMPS = (JUMP, POP_JUMP_IF_FALSE, FOR_ITER, JUMP_IF_CACHED)
+
+# the instructions that may start a pair run as one step
+FIRSTS = (FOR_ITER, LOAD_CONST, LOAD_SLOT)
+
+
+class VirtualMachine(object):
+
+    def __init__(self, output=None):
+        self.frames = [[]]
+        self.output = output if output is not None else Output()
+
+    def bind(self, code):
+        # one handler per instruction; a jump to a JUMP goes straight on to where that
+        # one leads, and a pair that no jump lands in the middle of may run as one step,
+        # which leaves its second instruction in place for nothing but a jump to reach
+        context = Context(code, self.frames, self.output)
+        ops, args = code.ops, code.args
+        targets = set(args[pc] for pc, op in enumerate(ops) if op in JUMPS)
+        ahead = list(range(len(ops) + 2))
+        for pc, op in enumerate(ops):
+            if op == JUMP:
+                target = args[pc]
+                while ops[target] == JUMP:
+                    target = args[target]
+                ahead[pc] = target
+        program = []
+        for pc, op in enumerate(ops):
+            arg = args[pc]
+            if op in JUMPS:
+                arg = ahead[arg]
+            if op in FIRSTS and pc + 1 not in targets:
+                second = ops[pc + 1]
+                if op == FOR_ITER and second == STORE_NAME:
+                    program.append(for_iter_store(context, arg, args[pc + 1], ahead[pc + 2]))
+                    continue
+                if op != FOR_ITER and (second in Operators or second == BINARY_OP):
+                    program.append(Operands[op](context, arg, second, args[pc + 1], ahead[pc + 2]))
+                    continue
+            program.append(Handlers[op](context, arg, ahead[pc + 1]))
+        return program
+
+    def run(self, code):
+        frames = self.frames
+        if len(frames[0]) < code.frame_size:
+            frames[0].extend([UNSET] * (code.frame_size - len(frames[0])))
+        program = self.bind(code)
+        pc = 0
+        try:
+            while True:
+                pc = program[pc]()
+        except Halt:
+            pass
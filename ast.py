@@ -1,33 +1,45 @@
 class Node:
+    __slots__ = ()
+
     def accept(self, visitor):
         return visitor.visit(self)
 
 
 class ConstValueNode(Node):
+    __slots__ = ('value', 'lineno')
+
     def __init__(self, value, lineno):
         self.value = value
         self.lineno = lineno
 
 
 class IdNode(Node):
+    __slots__ = ('value', 'lineno', 'slots')
+
     def __init__(self, value, lineno):
         self.value = value
         self.lineno = lineno
 
 
 class ProgramNode(Node):
+    __slots__ = ('instructions', 'lineno', 'frame_size', 'temps')
+
     def __init__(self, instructions, lineno):
         self.instructions = instructions
         self.lineno = lineno
 
 
 class BlockNode(Node):
+    __slots__ = ('instructions', 'lineno')
+
     def __init__(self, instructions, lineno):
         self.instructions = instructions
         self.lineno = lineno
 
 
 class RangeNode(Node):
+    __slots__ = ('start', 'end', 'jump', 'lineno')
+
     def __init__(self, start, end, lineno, jump=None):
         if jump is None:
             jump = ConstValueNode(1, lineno)
@@ -41,6 +53,8 @@ class RangeNode(Node):
 
 
 class ForNode(Node):
+    __slots__ = ('id', 'range', 'body', 'lineno', 'slot', 'frame_size', 'temps')
+
     def __init__(self, id, range, body, lineno):
         self.id = id
         self.range = range
@@ -52,6 +66,8 @@ class ForNode(Node):
 
 
 class WhileNode(Node):
+    __slots__ = ('condition', 'body', 'lineno', 'frame_size', 'temps')
+
     def __init__(self, condition, body, lineno):
         self.condition = condition
         self.body = body
@@ -62,6 +78,8 @@ class WhileNode(Node):
 
 
 class IfNode(Node):
+    __slots__ = ('condition', 'body', 'lineno', 'frame_size', 'temps')
+
     def __init__(self, condition, body, lineno):
         self.condition = condition
         self.body = body
@@ -72,6 +90,8 @@ class IfNode(Node):
 
 
 class IfElseNode(Node):
+    __slots__ = ('condition', 'body', 'else_body', 'lineno', 'frame_size', 'temps')
+
     def __init__(self, condition, body, else_body, lineno):
         self.condition = condition
         self.body = body
@@ -83,6 +103,8 @@ class IfElseNode(Node):
 
 
 class BreakNode(Node):
+    __slots__ = ('lineno',)
+
     def __init__(self, lineno):
         self.lineno = lineno
 
@@ -91,6 +113,8 @@ class BreakNode(Node):
 
 
 class ContinueNode(Node):
+    __slots__ = ('lineno',)
+
     def __init__(self, lineno):
         self.lineno = lineno
 
@@ -99,6 +123,8 @@ class ContinueNode(Node):
 
 
 class ReturnNode(Node):
+    __slots__ = ('result', 'lineno')
+
     def __init__(self, result, lineno):
         self.result = result
         self.lineno = lineno
@@ -108,6 +134,8 @@ class ReturnNode(Node):
 
 
 class PrintNode(Node):
+    __slots__ = ('printable', 'lineno')
+
     def __init__(self, printable, lineno):
         self.printable = printable
         self.lineno = lineno
@@ -117,6 +145,8 @@ class PrintNode(Node):
 
 
 class ConditionNode(Node):
+    __slots__ = ('left', 'operator', 'right', 'lineno')
+
     def __init__(self, left, operator, right, lineno):
         self.left = left
         self.operator = operator
@@ -128,6 +158,8 @@ class ConditionNode(Node):
 
 
 class AssignmentNode(Node):
+    __slots__ = ('left', 'operator', 'right', 'lineno')
+
     def __init__(self, left, operator, right, lineno):
         self.left = left
         self.operator = operator
@@ -139,6 +171,8 @@ class AssignmentNode(Node):
 
 
 class AssignToNode(Node):
+    __slots__ = ('id', 'lineno', 'depth', 'slot')
+
     def __init__(self, id, lineno):
         self.id = id
         self.lineno = lineno
@@ -148,6 +182,8 @@ class AssignToNode(Node):
 
 
 class AccessNode(Node):
+    __slots__ = ('id', 'specifier', 'lineno')
+
     def __init__(self, id, specifier, lineno):
         self.id = id
         self.specifier = specifier
@@ -158,6 +194,8 @@ class AccessNode(Node):
 
 
 class ExpressionNode(Node):
+    __slots__ = ('left', 'operator', 'right', 'lineno')
+
     def __init__(self, left, operator, right, lineno):
         self.left = left
         self.operator = operator
@@ -169,6 +207,8 @@ class ExpressionNode(Node):
 
 
 class TranspositionNode(Node):
+    __slots__ = ('value', 'lineno')
+
     def __init__(self, value, lineno):
         self.value = value
         self.lineno = lineno
@@ -178,6 +218,8 @@ class TranspositionNode(Node):
 
 
 class NegationNode(Node):
+    __slots__ = ('value', 'lineno')
+
     def __init__(self, value, lineno):
         self.value = value
         self.lineno = lineno
@@ -187,6 +229,8 @@ class NegationNode(Node):
 
 
 class FunctionNode(Node):
+    __slots__ = ('name', 'argument', 'lineno')
+
     def __init__(self, name, argument, lineno):
         self.name = name
         self.argument = argument
@@ -197,12 +241,16 @@ class FunctionNode(Node):
 
 
 class MatrixNode(Node):
+    __slots__ = ('rows', 'lineno')
+
     def __init__(self, rows, lineno):
         self.rows = rows
         self.lineno = lineno
 
 
 class SequenceNode(Node):
+    __slots__ = ('values', 'lineno')
+
     def __init__(self, values, lineno):
         self.values = values
         self.lineno = lineno
@@ -211,6 +259,44 @@ class SequenceNode(Node):
         self.values.append(value)
 
 
+class HoistedNode(Node):
+    __slots__ = ('value', 'name', 'lineno', 'depth', 'slot')
+
+    def __init__(self, value, name, lineno):
+        self.value = value
+        self.name = name
+        self.lineno = lineno
+
+    def __repr__(self):
+        return '{}( {} )'.format(self.name, self.value)
+
+
+class SharedNode(Node):
+    __slots__ = ('value', 'name', 'lineno', 'depth', 'slot')
+
+    def __init__(self, value, name, lineno):
+        self.value = value
+        self.name = name
+        self.lineno = lineno
+
+    def __repr__(self):
+        return '{} := {}'.format(self.name, self.value)
+
+
+class FusedNode(Node):
+    __slots__ = ('operands', 'kernel', 'lineno')
+
+    def __init__(self, operands, kernel, lineno):
+        self.operands = operands
+        self.kernel = kernel
+        self.lineno = lineno
+
+    def __repr__(self):
+        return '{}{}'.format(self.kernel, self.operands)
+
+
 class ErrorNode(Node):
+    __slots__ = ()
+
     def __init__(self):
         pass
@@ -0,0 +1,61 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import parse, optimize, execute
+
+# fills an n x n matrix one entry at a time; the modes differ only in what else refers
+# to the matrix at each write
+SCRIPT = '''
+A = [{0}];
+B = A;
+for i = 0:{1} {{
+    for j = 0:{1} {{
+        {2}
+        A[i, j] = i + j;
+    }}
+}}
+print A[{1}, {1}];
+'''
+
+MODES = [
+    ('in place', ''),
+    # another name holds the matrix, so every write copies the list of rows and one row
+    ('aliased', 'B = A;'),
+    # what a script had to do before: build a whole new matrix for every entry
+    ('rebuilt', 'A = A .+ A .- A;'),
+]
+
+
+def script(n, prelude):
+    row = ', '.join(['0'] * n)
+    return SCRIPT.format('; '.join([row] * n), n - 1, prelude)
+
+
+def measure(n, prelude):
+    ast = optimize(parse(script(n, prelude)))
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        execute(ast, 'tree')
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [25, 50, 100, 200]
+    print("{0:>6} {1:10} {2:>10} {3:>14}".format('n', 'mode', 'total', 'per write'))
+    for n in sizes:
+        for mode, prelude in MODES:
+            if mode == 'rebuilt' and n > 100:
+                continue
+            elapsed = measure(n, prelude)
+            print("{0:6} {1:10} {2:9.3f}s {3:11.2f} us".format(n, mode, elapsed, elapsed / (n * n) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
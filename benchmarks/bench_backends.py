@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from Interpreter import ExpressionDict, FunctionDict, MatrixBackends, use_backend, get_backend
+
+
+def measure(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    results = {}
+    for name in sorted(MatrixBackends):
+        try:
+            backend = use_backend(name)
+        except ImportError:
+            print("{0}: not available".format(name))
+            continue
+        a = FunctionDict['ones'](n)
+        b = FunctionDict['eye'](n)
+        cases = [
+            ('eye', lambda: FunctionDict['eye'](n)),
+            ('.+', lambda: ExpressionDict['.+'](a, b)),
+            ('.*', lambda: ExpressionDict['.*'](a, b)),
+            ('./', lambda: ExpressionDict['./'](b, a)),
+            ("'", lambda: get_backend().transpose(b)),
+            ('[i, j]', lambda: [backend.index(b, [i, i]) for i in range(n)]),
+        ]
+        for case, fn in cases:
+            results[name, case] = measure(fn, repeat)
+            print("{0}x{0} {1:8} {2:8} {3:10.6f}s".format(n, name, case, results[name, case]))
+    if ('python', 'eye') in results and ('numpy', 'eye') in results:
+        for case in ['eye', '.+', '.*', './', "'", '[i, j]']:
+            print("{0:8} numpy speedup {1:10.1f}x".format(case, results['python', case] / results['numpy', case]))
+    use_backend('python')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from Batch import BatchRunner
+
+SCRIPTS = ['examples/example9.m', 'examples/example12.m']
+
+
+def populate(directory, count):
+    for n in range(count):
+        source = SCRIPTS[n % len(SCRIPTS)]
+        shutil.copy(os.path.join(ROOT, source), os.path.join(directory, 'script{0:05}.m'.format(n)))
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory))
+
+
+def one_process_each(paths):
+    start = time.perf_counter()
+    for path in paths:
+        subprocess.run([sys.executable, 'main.py', '--no-cache', path], cwd=ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def batched(paths, jobs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner = BatchRunner(cache=False, jobs=jobs)
+        for result in runner.run(paths):
+            assert not result.status, result.output
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        paths = populate(directory, count)
+        elapsed = one_process_each(paths)
+        print("{0:24} {1:8.2f}s {2:8.1f} scripts/s".format('one process per script', elapsed, count / elapsed))
+        jobs = 1
+        while True:
+            elapsed = batched(paths, jobs)
+            print("{0:24} {1:8.2f}s {2:8.1f} scripts/s".format('batch, {0} workers'.format(jobs), elapsed,
+                                                               count / elapsed))
+            if jobs >= cores:
+                break
+            jobs = min(jobs * 2, cores)
+
+
+if __name__ == '__main__':
+    main()
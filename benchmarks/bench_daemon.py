@@ -0,0 +1,83 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from Daemon import Client
+
+SCRIPT = 'examples/example12.m'
+
+
+def start_daemon(path):
+    daemon = subprocess.Popen([sys.executable, 'main.py', '--serve', path], cwd=ROOT)
+    while not os.path.exists(path):
+        if daemon.poll() is not None:
+            raise RuntimeError("daemon exited with {0}".format(daemon.returncode))
+        time.sleep(0.01)
+    return daemon
+
+
+def load(path, source, clients, requests):
+    # every client keeps one connection open and sends its share of requests back to back
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        connection = Client(path)
+        mine = []
+        for _ in range(requests // clients):
+            start = time.perf_counter()
+            response = connection.run(source, SCRIPT)
+            mine.append(time.perf_counter() - start)
+            assert response['status'] == 0, response
+        connection.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def spawned(runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'main.py', '--no-cache', SCRIPT], cwd=ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with open(os.path.join(ROOT, SCRIPT)) as file:
+        source = file.read()
+    print("python main.py {0}: {1:8.2f} ms per run".format(SCRIPT, 1000 * spawned(10)))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'daemon.sock')
+        daemon = start_daemon(path)
+        try:
+            print("{0:>8} {1:>12} {2:>10} {3:>10} {4:>10}".format('clients', 'requests/s', 'median', 'p99', 'max'))
+            for clients in (1, 4, 16):
+                elapsed, latencies = load(path, source, clients, requests)
+                print("{0:8} {1:12.1f} {2:8.2f}ms {3:8.2f}ms {4:8.2f}ms".format(
+                    clients, len(latencies) / elapsed, 1000 * statistics.median(latencies),
+                    1000 * latencies[int(len(latencies) * 0.99)], 1000 * latencies[-1]))
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+
+if __name__ == '__main__':
+    main()
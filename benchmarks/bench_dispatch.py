@@ -0,0 +1,131 @@
+import inspect
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import ast
+from visit import on, when, method_table
+
+
+# the pre-table implementation of visit.py, kept here as the "before" measurement
+def legacy_on(param_name):
+    def f(fn):
+        return LegacyDispatcher(param_name, fn)
+
+    return f
+
+
+def legacy_when(param_type):
+    def f(fn):
+        frame = inspect.currentframe().f_back
+        dispatcher = frame.f_locals[fn.__name__]
+        if not isinstance(dispatcher, LegacyDispatcher):
+            dispatcher = dispatcher.dispatcher
+        dispatcher.add_target(param_type, fn)
+
+        def ff(*args, **kw):
+            return dispatcher(*args, **kw)
+
+        ff.dispatcher = dispatcher
+        return ff
+
+    return f
+
+
+class LegacyDispatcher(object):
+    def __init__(self, param_name, fn):
+        self.param_index = inspect.getfullargspec(fn).args.index(param_name)
+        self.param_name = param_name
+        self.targets = {}
+
+    def __call__(self, *args, **kw):
+        typ = args[self.param_index].__class__
+        d = self.targets.get(typ)
+        if d is not None:
+            return d(*args, **kw)
+        else:
+            issub = issubclass
+            t = self.targets
+            return [t[k](*args, **kw) for k in list(t) if issub(typ, k)]
+
+    def add_target(self, typ, target):
+        self.targets[typ] = target
+
+
+class LegacyVisitor(object):
+    @legacy_on('node')
+    def visit(self, node):
+        pass
+
+    @legacy_when(ast.ConstValueNode)
+    def visit(self, node):
+        return node.value
+
+    @legacy_when(ast.IdNode)
+    def visit(self, node):
+        return node.value
+
+
+class TableVisitor(object):
+    @on('node')
+    def visit(self, node):
+        pass
+
+    @when(ast.ConstValueNode)
+    def visit(self, node):
+        return node.value
+
+    @when(ast.IdNode)
+    def visit(self, node):
+        return node.value
+
+
+class LegacyNodeVisitor(object):
+    def visit(self, node):
+        method = 'visit_' + node.__class__.__name__
+        visitor = getattr(self, method, self.generic_visit)
+        return visitor(node)
+
+    def generic_visit(self, node):
+        pass
+
+    def visit_ConstValueNode(self, node):
+        return node.value
+
+    def visit_IdNode(self, node):
+        return node.value
+
+
+class TableNodeVisitor(LegacyNodeVisitor):
+    def __init__(self):
+        self.table = method_table(TableNodeVisitor, 'visit_', TableNodeVisitor.generic_visit)
+
+    def visit(self, node):
+        return self.table[node.__class__](self, node)
+
+
+def per_node(visitor, nodes, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for node in nodes:
+            node.accept(visitor)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return 1e9 * best / len(nodes)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    nodes = [ast.ConstValueNode(i, 1) if i % 2 else ast.IdNode('x', 1) for i in range(count)]
+    for title, before, after in [('Interpreter @on/@when', LegacyVisitor(), TableVisitor()),
+                                 ('TypeChecker NodeVisitor', LegacyNodeVisitor(), TableNodeVisitor())]:
+        old = per_node(before, nodes, 5)
+        new = per_node(after, nodes, 5)
+        print("{0:24} before {1:7.1f} ns/node  after {2:7.1f} ns/node  ({3:.2f}x)".format(title, old, new, old / new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import ENGINES, parse, execute
+
+SCRIPTS = ['benchmarks/loops.m', 'benchmarks/continue.m', 'examples/example12.m']
+
+
+def measure(ast, engine, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            execute(ast, engine)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for filename in SCRIPTS:
+        with open(os.path.join(ROOT, filename)) as file:
+            ast = parse(file.read())
+        baseline = None
+        for engine in ENGINES:
+            elapsed = measure(ast, engine, repeat)
+            if baseline is None:
+                baseline = elapsed
+            print("{0:24} {1:8} {2:10.4f}s {3:6.2f}x".format(filename, engine, elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
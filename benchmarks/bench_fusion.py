@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import parse
+from Session import Session
+from Output import Output
+
+# dense n x n operands: a literal the size of the matrix, parsed once and copied
+PRELUDE = '''
+A = [{0}];
+B = A .+ A;
+C = A .* A;
+E = A .+ B;
+'''
+
+STATEMENT = 'D = A .+ B .* C ./ E;'
+
+
+class Discard(object):
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+def prelude(n):
+    row = ', '.join(str(j + 1) for j in range(n))
+    return PRELUDE.format('; '.join(row for _ in range(n)))
+
+
+def measure(n, fuse):
+    session = Session('tree', optimize=fuse, output=Output(Discard()))
+    if not session.run(parse(prelude(n))):
+        raise RuntimeError("prelude did not type check")
+    statement = parse(STATEMENT)
+    tracemalloc.start()
+    start = time.perf_counter()
+    session.run(statement)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 300, 500]
+    print("{0:>6} {1:8} {2:>10} {3:>14}".format('n', 'mode', 'time', 'peak bytes'))
+    for n in sizes:
+        for mode, fuse in (('stepwise', False), ('fused', True)):
+            elapsed, peak = measure(n, fuse)
+            print("{0:6} {1:8} {2:9.4f}s {3:14}".format(n, mode, elapsed, peak))
+
+
+if __name__ == '__main__':
+    main()
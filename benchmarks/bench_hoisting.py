@@ -0,0 +1,40 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import ENGINES, parse, optimize, execute
+
+SCRIPT = 'benchmarks/invariant.m'
+
+
+def measure(text, engine, optimized, repeat):
+    best = None
+    for _ in range(repeat):
+        ast = parse(text)
+        if optimized:
+            ast = optimize(ast)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            execute(ast, engine)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with open(os.path.join(ROOT, SCRIPT)) as file:
+        text = file.read()
+    for engine in ENGINES:
+        plain = measure(text, engine, False, repeat)
+        hoisted = measure(text, engine, True, repeat)
+        print("{0:8} {1:10.4f}s {2:10.4f}s {3:6.2f}x".format(engine, plain, hoisted, plain / hoisted))
+
+
+if __name__ == '__main__':
+    main()
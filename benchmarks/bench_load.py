@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import parse
+from Interpreter import MatrixBackends
+
+# getting a dense n x n matrix into a script: as a literal the parser reads number by
+# number, or with load() from a file written by save(); a loaded matrix is only mapped,
+# so the entries are read when used, which 'first entry' and 'read whole' show; the
+# parser takes over a minute for n = 1000, so literals stop at LITERAL_LIMIT
+LITERAL_LIMIT = 300
+
+
+def matrix(n):
+    return [[i * n + j for j in range(n)] for i in range(n)]
+
+
+def literal(m):
+    return 'A = [{0}];'.format('; '.join(', '.join(str(value) for value in row) for row in m))
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def report(n, step, elapsed, peak):
+    print("{0:6} {1:12} {2:11.4f}s {3:14}".format(n, step, elapsed, peak))
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 300, 1000, 3000]
+    backend = MatrixBackends['python']()
+    print("{0:>6} {1:12} {2:>12} {3:>14}".format('n', 'step', 'time', 'peak bytes'))
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            m = matrix(n)
+            path = os.path.join(directory, 'm{0}.kmat'.format(n))
+            if n <= LITERAL_LIMIT:
+                source = literal(m)
+                _, elapsed, peak = measure(lambda: parse(source))
+                report(n, 'parse', elapsed, peak)
+            _, elapsed, peak = measure(lambda m=m: backend.save(path, m))
+            report(n, 'save', elapsed, peak)
+            del m
+            loaded, elapsed, peak = measure(lambda: backend.load(path))
+            report(n, 'load', elapsed, peak)
+            _, elapsed, peak = measure(lambda loaded=loaded: backend.index(loaded, [n - 1, n - 1]))
+            report(n, 'first entry', elapsed, peak)
+            _, elapsed, peak = measure(loaded.dense)
+            report(n, 'read whole', elapsed, peak)
+            del loaded
+
+
+if __name__ == '__main__':
+    main()
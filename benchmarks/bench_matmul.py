@@ -0,0 +1,48 @@
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from Interpreter import MatrixBackends
+from Matrices import dense_product
+
+# the pure python kernel is cubic in n with no vector units to lean on, so by default
+# it stops here; --all runs it for every size
+PYTHON_LIMIT = 500
+
+
+def operands(n):
+    rng = random.Random(n)
+    x = [[rng.random() for _ in range(n)] for _ in range(n)]
+    y = [[rng.random() for _ in range(n)] for _ in range(n)]
+    return x, y
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    everything = '--all' in sys.argv
+    sizes = [int(arg) for arg in sys.argv[1:] if arg != '--all'] or [10, 50, 100, 200, 500, 1000, 2000]
+    python = MatrixBackends['python']()
+    numpy = MatrixBackends['numpy']()
+    print("{0:>6} {1:>12} {2:>12} {3:>12}".format('n', 'unblocked', 'blocked', 'numpy'))
+    for n in sizes:
+        x, y = operands(n)
+        if n <= PYTHON_LIMIT or everything:
+            unblocked = '{0:11.4f}s'.format(timed(dense_product, x, y, n or 1))
+            blocked = '{0:11.4f}s'.format(timed(python.product, x, y))
+        else:
+            unblocked = blocked = '{0:>12}'.format('-')
+        arrays = numpy.matrix(x), numpy.matrix(y)
+        print("{0:6} {1} {2} {3:11.4f}s".format(n, unblocked, blocked, timed(numpy.product, *arrays)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import parse, optimize, execute
+
+# eye, zeros and ones combined element-wise, transposed and indexed, without printing them
+SCRIPT = '''
+a = eye({0});
+b = ones({0});
+c = (a .+ a .+ a) .+ b;
+d = c' .- zeros({0});
+e = d .* a;
+print c[1, 1], d[0, 1], e[2, 2], e[0, 1];
+'''
+
+
+def measure(n):
+    ast = optimize(parse(SCRIPT.format(n)))
+    output = io.StringIO()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        execute(ast, 'tree')
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, elapsed, output.getvalue().strip()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000, 100000]
+    print("{0:>8} {1:>14} {2:>10}  {3}".format('n', 'peak bytes', 'time', 'output'))
+    for n in sizes:
+        peak, elapsed, output = measure(n)
+        print("{0:8} {1:14} {2:9.4f}s  {3}".format(n, peak, elapsed, output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import contextlib
+import gc
+import io
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import parse
+from Arena import flatten
+from TypeChecker import TypeChecker
+from Session import optimize
+
+STATEMENTS = [
+    'a{0} = {0} * 2 + b - 1;',
+    'if (a{0} > 10) b = b + a{0}; else b = b - 1;',
+    'for i = 1 : 3 {{ c = c + i * {0}; }}',
+    'M{0} = [1, 2, 3; 4, 5, 6];',
+    "print a{0}, M{0}';",
+]
+
+
+def synthetic(count):
+    return '\n'.join(STATEMENTS[n % len(STATEMENTS)].format(n) for n in range(count))
+
+
+def traced():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def checked_peak(tree, baseline):
+    # the most held at once while type checking and optimizing, the tree or arena itself
+    # included; the synthetic script reads names it never assigned, which the checker reports
+    tracemalloc.reset_peak()
+    with contextlib.redirect_stdout(io.StringIO()):
+        TypeChecker().visit(tree)
+    optimize(tree)
+    return tracemalloc.get_traced_memory()[1] - baseline
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text = synthetic(count)
+    parse('a = 1;')
+    tracemalloc.start()
+    baseline = traced()
+    tree = parse(text)
+    tree_size = traced() - baseline
+    arena = flatten(tree)
+    del tree
+    # payload values such as names and constants are counted in both layouts
+    arena_size = traced() - baseline
+    tracemalloc.stop()
+    print("{0} statements, {1} arena nodes".format(count, len(arena)))
+    print("{0:8} {1:12} {2:10}".format('layout', 'bytes', 'per stmt'))
+    print("{0:8} {1:12} {2:10.1f}".format('tree', tree_size, tree_size / count))
+    print("{0:8} {1:12} {2:10.1f}".format('arena', arena_size, arena_size / count))
+    # the same again through the type checker and the optimizer, which --arena runs on
+    # the arena once the parsed tree is gone
+    tracemalloc.start()
+    baseline = traced()
+    tree_peak = checked_peak(parse(text), baseline)
+    baseline = traced()
+    arena_peak = checked_peak(flatten(parse(text)).tree(), baseline)
+    tracemalloc.stop()
+    print("{0:8} {1:12} {2:10}".format('layout', 'peak', 'per stmt'))
+    print("{0:8} {1:12} {2:10.1f}".format('tree', tree_peak, tree_peak / count))
+    print("{0:8} {1:12} {2:10.1f}".format('arena', arena_peak, arena_peak / count))
+
+
+if __name__ == '__main__':
+    main()
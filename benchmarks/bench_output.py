@@ -0,0 +1,42 @@
+import contextlib
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import ENGINES, parse, optimize, execute
+from Output import Output
+
+SCRIPT = 'benchmarks/prints.m'
+
+
+def measure(text, engine, threaded, line_buffered, repeat):
+    # a real file, so the text goes through the same TextIOWrapper stdout would use;
+    # a line buffered one flushes on every newline, like stdout on a terminal
+    best = None
+    for _ in range(repeat):
+        ast = optimize(parse(text))
+        with open(os.devnull, 'w', buffering=1 if line_buffered else -1) as sink, contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            execute(ast, engine, Output(threaded=threaded))
+            sink.flush()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with open(os.path.join(ROOT, SCRIPT)) as file:
+        text = file.read()
+    print("{0:8} {1:>10} {2:>10} {3:>10} {4:>10}".format('engine', 'file', 'thread', 'tty-like', 'thread'))
+    for engine in ENGINES:
+        times = [measure(text, engine, threaded, line_buffered, repeat)
+                 for line_buffered in (False, True) for threaded in (False, True)]
+        print("{0:8} {1:9.4f}s {2:9.4f}s {3:9.4f}s {4:9.4f}s".format(engine, *times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import ENGINES, parse, check_semantic, optimize, execute
+from Repl import Repl
+
+LINES = [
+    'a{0} = {1} * 2 + b - 1;',
+    'if (a{0} > 10) b = b + 1;',
+    'else b = b - 1;',
+    'for i = 1 : 3 {{',
+    '    c = c + i;',
+    '}}',
+    'print a{0}, b;',
+]
+
+
+def session(groups):
+    lines = ['b = 0;', 'c = 0;'] + ['a{0} = 0;'.format(n) for n in range(10)]
+    for n in range(groups):
+        lines.extend(line.format(n % 10, n) for line in LINES)
+    return lines
+
+
+def latencies(lines, engine):
+    repl = Repl(engine)
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for line in lines:
+            start = time.perf_counter()
+            repl.feed(line)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def replay(lines, engine):
+    # what typing one more line used to cost: the whole session run again from the top
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parse('\n'.join(lines) + '\n')
+        check_semantic(ast)
+        execute(optimize(ast), engine)
+    return time.perf_counter() - start
+
+
+def main():
+    groups = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    lines = session(groups)
+    print("{0:8} {1:>10} {2:>10} {3:>10} {4:>12}".format('engine', 'median', 'p99', 'max', 'replay'))
+    for engine in ENGINES:
+        times = sorted(latencies(lines, engine))
+        p99 = times[int(len(times) * 0.99)]
+        print("{0:8} {1:8.3f}ms {2:8.3f}ms {3:8.3f}ms {4:10.1f}ms".format(
+            engine, 1000 * statistics.median(times), 1000 * p99, 1000 * times[-1], 1000 * replay(lines, engine)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import parse
+from Session import Session, optimize
+from Output import Output
+from Profiler import Profile, Sampler
+
+# a hot loop nest run plainly, under the sampler at a few intervals and under the
+# deterministic profiler; the best of several runs of each, relative to the plain one.
+# Wall time on a busy machine varies by more than sampling costs, so 'handler' is the
+# share of the run spent in the signal handler
+SCRIPT = '''
+s = 0;
+for i = 0:{0} {{
+    for j = 0:{0} {{
+        s += i * j - j;
+    }}
+}}
+'''
+
+RUNS = 5
+
+
+class Discard(object):
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+def run(program, profile=None, sampler=None):
+    session = Session('tree', output=Output(Discard()), profile=profile)
+    if sampler is not None:
+        sampler.start()
+    start = time.perf_counter()
+    try:
+        session.execute(program)
+    finally:
+        elapsed = time.perf_counter() - start
+        if sampler is not None:
+            sampler.stop()
+    return elapsed
+
+
+def best(program, make_profile=lambda: None, make_sampler=lambda: None):
+    times = []
+    samples = 0
+    spent = 0.0
+    for _ in range(RUNS):
+        sampler = make_sampler()
+        times.append(run(program, make_profile(), sampler))
+        if sampler is not None:
+            samples += sampler.samples
+            spent += sampler.spent
+    return min(times), samples // RUNS, spent / sum(times)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    program = optimize(parse(SCRIPT.format(n - 1)))
+    # the first run pays for what stays cached afterwards
+    run(program)
+    plain = best(program)[0]
+    print("{0:22} {1:9.4f}s".format('plain', plain))
+    for interval in (0.01, 0.005, 0.001):
+        elapsed, samples, spent = best(program, make_sampler=lambda: Sampler(interval))
+        print("{0:22} {1:9.4f}s {2:+7.1f}% {3:6} samples, handler {4:.2f}%".format(
+            'sampled every {0:g}ms'.format(interval * 1000), elapsed, 100 * (elapsed / plain - 1), samples, 100 * spent))
+    elapsed = best(program, make_profile=Profile)[0]
+    print("{0:22} {1:9.4f}s {2:+7.1f}%".format('--profile', elapsed, 100 * (elapsed / plain - 1)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from Interpreter import AssignmentDict, MatrixBackends, store_item
+from Matrices import WHOLE
+
+# A[n/4 : 3n/4, :] of a dense n x n matrix: taking the slice, reading it whole (what
+# copying it out used to cost) and the first write to it, which makes its own copy
+
+
+def matrix(n):
+    return [[i * n + j for j in range(n)] for i in range(n)]
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 500, 1000, 2000]
+    backend = MatrixBackends['python']()
+    print("{0:>6} {1:12} {2:>12} {3:>14}".format('n', 'step', 'time', 'peak bytes'))
+    for n in sizes:
+        a = matrix(n)
+        rows = range(n // 4, 3 * n // 4)
+        view, elapsed, peak = measure(lambda: backend.index(a, [rows, WHOLE]))
+        print("{0:6} {1:12} {2:11.6f}s {3:14}".format(n, 'slice', elapsed, peak))
+        _, elapsed, peak = measure(view.dense)
+        print("{0:6} {1:12} {2:11.6f}s {3:14}".format(n, 'read whole', elapsed, peak))
+        frame = [view]
+        del view
+        _, elapsed, peak = measure(lambda: store_item(frame, 0, [0, 0], AssignmentDict['='], -1))
+        print("{0:6} {1:12} {2:11.6f}s {3:14}".format(n, 'first write', elapsed, peak))
+
+
+if __name__ == '__main__':
+    main()
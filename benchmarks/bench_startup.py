@@ -0,0 +1,59 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+
+def wall_time(command, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        times.append(time.perf_counter() - start)
+        # a run that failed early would pass for a fast start
+        if result.returncode:
+            sys.exit("{0} exited with {1}:\n{2}".format(' '.join(command), result.returncode,
+                                                        result.stderr.decode(errors='replace')))
+    return statistics.median(times)
+
+
+def in_process(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def rebuilt_parser():
+    from ply import lex, yacc
+    import mparser
+    m_parser = mparser.Parser.__new__(mparser.Parser)
+    m_parser.scanner = mparser.Scanner.__new__(mparser.Scanner)
+    m_parser.scanner.lexer = lex.lex(object=m_parser.scanner)
+    m_parser.debug = False
+    m_parser.error = False
+    yacc.yacc(module=m_parser, tabmodule='parsetab_rebuilt', debug=False, write_tables=False,
+              errorlog=yacc.NullLogger())
+
+
+def main():
+    script = sys.argv[1] if len(sys.argv) > 1 else 'examples/example12.m'
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    from mparser import make_parser
+    print("parser setup, prebuilt tables: {0:8.2f} ms".format(1000 * in_process(make_parser, runs)))
+    print("parser setup, rebuilt tables:  {0:8.2f} ms".format(1000 * in_process(rebuilt_parser, runs)))
+    floor = wall_time([sys.executable, '-c', 'pass'], runs)
+    total = wall_time([sys.executable, 'main.py', script], runs)
+    print("python -c pass:                {0:8.2f} ms".format(1000 * floor))
+    print("main.py {0}: {1:8.2f} ms ({2:.2f} ms above interpreter start)".format(script, 1000 * total,
+                                                                           1000 * (total - floor)))
+
+
+if __name__ == '__main__':
+    main()
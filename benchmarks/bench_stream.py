@@ -0,0 +1,79 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from main import parse, check_semantic, optimize, execute, stream
+
+STATEMENTS = [
+    'a{0} = {1} * 2 + b - 1;',
+    'if (a{0} > 10) b = b + 1; else b = b - 1;',
+    'for i = 1 : 3 {{ c = c + i; }}',
+    'print a{0}, b;',
+]
+
+
+def synthetic(path, count):
+    with open(path, 'w') as file:
+        file.write('b = 0;\nc = 0;\n')
+        for n in range(10):
+            file.write('a{0} = 0;\n'.format(n))
+        for n in range(count):
+            file.write(STATEMENTS[n % len(STATEMENTS)].format(n % 10, n) + '\n')
+
+
+class FirstWrite(io.TextIOBase):
+    # discards the output, so it does not count towards the peak, but notes when it started
+    def __init__(self):
+        super(FirstWrite, self).__init__()
+        self.first = None
+
+    def write(self, text):
+        if self.first is None:
+            self.first = time.perf_counter()
+        return len(text)
+
+
+def whole(path):
+    with open(path) as file:
+        ast = parse(file.read())
+    check_semantic(ast)
+    execute(optimize(ast), 'tree')
+
+
+def streamed(path):
+    stream(path, 'tree', True)
+
+
+def measure(run, path):
+    output = FirstWrite()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        run(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, output.first - start, elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2000, 8000, 32000]
+    print("{0:>8} {1:8} {2:>12} {3:>12} {4:>10}".format('stmts', 'mode', 'peak bytes', 'first out', 'total'))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'synthetic.m')
+        for count in sizes:
+            synthetic(path, count)
+            for mode, run in (('whole', whole), ('stream', streamed)):
+                peak, first, elapsed = measure(run, path)
+                print("{0:8} {1:8} {2:12} {3:11.4f}s {4:9.3f}s".format(count, mode, peak, first, elapsed))
+
+
+if __name__ == '__main__':
+    main()
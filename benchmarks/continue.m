@@ -0,0 +1,20 @@
+# continue-heavy workload: most iterations leave the loop body early
+
+hits = 0;
+for i = 1 : 400 {
+    for j = 1 : 400 {
+        if (j > 20)
+            continue;
+        hits += 1;
+    }
+}
+
+k = 0;
+while (k < 50000) {
+    k += 1;
+    if (k < 49000) {
+        continue;
+    }
+    hits += 1;
+}
+print "done";
@@ -0,0 +1,25 @@
+# example3.m scaled up, with loop bodies that rebuild values that never change
+
+N = 60;
+M = 80;
+K = 12;
+for i = 1:N {
+    for j = i:M {
+        E = eye(K);
+        T = E' .+ ones(K);
+        R = [N, M, K; K, M, N];
+        s = i * j + N / 4 - M * 2;
+    }
+}
+
+k = 2000;
+while (k > 0) {
+    if (k < N / 4)
+        x = 1;
+    else if (k < M * K)
+        x = 2;
+    else
+        x = 3;
+    k = k - 1;
+}
+print "done";
@@ -0,0 +1,19 @@
+# loop-heavy workload used by the engine benchmarks
+
+s = 0;
+for i = 1 : 300 {
+    for j = 1 : 300 {
+        s = s + i * j - 1;
+    }
+}
+
+k = 0;
+n = 0;
+while (k < 50000) {
+    k += 1;
+    if (k > 25000)
+        n = n + 2;
+    else
+        n = n - 1;
+}
+print "done";
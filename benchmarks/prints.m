@@ -0,0 +1,9 @@
+m = ones(8);
+v = [1, 2, 3, 4, 5, 6, 7, 8];
+for i = 1 : 200 {
+  for j = 1 : 100 {
+    print i, j, i * j;
+  }
+  print v;
+  print m;
+}
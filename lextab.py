@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('BREAK', 'CONTINUE', 'DIVIDE_ASSIGN', 'ELSE', 'EQ', 'EYE', 'FLOAT', 'FOR', 'GE', 'ID', 'IF', 'INT', 'LE', 'LOAD', 'MINUS_ASSIGN', 'M_DIVIDE', 'M_MINUS', 'M_PLUS', 'M_TIMES', 'NEQ', 'ONES', 'PLUS_ASSIGN', 'PRINT', 'RETURN', 'SAVE', 'STRING', 'TIMES_ASSIGN', 'WHILE', 'ZEROS'))
+_lexreflags   = 64
+_lexliterals  = "+-*/()[]{}:,;'><="
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_ignore_COMMENT>\\#.*)|(?P<t_FLOAT>(\\d+\\.\\d*|\\.\\d+)(e-?\\d+)?)|(?P<t_INT>0|([1-9]\\d*))|(?P<t_STRING>"[^"]*")|(?P<t_ID>[a-zA-Z_]\\w*)|(?P<t_newline>\\n+)|(?P<t_M_PLUS>\\.\\+)|(?P<t_M_TIMES>\\.\\*)|(?P<t_M_DIVIDE>\\./)|(?P<t_M_MINUS>\\.-)|(?P<t_PLUS_ASSIGN>\\+=)|(?P<t_TIMES_ASSIGN>\\*=)|(?P<t_DIVIDE_ASSIGN>/=)|(?P<t_EQ>==)|(?P<t_GE>>=)|(?P<t_LE><=)|(?P<t_MINUS_ASSIGN>-=)|(?P<t_NEQ>!=)', [None, ('t_ignore_COMMENT', 'ignore_COMMENT'), ('t_FLOAT', 'FLOAT'), None, None, ('t_INT', 'INT'), None, ('t_STRING', 'STRING'), ('t_ID', 'ID'), ('t_newline', 'newline'), (None, 'M_PLUS'), (None, 'M_TIMES'), (None, 'M_DIVIDE'), (None, 'M_MINUS'), (None, 'PLUS_ASSIGN'), (None, 'TIMES_ASSIGN'), (None, 'DIVIDE_ASSIGN'), (None, 'EQ'), (None, 'GE'), (None, 'LE'), (None, 'MINUS_ASSIGN'), (None, 'NEQ')])]}
+_lexstateignore = {'INITIAL': ' \t\r'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -1,16 +1,53 @@
+import argparse
+import os
 import sys
 
-from ply import yacc
+# everything else is imported where it is used: a script handed to a daemon needs none
+# of the engines, and a script run here only the parts of them it uses
 
-from TreePrinter import TreePrinter
-from TypeChecker import TypeChecker
-from Interpreter import Interpreter
-from mparser import Parser
+ENGINES = ('tree', 'vm', 'closure')
 
+# the names of Interpreter.MatrixBackends, which is too much to import for parsing arguments
+BACKENDS = ('numpy', 'python')
 
-def read_file():
+
+def parse_args():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('filename', nargs='?', default="examples/example12.m")
+    arg_parser.add_argument('--engine', choices=ENGINES, default='tree')
+    arg_parser.add_argument('--backend', choices=BACKENDS, default='python')
+    arg_parser.add_argument('--no-cache', dest='cache', action='store_false')
+    arg_parser.add_argument('--cache-stats', action='store_true')
+    # the tree in flat arrays from parsing on: checked, optimized and run there
+    arg_parser.add_argument('--arena', action='store_true')
+    arg_parser.add_argument('--no-optimize', dest='optimize', action='store_false')
+    arg_parser.add_argument('--print-optimized', action='store_true')
+    arg_parser.add_argument('--optimizer-stats', action='store_true')
+    arg_parser.add_argument('--stream', action='store_true')
+    arg_parser.add_argument('--output-thread', action='store_true')
+    arg_parser.add_argument('--repl', action='store_true')
+    arg_parser.add_argument('--batch', action='store_true')
+    arg_parser.add_argument('--jobs', type=int)
+    arg_parser.add_argument('--output-dir')
+    arg_parser.add_argument('--serve', metavar='SOCKET')
+    arg_parser.add_argument('--connect', metavar='SOCKET')
+    # writes PREFIX.profile and PREFIX.folded, PREFIX being the script's name by default
+    arg_parser.add_argument('--profile', nargs='?', const='', metavar='PREFIX')
+    # writes PREFIX.samples and PREFIX.folded from a sample every MS of cpu time
+    arg_parser.add_argument('--sample', nargs='?', const='', metavar='PREFIX')
+    arg_parser.add_argument('--sample-interval', type=float, default=5.0, metavar='MS')
+    args = arg_parser.parse_args()
+    if args.profile is not None and args.sample is not None:
+        arg_parser.error("--profile and --sample cannot be used together")
+    if (args.profile is not None or args.sample is not None) and args.engine != 'tree':
+        arg_parser.error("--profile and --sample need the tree engine")
+    if args.sample_interval <= 0:
+        arg_parser.error("--sample-interval has to be positive")
+    return args
+
+
+def read_file(filename):
     try:
-        filename = sys.argv[1] if len(sys.argv) > 1 else "examples/example12.m"
         file = open(filename, "r")
         text = file.read()
         file.close()
@@ -21,32 +58,210 @@ def read_file():
 
 
 def parse(text):
-    m_parser = Parser(debug=False)
-    parser = yacc.yacc(module=m_parser)
+    from mparser import make_parser
+    m_parser, parser = make_parser()
     ast = parser.parse(text, lexer=m_parser.scanner)
+    # ply keeps the last parser, whose stack would keep the tree alive past --arena
+    del parser.symstack[:]
     if m_parser.error:
         sys.exit(1)
     return ast
 
 
+def load_ast(filename, text, cache=None):
+    ast = cache.load(filename, text) if cache is not None else None
+    if ast is None:
+        ast = parse(text)
+        if cache is not None:
+            cache.store(filename, text, ast)
+    return ast
+
+
 def print_tree(ast):
+    from TreePrinter import TreePrinter
     TreePrinter()
     ast.printTree()
 
 
 def check_semantic(ast):
+    from TypeChecker import TypeChecker
     type_checker = TypeChecker()
     type_checker.visit(ast)
     if type_checker.errors:
         sys.exit(1)
 
 
+def report_stats(line):
+    print(line, file=sys.stderr)
+
+
+def select_backend(name):
+    from Interpreter import use_backend
+    try:
+        use_backend(name)
+    except ImportError:
+        print("Matrix backend {0} is not available, using python".format(name), file=sys.stderr)
+        name = 'python'
+        use_backend(name)
+    return name
+
+
+def execute(ast, engine, output=None, profile=None):
+    from Session import Session
+    Session(engine, output=output, profile=profile).execute(ast)
+
+
+def profile_run(ast, output, prefix, filename, text):
+    # the profile is written even when the script fails half way
+    from Profiler import Profile
+    profile = Profile()
+    try:
+        execute(ast, 'tree', output, profile)
+    finally:
+        prefix = prefix or filename
+        profile.write(prefix, text)
+        print("Profile written to {0}.profile and {0}.folded".format(prefix), file=sys.stderr)
+
+
+def sample_run(ast, output, prefix, filename, text, interval):
+    from Profiler import Sampler
+    sampler = Sampler(interval / 1000.0)
+    sampler.start()
+    try:
+        execute(ast, 'tree', output)
+    finally:
+        sampler.stop()
+        prefix = prefix or filename
+        sampler.write(prefix, text)
+        print("Samples written to {0}.samples and {0}.folded".format(prefix), file=sys.stderr)
+
+
+def stream(filename, engine, optimize, output=None):
+    from mparser import make_parser
+    from StatementStream import StatementStream, parse_tokens
+    from Session import Session
+    m_parser, parser = make_parser()
+    session = Session(engine, optimize, output)
+    try:
+        file = open(filename, "r")
+    except IOError:
+        print("Cannot open {0} file".format(filename))
+        sys.exit(0)
+    with file:
+        for tokens in StatementStream(file, m_parser.scanner):
+            program = parse_tokens(m_parser, parser, tokens)
+            if m_parser.error:
+                sys.exit(1)
+            if not session.run(program):
+                sys.exit(1)
+
+
+def batch(target, args, backend):
+    # exits with 1 when any of the scripts would have
+    import time
+    from Batch import BatchRunner, collect
+    try:
+        paths = collect(target)
+    except IOError:
+        print("Cannot open {0} file".format(target))
+        sys.exit(0)
+    root = target if os.path.isdir(target) else os.path.dirname(os.path.abspath(target))
+    runner = BatchRunner(args.engine, args.optimize, args.cache, args.jobs, backend)
+    failed = 0
+    busy = 0.0
+    start = time.perf_counter()
+    for result in runner.run(paths):
+        busy += result.elapsed
+        if result.status:
+            failed += 1
+        if args.output_dir is not None:
+            name = os.path.relpath(result.path, root)
+            if name.startswith(os.pardir):
+                name = os.path.abspath(result.path).lstrip(os.sep)
+            path = os.path.join(args.output_dir, name + '.out')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                file.write(result.output)
+            print("{0:4} {1:8.3f}s {2}".format('ok' if not result.status else 'FAIL', result.elapsed, result.path))
+        else:
+            print("==> {0} (exit {1}, {2:.3f}s) <==".format(result.path, result.status, result.elapsed))
+            sys.stdout.write(result.output)
+    elapsed = time.perf_counter() - start
+    print("{0} scripts, {1} failed; {2:.2f}s of work in {3:.2f}s on {4} workers".format(
+        len(paths), failed, busy, elapsed, runner.jobs), file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+def connect(socket_path, filename):
+    # runs the script in a daemon started with --serve and exits the way it would have
+    from Daemon import Client
+    text = read_file(filename)
+    client = Client(socket_path)
+    response = client.run(text, filename)
+    client.close()
+    if 'error' in response:
+        print(response['error'], file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.write(response['output'])
+    if response['status']:
+        sys.exit(response['status'])
+
+
 def main():
-    text = read_file()
-    ast = parse(text)
-    # print_tree(ast)
+    args = parse_args()
+    if args.connect is not None:
+        connect(args.connect, args.filename)
+        return
+    backend = select_backend(args.backend)
+    output = None
+    if args.output_thread:
+        from Output import Output
+        output = Output(threaded=True)
+    if args.serve is not None:
+        from Daemon import Daemon
+        try:
+            daemon = Daemon(args.serve, args.engine, args.optimize, args.cache, backend)
+        except FileExistsError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        daemon.serve()
+        return
+    if args.batch:
+        batch(args.filename, args, backend)
+        return
+    if args.repl:
+        from Repl import Repl
+        Repl(args.engine, args.optimize, output).loop()
+        return
+    if args.stream:
+        stream(args.filename, args.engine, args.optimize, output)
+        return
+    text = read_file(args.filename)
+    cache = None
+    if args.cache:
+        from ASTCache import ASTCache
+        cache = ASTCache(keep_stats=args.cache_stats)
+    ast = load_ast(args.filename, text, cache)
+    if cache is not None and args.cache_stats:
+        print(cache.report(args.filename), file=sys.stderr)
+    if args.arena:
+        from Arena import flatten
+        ast = flatten(ast).tree()
     check_semantic(ast)
-    ast.accept(Interpreter())
+    if args.optimize:
+        from Session import optimize
+        ast = optimize(ast, report_stats if args.optimizer_stats else None)
+    if args.print_optimized:
+        print_tree(ast)
+        return
+    if args.profile is not None:
+        profile_run(ast, output, args.profile, args.filename, text)
+        return
+    if args.sample is not None:
+        sample_run(ast, output, args.sample, args.filename, text, args.sample_interval)
+        return
+    execute(ast, args.engine, output)
 
 
 if __name__ == '__main__':
@@ -1,5 +1,10 @@
+import os
+
+from ply import yacc
+
 import ast
-from scanner import Scanner
+from Matrices import WHOLE
+from scanner import Scanner, TABLES_DIR
 
 
 class Parser:
@@ -83,11 +88,35 @@ class Parser:
             print('p_left_assignment: {}'.format(p[0]))
 
     def p_access(self, p):
-        """ACCESS : CONST_ID '[' SEQUENCE ']'"""
+        """ACCESS : CONST_ID '[' INDICES ']'"""
         p[0] = ast.AccessNode(p[1], p[3], p[1].lineno)
         if self.debug:
             print('p_access: {}'.format(p[0]))
 
+    def p_indices(self, p):
+        """INDICES : INDICES ',' INDEX
+                   | INDEX"""
+        if len(p) == 2:
+            p[0] = ast.SequenceNode([p[1]], p[1].lineno)
+        elif len(p) == 4:
+            p[1].append(p[3])
+            p[0] = p[1]
+        if self.debug:
+            print('p_indices: {}'.format(p[0]))
+
+    def p_index(self, p):
+        """INDEX : EXPRESSION
+                 | RANGE"""
+        p[0] = p[1]
+        if self.debug:
+            print('p_index: {}'.format(p[0]))
+
+    def p_index_whole(self, p):
+        """INDEX : ':'"""
+        p[0] = ast.ConstValueNode(WHOLE, p.lineno(1))
+        if self.debug:
+            print('p_index_whole: {}'.format(p[0]))
+
     def p_sequence(self, p):
         """SEQUENCE : SEQUENCE ',' EXPRESSION
                     | EXPRESSION"""
@@ -160,7 +189,8 @@ class Parser:
     def p_expression_function(self, p):
         """EXPRESSION : EYE '(' EXPRESSION ')'
                       | ZEROS '(' EXPRESSION ')'
-                      | ONES '(' EXPRESSION ')'"""
+                      | ONES '(' EXPRESSION ')'
+                      | LOAD '(' EXPRESSION ')'"""
         p[0] = ast.FunctionNode(p[1], p[3], p.lineno(1))
         if self.debug:
             print('p_expression: {}'.format(p[0]))
@@ -193,11 +223,15 @@ class Parser:
         """KEYWORD : PRINT SEQUENCE
                    | BREAK
                    | CONTINUE
-                   | RETURN EXPRESSION"""
+                   | RETURN EXPRESSION
+                   | SAVE '(' EXPRESSION ',' EXPRESSION ')'"""
         if p[1] == 'print':
             p[0] = ast.PrintNode(p[2], p.lineno(1))
         elif p[1] == 'return':
             p[0] = ast.ReturnNode(p[2], p.lineno(1))
+        elif p[1] == 'save':
+            arguments = ast.SequenceNode([p[3], p[5]], p.lineno(1))
+            p[0] = ast.FunctionNode(p[1], arguments, p.lineno(1))
         elif p[1] == 'break':
             p[0] = ast.BreakNode(p.lineno(1))
         elif p[1] == 'continue':
@@ -253,3 +287,22 @@ class Parser:
             p[0] = ast.RangeNode(p[1], p[3], p[1].lineno, jump=p[5])
         if self.debug:
             print('p_range: {}'.format(p[0]))
+
+
+def make_parser(debug=False, write_tables=False):
+    m_parser = Parser(debug=debug)
+    parser = yacc.yacc(module=m_parser, tabmodule='parsetab', outputdir=TABLES_DIR,
+                       debug=False, write_tables=write_tables)
+    return m_parser, parser
+
+
+def build_tables():
+    for name in ('parsetab.py', 'lextab.py'):
+        path = os.path.join(TABLES_DIR, name)
+        if os.path.exists(path):
+            os.remove(path)
+    make_parser(write_tables=True)
+
+
+if __name__ == '__main__':
+    build_tables()
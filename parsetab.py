@@ -0,0 +1,100 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'nonassocIFXnonassocELSEnonassocPLUS_ASSIGNMINUS_ASSIGNTIMES_ASSIGNDIVIDE_ASSIGNright=nonassoc><EQNEQGELEleft+-M_PLUSM_MINUSleft*/M_TIMESM_DIVIDEleft\'rightUNARYBREAK CONTINUE DIVIDE_ASSIGN ELSE EQ EYE FLOAT FOR GE ID IF INT LE LOAD MINUS_ASSIGN M_DIVIDE M_MINUS M_PLUS M_TIMES NEQ ONES PLUS_ASSIGN PRINT RETURN SAVE STRING TIMES_ASSIGN WHILE ZEROSstart : INSTRUCTIONSINSTRUCTIONS : INSTRUCTIONS INSTRUCTION\n                        | INSTRUCTIONINSTRUCTION : STATEMENT \';\'\n                       | BLOCK_STATEMENT\n                       | IF_STATEMENT\n                       | WHILE_STATEMENT\n                       | FOR_STATEMENTSTATEMENT : ASSIGNMENT\n                     | KEYWORDASSIGNMENT : LEFT_ASSIGNMENT \'=\' EXPRESSION\n                      | LEFT_ASSIGNMENT PLUS_ASSIGN EXPRESSION\n                      | LEFT_ASSIGNMENT MINUS_ASSIGN EXPRESSION\n                      | LEFT_ASSIGNMENT TIMES_ASSIGN EXPRESSION\n                      | LEFT_ASSIGNMENT DIVIDE_ASSIGN EXPRESSIONLEFT_ASSIGNMENT : CONST_ID\n                           | ACCESSACCESS : CONST_ID \'[\' INDICES \']\'INDICES : INDICES \',\' INDEX\n                   | INDEXINDEX : EXPRESSION\n                 | RANGEINDEX : \':\'SEQUENCE : SEQUENCE \',\' EXPRESSION\n                    | EXPRESSIONVALUE : CONST_VALUE\n                 | MATRIX\n                 | ACCESS\n                 | CONST_IDCONST_VALUE : FLOAT\n                       | INT\n                       | STRINGCONST_ID : IDMATRIX : \'[\' ROWS \']\'ROWS : ROWS \';\' SEQUENCE\n                | SEQUENCEEXPRESSION : EXPRESSION M_PLUS EXPRESSION\n                      | EXPRESSION M_MINUS EXPRESSION\n                      | EXPRESSION M_TIMES EXPRESSION\n                      | EXPRESSION M_DIVIDE EXPRESSIONEXPRESSION : EXPRESSION \'+\' EXPRESSION\n                      | EXPRESSION \'-\' EXPRESSION\n                      | EXPRESSION \'*\' EXPRESSION\n                      | EXPRESSION \'/\' EXPRESSIONEXPRESSION : EYE \'(\' EXPRESSION \')\'\n                      | ZEROS \'(\' EXPRESSION \')\'\n                      | ONES \'(\' EXPRESSION \')\'\n                      | LOAD \'(\' EXPRESSION \')\'EXPRESSION : EXPRESSION "\'" EXPRESSION : VALUEEXPRESSION : \'(\' EXPRESSION \')\'EXPRESSION : \'-\' EXPRESSION %prec UNARYKEYWORD : PRINT SEQUENCE\n                   | BREAK\n                   | CONTINUE\n                   | RETURN EXPRESSION\n                   | SAVE \'(\' EXPRESSION \',\' EXPRESSION \')\'CONDITION : EXPRESSION \'<\' EXPRESSION\n                     | EXPRESSION \'>\' EXPRESSION\n                     | EXPRESSION EQ EXPRESSION\n                     | EXPRESSION NEQ EXPRESSION\n                     | EXPRESSION GE EXPRESSION\n                     | EXPRESSION LE EXPRESSIONBLOCK_STATEMENT : \'{\' INSTRUCTIONS \'}\'IF_STATEMENT : IF \'(\' CONDITION \')\' INSTRUCTION %prec IFX\n                        | IF \'(\' CONDITION \')\' INSTRUCTION ELSE INSTRUCTIONWHILE_STATEMENT : WHILE \'(\' CONDITION \')\' INSTRUCTIONFOR_STATEMENT : FOR CONST_ID \'=\' RANGE INSTRUCTIONRANGE : EXPRESSION \':\' EXPRESSION\n                 | EXPRESSION \':\' EXPRESSION \':\' EXPRESSION'
+    
+_lr_action_items = {'{':([0,2,3,5,6,7,8,11,23,24,25,26,44,45,46,47,48,49,50,51,55,79,80,89,96,97,99,103,104,105,106,107,108,109,110,112,116,119,126,127,129,130,131,132,133,136,139,140,],[11,11,-3,-5,-6,-7,-8,11,-33,-2,-4,11,-50,-26,-27,-28,-29,-30,-31,-32,-64,-49,-52,11,11,11,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-65,-67,-68,-69,-45,-46,-47,-48,11,-66,-70,]),'IF':([0,2,3,5,6,7,8,11,23,24,25,26,44,45,46,47,48,49,50,51,55,79,80,89,96,97,99,103,104,105,106,107,108,109,110,112,116,119,126,127,129,130,131,132,133,136,139,140,],[12,12,-3,-5,-6,-7,-8,12,-33,-2,-4,12,-50,-26,-27,-28,-29,-30,-31,-32,-64,-49,-52,12,12,12,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-65,-67,-68,-69,-45,-46,-47,-48,12,-66,-70,]),'WHILE':([0,2,3,5,6,7,8,11,23,24,25,26,44,45,46,47,48,49,50,51,55,79,80,89,96,97,99,103,104,105,106,107,108,109,110,112,116,119,126,127,129,130,131,132,133,136,139,140,],[13,13,-3,-5,-6,-7,-8,13,-33,-2,-4,13,-50,-26,-27,-28,-29,-30,-31,-32,-64,-49,-52,13,13,13,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-65,-67,-68,-69,-45,-46,-47,-48,13,-66,-70,]),'FOR':([0,2,3,5,6,7,8,11,23,24,25,26,44,45,46,47,48,49,50,51,55,79,80,89,96,97,99,103,104,105,106,107,108,109,110,112,116,119,126,127,129,130,131,132,133,136,139,140,],[14,14,-3,-5,-6,-7,-8,14,-33,-2,-4,14,-50,-26,-27,-28,-29,-30,-31,-32,-64,-49,-52,14,14,14,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-65,-67,-68,-69,-45,-46,-47,-48,14,-66,-70,]),'PRINT':([0,2,3,5,6,7,8,11,23,24,25,26,44,45,46,47,48,49,50,51,55,79,80,89,96,97,99,103,104,105,106,107,108,109,110,112,116,119,126,127,129,130,131,132,133,136,139,140,],[17,17,-3,-5,-6,-7,-8,17,-33,-2,-4,17,-50,-26,-27,-28,-29,-30,-31,-32,-64,-49,-52,17,17,17,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-65,-67,-68,-69,-45,-46,-47,-48,17,-66,-70,]),'BREAK':([0,2,3,5,6,7,8,11,23,24,25,26,44,45,46,47,48,49,50,51,55,79,80,89,96,97,99,103,104,105,106,107,108,109,110,112,116,119,126,127,129,130,131,132,133,136,139,140,],[18,18,-3,-5,-6,-7,-8,18,-33,-2,-4,18,-50,-26,-27,-28,-29,-30,-31,-32,-64,-49,-52,18,18,18,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-65,-67,-68,-69,-45,-46,-47,-48,18,-66,-70,]),'CONTINUE':([0,2,3,5,6,7,8,11,23,24,25,26,44,45,46,47,48,49,50,51,55,79,80,89,96,97,99,103,104,105,106,107,108,109,110,112,116,119,126,127,129,130,131,132,133,136,139,140,],[19,19,-3,-5,-6,-7,-8,19,-33,-2,-4,19,-50,-26,-27,-28,-29,-30,-31,-32,-64,-49,-52,19,19,19,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-65,-67,-68,-69,-45,-46,-47,-48,19,-66,-70,]),'RETURN':([0,2,3,5,6,7,8,11,23,24,25,26,44,45,46,47,48,49,50,51,55,79,80,89,96,97,99,103,104,105,106,107,108,109,110,112,116,119,126,127,129,130,131,132,133,136,139,140,],[20,20,-3,-5,-6,-7,-8,20,-33,-2,-4,20,-50,-26,-27,-28,-29,-30,-31,-32,-64,-49,-52,20,20,20,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-65,-67,-68,-69,-45,-46,-47,-48,20,-66,-70,]),'SAVE':([0,2,3,5,6,7,8,11,23,24,25,26,44,45,46,47,48,49,50,51,55,79,80,89,96,97,99,103,104,105,106,107,108,109,110,112,116,119,126,127,129,130,131,132,133,136,139,140,],[21,21,-3,-5,-6,-7,-8,21,-33,-2,-4,21,-50,-26,-27,-28,-29,-30,-31,-32,-64,-49,-52,21,21,21,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-65,-67,-68,-69,-45,-46,-47,-48,21,-66,-70,]),'ID':([0,2,3,5,6,7,8,11,14,17,20,23,24,25,26,27,28,30,31,32,33,34,35,38,40,44,45,46,47,48,49,50,51,52,54,55,59,70,71,72,73,74,75,76,77,78,79,80,81,83,84,85,89,90,91,92,93,94,95,96,97,99,100,101,103,104,105,106,107,108,109,110,112,116,117,118,119,126,127,129,130,131,132,133,136,137,139,140,],[23,23,-3,-5,-6,-7,-8,23,23,23,23,-33,-2,-4,23,23,23,23,23,23,23,23,23,23,23,-50,-26,-27,-28,-29,-30,-31,-32,23,23,-64,23,23,23,23,23,23,23,23,23,23,-49,-52,23,23,23,23,23,23,23,23,23,23,23,23,23,-18,23,23,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,23,23,-65,-67,-68,-69,-45,-46,-47,-48,23,23,-66,-70,]),'$end':([1,2,3,5,6,7,8,24,25,55,119,126,127,139,],[0,-1,-3,-5,-6,-7,-8,-2,-4,-64,-65,-67,-68,-66,]),'}':([3,5,6,7,8,24,25,26,55,119,126,127,139,],[-3,-5,-6,-7,-8,-2,-4,55,-64,-65,-67,-68,-66,]),';':([4,9,10,18,19,23,36,37,44,45,46,47,48,49,50,51,53,65,66,67,68,69,79,80,86,87,99,102,103,104,105,106,107,108,109,110,112,116,130,131,132,133,134,138,],[25,-9,-10,-54,-55,-33,-53,-25,-50,-26,-27,-28,-29,-30,-31,-32,-56,-11,-12,-13,-14,-15,-49,-52,117,-36,-18,-24,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-45,-46,-47,-48,-35,-57,]),'ELSE':([5,6,7,8,25,55,119,126,127,139,],[-5,-6,-7,-8,-4,-64,136,-67,-68,-66,]),'(':([12,13,17,20,21,27,28,30,31,32,33,34,35,38,39,40,41,42,43,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[27,28,40,40,54,40,40,40,40,40,40,40,40,40,81,40,83,84,85,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,]),'=':([15,16,22,23,29,99,],[-16,31,-17,-33,59,-18,]),'PLUS_ASSIGN':([15,16,22,23,99,],[-16,32,-17,-33,-18,]),'MINUS_ASSIGN':([15,16,22,23,99,],[-16,33,-17,-33,-18,]),'TIMES_ASSIGN':([15,16,22,23,99,],[-16,34,-17,-33,-18,]),'DIVIDE_ASSIGN':([15,16,22,23,99,],[-16,35,-17,-33,-18,]),'[':([15,17,20,23,27,28,30,31,32,33,34,35,38,40,48,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[30,52,52,-33,52,52,52,52,52,52,52,52,52,52,30,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,]),'EYE':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,]),'ZEROS':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,]),'ONES':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,]),'LOAD':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'-':([17,20,23,27,28,30,31,32,33,34,35,37,38,40,44,45,46,47,48,49,50,51,52,53,54,57,59,62,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,88,90,91,92,93,94,95,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,120,121,122,123,124,125,129,130,131,132,133,135,137,140,],[38,38,-33,38,38,38,38,38,38,38,38,76,38,38,-50,-26,-27,-28,-29,-30,-31,-32,38,76,38,76,38,76,76,76,76,76,76,38,38,38,38,38,38,38,38,38,-49,-52,38,76,38,38,38,76,38,38,38,38,38,38,76,-18,38,38,76,-37,-38,-39,-40,-41,-42,-43,-44,76,-51,76,76,76,-34,38,38,76,76,76,76,76,76,76,-45,-46,-47,-48,76,38,76,]),'FLOAT':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,]),'INT':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,]),'STRING':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,]),'M_PLUS':([23,37,44,45,46,47,48,49,50,51,53,57,62,65,66,67,68,69,79,80,82,88,98,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,120,121,122,123,124,125,129,130,131,132,133,135,140,],[-33,71,-50,-26,-27,-28,-29,-30,-31,-32,71,71,71,71,71,71,71,71,-49,-52,71,71,71,-18,71,-37,-38,-39,-40,-41,-42,-43,-44,71,-51,71,71,71,-34,71,71,71,71,71,71,71,-45,-46,-47,-48,71,71,]),'M_MINUS':([23,37,44,45,46,47,48,49,50,51,53,57,62,65,66,67,68,69,79,80,82,88,98,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,120,121,122,123,124,125,129,130,131,132,133,135,140,],[-33,72,-50,-26,-27,-28,-29,-30,-31,-32,72,72,72,72,72,72,72,72,-49,-52,72,72,72,-18,72,-37,-38,-39,-40,-41,-42,-43,-44,72,-51,72,72,72,-34,72,72,72,72,72,72,72,-45,-46,-47,-48,72,72,]),'M_TIMES':([23,37,44,45,46,47,48,49,50,51,53,57,62,65,66,67,68,69,79,80,82,88,98,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,120,121,122,123,124,125,129,130,131,132,133,135,140,],[-33,73,-50,-26,-27,-28,-29,-30,-31,-32,73,73,73,73,73,73,73,73,-49,-52,73,73,73,-18,73,73,73,-39,-40,73,73,-43,-44,73,-51,73,73,73,-34,73,73,73,73,73,73,73,-45,-46,-47,-48,73,73,]),'M_DIVIDE':([23,37,44,45,46,47,48,49,50,51,53,57,62,65,66,67,68,69,79,80,82,88,98,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,120,121,122,123,124,125,129,130,131,132,133,135,140,],[-33,74,-50,-26,-27,-28,-29,-30,-31,-32,74,74,74,74,74,74,74,74,-49,-52,74,74,74,-18,74,74,74,-39,-40,74,74,-43,-44,74,-51,74,74,74,-34,74,74,74,74,74,74,74,-45,-46,-47,-48,74,74,]),'+':([23,37,44,45,46,47,48,49,50,51,53,57,62,65,66,67,68,69,79,80,82,88,98,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,120,121,122,123,124,125,129,130,131,132,133,135,140,],[-33,75,-50,-26,-27,-28,-29,-30,-31,-32,75,75,75,75,75,75,75,75,-49,-52,75,75,75,-18,75,-37,-38,-39,-40,-41,-42,-43,-44,75,-51,75,75,75,-34,75,75,75,75,75,75,75,-45,-46,-47,-48,75,75,]),'*':([23,37,44,45,46,47,48,49,50,51,53,57,62,65,66,67,68,69,79,80,82,88,98,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,120,121,122,123,124,125,129,130,131,132,133,135,140,],[-33,77,-50,-26,-27,-28,-29,-30,-31,-32,77,77,77,77,77,77,77,77,-49,-52,77,77,77,-18,77,77,77,-39,-40,77,77,-43,-44,77,-51,77,77,77,-34,77,77,77,77,77,77,77,-45,-46,-47,-48,77,77,]),'/':([23,37,44,45,46,47,48,49,50,51,53,57,62,65,66,67,68,69,79,80,82,88,98,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,120,121,122,123,124,125,129,130,131,132,133,135,140,],[-33,78,-50,-26,-27,-28,-29,-30,-31,-32,78,78,78,78,78,78,78,78,-49,-52,78,78,78,-18,78,78,78,-39,-40,78,78,-43,-44,78,-51,78,78,78,-34,78,78,78,78,78,78,78,-45,-46,-47,-48,78,78,]),"'":([23,37,44,45,46,47,48,49,50,51,53,57,62,65,66,67,68,69,79,80,82,88,98,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,120,121,122,123,124,125,129,130,131,132,133,135,140,],[-33,79,-50,-26,-27,-28,-29,-30,-31,-32,79,79,79,79,79,79,79,79,-49,-52,79,79,79,-18,79,79,79,79,79,79,79,79,79,79,-51,79,79,79,-34,79,79,79,79,79,79,79,-45,-46,-47,-48,79,79,]),',':([23,36,37,44,45,46,47,48,49,50,51,60,61,62,63,64,79,80,87,88,99,102,103,104,105,106,107,108,109,110,112,116,128,129,130,131,132,133,134,140,],[-33,70,-25,-50,-26,-27,-28,-29,-30,-31,-32,100,-20,-21,-22,-23,-49,-52,70,118,-18,-24,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-19,-69,-45,-46,-47,-48,70,-70,]),'<':([23,44,45,46,47,48,49,50,51,57,79,80,99,103,104,105,106,107,108,109,110,112,116,130,131,132,133,],[-33,-50,-26,-27,-28,-29,-30,-31,-32,90,-49,-52,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-45,-46,-47,-48,]),'>':([23,44,45,46,47,48,49,50,51,57,79,80,99,103,104,105,106,107,108,109,110,112,116,130,131,132,133,],[-33,-50,-26,-27,-28,-29,-30,-31,-32,91,-49,-52,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-45,-46,-47,-48,]),'EQ':([23,44,45,46,47,48,49,50,51,57,79,80,99,103,104,105,106,107,108,109,110,112,116,130,131,132,133,],[-33,-50,-26,-27,-28,-29,-30,-31,-32,92,-49,-52,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-45,-46,-47,-48,]),'NEQ':([23,44,45,46,47,48,49,50,51,57,79,80,99,103,104,105,106,107,108,109,110,112,116,130,131,132,133,],[-33,-50,-26,-27,-28,-29,-30,-31,-32,93,-49,-52,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-45,-46,-47,-48,]),'GE':([23,44,45,46,47,48,49,50,51,57,79,80,99,103,104,105,106,107,108,109,110,112,116,130,131,132,133,],[-33,-50,-26,-27,-28,-29,-30,-31,-32,94,-49,-52,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-45,-46,-47,-48,]),'LE':([23,44,45,46,47,48,49,50,51,57,79,80,99,103,104,105,106,107,108,109,110,112,116,130,131,132,133,],[-33,-50,-26,-27,-28,-29,-30,-31,-32,95,-49,-52,-18,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-45,-46,-47,-48,]),':':([23,30,44,45,46,47,48,49,50,51,62,79,80,98,99,100,103,104,105,106,107,108,109,110,112,116,129,130,131,132,133,],[-33,64,-50,-26,-27,-28,-29,-30,-31,-32,101,-49,-52,101,-18,64,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,137,-45,-46,-47,-48,]),']':([23,37,44,45,46,47,48,49,50,51,60,61,62,63,64,79,80,86,87,99,102,103,104,105,106,107,108,109,110,112,116,128,129,130,131,132,133,134,140,],[-33,-25,-50,-26,-27,-28,-29,-30,-31,-32,99,-20,-21,-22,-23,-49,-52,116,-36,-18,-24,-37,-38,-39,-40,-41,-42,-43,-44,-51,-34,-19,-69,-45,-46,-47,-48,-35,-70,]),')':([23,44,45,46,47,48,49,50,51,56,58,79,80,82,99,103,104,105,106,107,108,109,110,111,112,113,114,115,116,120,121,122,123,124,125,130,131,132,133,135,],[-33,-50,-26,-27,-28,-29,-30,-31,-32,89,96,-49,-52,112,-18,-37,-38,-39,-40,-41,-42,-43,-44,130,-51,131,132,133,-34,-58,-59,-60,-61,-62,-63,-45,-46,-47,-48,138,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'start':([0,],[1,]),'INSTRUCTIONS':([0,11,],[2,26,]),'INSTRUCTION':([0,2,11,26,89,96,97,136,],[3,24,3,24,119,126,127,139,]),'STATEMENT':([0,2,11,26,89,96,97,136,],[4,4,4,4,4,4,4,4,]),'BLOCK_STATEMENT':([0,2,11,26,89,96,97,136,],[5,5,5,5,5,5,5,5,]),'IF_STATEMENT':([0,2,11,26,89,96,97,136,],[6,6,6,6,6,6,6,6,]),'WHILE_STATEMENT':([0,2,11,26,89,96,97,136,],[7,7,7,7,7,7,7,7,]),'FOR_STATEMENT':([0,2,11,26,89,96,97,136,],[8,8,8,8,8,8,8,8,]),'ASSIGNMENT':([0,2,11,26,89,96,97,136,],[9,9,9,9,9,9,9,9,]),'KEYWORD':([0,2,11,26,89,96,97,136,],[10,10,10,10,10,10,10,10,]),'CONST_ID':([0,2,11,14,17,20,26,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,89,90,91,92,93,94,95,96,97,100,101,117,118,136,137,],[15,15,15,29,48,48,15,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,15,48,48,48,48,48,48,15,15,48,48,48,48,15,48,]),'LEFT_ASSIGNMENT':([0,2,11,26,89,96,97,136,],[16,16,16,16,16,16,16,16,]),'ACCESS':([0,2,11,17,20,26,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,89,90,91,92,93,94,95,96,97,100,101,117,118,136,137,],[22,22,22,47,47,22,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,22,47,47,47,47,47,47,22,22,47,47,47,47,22,47,]),'SEQUENCE':([17,52,117,],[36,87,134,]),'EXPRESSION':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[37,53,57,57,62,65,66,67,68,69,80,82,37,88,98,102,103,104,105,106,107,108,109,110,111,113,114,115,120,121,122,123,124,125,62,129,37,135,140,]),'VALUE':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,]),'CONST_VALUE':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,]),'MATRIX':([17,20,27,28,30,31,32,33,34,35,38,40,52,54,59,70,71,72,73,74,75,76,77,78,81,83,84,85,90,91,92,93,94,95,100,101,117,118,137,],[46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,]),'CONDITION':([27,28,],[56,58,]),'INDICES':([30,],[60,]),'INDEX':([30,100,],[61,128,]),'RANGE':([30,59,100,],[63,97,63,]),'ROWS':([52,],[86,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> start","S'",1,None,None,None),
+  ('start -> INSTRUCTIONS','start',1,'p_start','mparser.py',40),
+  ('INSTRUCTIONS -> INSTRUCTIONS INSTRUCTION','INSTRUCTIONS',2,'p_instructions','mparser.py',46),
+  ('INSTRUCTIONS -> INSTRUCTION','INSTRUCTIONS',1,'p_instructions','mparser.py',47),
+  ('INSTRUCTION -> STATEMENT ;','INSTRUCTION',2,'p_instruction','mparser.py',57),
+  ('INSTRUCTION -> BLOCK_STATEMENT','INSTRUCTION',1,'p_instruction','mparser.py',58),
+  ('INSTRUCTION -> IF_STATEMENT','INSTRUCTION',1,'p_instruction','mparser.py',59),
+  ('INSTRUCTION -> WHILE_STATEMENT','INSTRUCTION',1,'p_instruction','mparser.py',60),
+  ('INSTRUCTION -> FOR_STATEMENT','INSTRUCTION',1,'p_instruction','mparser.py',61),
+  ('STATEMENT -> ASSIGNMENT','STATEMENT',1,'p_statement','mparser.py',67),
+  ('STATEMENT -> KEYWORD','STATEMENT',1,'p_statement','mparser.py',68),
+  ('ASSIGNMENT -> LEFT_ASSIGNMENT = EXPRESSION','ASSIGNMENT',3,'p_assignment','mparser.py',74),
+  ('ASSIGNMENT -> LEFT_ASSIGNMENT PLUS_ASSIGN EXPRESSION','ASSIGNMENT',3,'p_assignment','mparser.py',75),
+  ('ASSIGNMENT -> LEFT_ASSIGNMENT MINUS_ASSIGN EXPRESSION','ASSIGNMENT',3,'p_assignment','mparser.py',76),
+  ('ASSIGNMENT -> LEFT_ASSIGNMENT TIMES_ASSIGN EXPRESSION','ASSIGNMENT',3,'p_assignment','mparser.py',77),
+  ('ASSIGNMENT -> LEFT_ASSIGNMENT DIVIDE_ASSIGN EXPRESSION','ASSIGNMENT',3,'p_assignment','mparser.py',78),
+  ('LEFT_ASSIGNMENT -> CONST_ID','LEFT_ASSIGNMENT',1,'p_left_assignment','mparser.py',84),
+  ('LEFT_ASSIGNMENT -> ACCESS','LEFT_ASSIGNMENT',1,'p_left_assignment','mparser.py',85),
+  ('ACCESS -> CONST_ID [ INDICES ]','ACCESS',4,'p_access','mparser.py',91),
+  ('INDICES -> INDICES , INDEX','INDICES',3,'p_indices','mparser.py',97),
+  ('INDICES -> INDEX','INDICES',1,'p_indices','mparser.py',98),
+  ('INDEX -> EXPRESSION','INDEX',1,'p_index','mparser.py',108),
+  ('INDEX -> RANGE','INDEX',1,'p_index','mparser.py',109),
+  ('INDEX -> :','INDEX',1,'p_index_whole','mparser.py',115),
+  ('SEQUENCE -> SEQUENCE , EXPRESSION','SEQUENCE',3,'p_sequence','mparser.py',121),
+  ('SEQUENCE -> EXPRESSION','SEQUENCE',1,'p_sequence','mparser.py',122),
+  ('VALUE -> CONST_VALUE','VALUE',1,'p_value','mparser.py',132),
+  ('VALUE -> MATRIX','VALUE',1,'p_value','mparser.py',133),
+  ('VALUE -> ACCESS','VALUE',1,'p_value','mparser.py',134),
+  ('VALUE -> CONST_ID','VALUE',1,'p_value','mparser.py',135),
+  ('CONST_VALUE -> FLOAT','CONST_VALUE',1,'p_const_value','mparser.py',141),
+  ('CONST_VALUE -> INT','CONST_VALUE',1,'p_const_value','mparser.py',142),
+  ('CONST_VALUE -> STRING','CONST_VALUE',1,'p_const_value','mparser.py',143),
+  ('CONST_ID -> ID','CONST_ID',1,'p_const_id','mparser.py',149),
+  ('MATRIX -> [ ROWS ]','MATRIX',3,'p_matrix','mparser.py',155),
+  ('ROWS -> ROWS ; SEQUENCE','ROWS',3,'p_rows','mparser.py',161),
+  ('ROWS -> SEQUENCE','ROWS',1,'p_rows','mparser.py',162),
+  ('EXPRESSION -> EXPRESSION M_PLUS EXPRESSION','EXPRESSION',3,'p_expression_matrix','mparser.py',172),
+  ('EXPRESSION -> EXPRESSION M_MINUS EXPRESSION','EXPRESSION',3,'p_expression_matrix','mparser.py',173),
+  ('EXPRESSION -> EXPRESSION M_TIMES EXPRESSION','EXPRESSION',3,'p_expression_matrix','mparser.py',174),
+  ('EXPRESSION -> EXPRESSION M_DIVIDE EXPRESSION','EXPRESSION',3,'p_expression_matrix','mparser.py',175),
+  ('EXPRESSION -> EXPRESSION + EXPRESSION','EXPRESSION',3,'p_math_math','mparser.py',181),
+  ('EXPRESSION -> EXPRESSION - EXPRESSION','EXPRESSION',3,'p_math_math','mparser.py',182),
+  ('EXPRESSION -> EXPRESSION * EXPRESSION','EXPRESSION',3,'p_math_math','mparser.py',183),
+  ('EXPRESSION -> EXPRESSION / EXPRESSION','EXPRESSION',3,'p_math_math','mparser.py',184),
+  ('EXPRESSION -> EYE ( EXPRESSION )','EXPRESSION',4,'p_expression_function','mparser.py',190),
+  ('EXPRESSION -> ZEROS ( EXPRESSION )','EXPRESSION',4,'p_expression_function','mparser.py',191),
+  ('EXPRESSION -> ONES ( EXPRESSION )','EXPRESSION',4,'p_expression_function','mparser.py',192),
+  ('EXPRESSION -> LOAD ( EXPRESSION )','EXPRESSION',4,'p_expression_function','mparser.py',193),
+  ("EXPRESSION -> EXPRESSION '",'EXPRESSION',2,'p_expression_transopse','mparser.py',199),
+  ('EXPRESSION -> VALUE','EXPRESSION',1,'p_expression_value','mparser.py',205),
+  ('EXPRESSION -> ( EXPRESSION )','EXPRESSION',3,'p_expression_group','mparser.py',211),
+  ('EXPRESSION -> - EXPRESSION','EXPRESSION',2,'p_expression_unary','mparser.py',217),
+  ('KEYWORD -> PRINT SEQUENCE','KEYWORD',2,'p_keyword','mparser.py',223),
+  ('KEYWORD -> BREAK','KEYWORD',1,'p_keyword','mparser.py',224),
+  ('KEYWORD -> CONTINUE','KEYWORD',1,'p_keyword','mparser.py',225),
+  ('KEYWORD -> RETURN EXPRESSION','KEYWORD',2,'p_keyword','mparser.py',226),
+  ('KEYWORD -> SAVE ( EXPRESSION , EXPRESSION )','KEYWORD',6,'p_keyword','mparser.py',227),
+  ('CONDITION -> EXPRESSION < EXPRESSION','CONDITION',3,'p_condition','mparser.py',243),
+  ('CONDITION -> EXPRESSION > EXPRESSION','CONDITION',3,'p_condition','mparser.py',244),
+  ('CONDITION -> EXPRESSION EQ EXPRESSION','CONDITION',3,'p_condition','mparser.py',245),
+  ('CONDITION -> EXPRESSION NEQ EXPRESSION','CONDITION',3,'p_condition','mparser.py',246),
+  ('CONDITION -> EXPRESSION GE EXPRESSION','CONDITION',3,'p_condition','mparser.py',247),
+  ('CONDITION -> EXPRESSION LE EXPRESSION','CONDITION',3,'p_condition','mparser.py',248),
+  ('BLOCK_STATEMENT -> { INSTRUCTIONS }','BLOCK_STATEMENT',3,'p_block_statement','mparser.py',254),
+  ('IF_STATEMENT -> IF ( CONDITION ) INSTRUCTION','IF_STATEMENT',5,'p_if_statement','mparser.py',260),
+  ('IF_STATEMENT -> IF ( CONDITION ) INSTRUCTION ELSE INSTRUCTION','IF_STATEMENT',7,'p_if_statement','mparser.py',261),
+  ('WHILE_STATEMENT -> WHILE ( CONDITION ) INSTRUCTION','WHILE_STATEMENT',5,'p_while_statement','mparser.py',270),
+  ('FOR_STATEMENT -> FOR CONST_ID = RANGE INSTRUCTION','FOR_STATEMENT',5,'p_for_statement','mparser.py',276),
+  ('RANGE -> EXPRESSION : EXPRESSION','RANGE',3,'p_range','mparser.py',282),
+  ('RANGE -> EXPRESSION : EXPRESSION : EXPRESSION','RANGE',5,'p_range','mparser.py',283),
+]
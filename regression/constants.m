@@ -0,0 +1,5 @@
+# constants that compare equal but print differently
+x = 0.0;
+print x, -0.0, 0, 0.0 * -1;
+y = -0.0;
+print y, 1 / 2, 0.5;
@@ -0,0 +1,12 @@
+# constant expressions and the statements that can never run
+a = 2 * 3 + -(4 - 1);
+if (1 < 2) { print "yes", a; } else { print "no"; }
+if (2 < 1) print "never";
+if (1 == 1) { b = 7; print b; }
+while (0 > 1) { print "x"; }
+for i = 1:3 {
+    if (i == 2) { continue; print "dead"; }
+    print i, 10 / 4, "s" + "t", 7 - 2 * 3;
+    break;
+    print "dead";
+}
@@ -0,0 +1,14 @@
+# chains of element-wise operators, fused or evaluated one at a time
+A = [1, 2; 3, 4];
+B = [5, 6; 7, 8];
+C = [1.5, 2; 0.5, 4];
+print A .+ B .* C ./ A;
+print (A .- B) .* (B .+ A), A .+ B .+ A .+ B;
+D = eye(2) .+ A .* eye(2);
+print D;
+E = zeros(2) .+ zeros(2) .* B;
+print E;
+for i = 1:2 {
+    F = A .* B .+ A .* [i, i; i, i];
+    print F;
+}
@@ -0,0 +1,20 @@
+# loop invariant expressions, and loops that never run the code they hoist
+N = 4;
+K = 3;
+for i = 1:N {
+    for j = i:N {
+        E = eye(K);
+        T = E' .+ ones(K);
+        v = i * 2 + N / 4;
+        w = [N, K; K, N];
+        if (j > N - 2) print i, j, v, T[1, 1], w[0, 1];
+    }
+}
+k = 3;
+while (k > 0) {
+    k = k - 1;
+    z = K * N + k;
+    print k, z, K * N;
+}
+for q = 1:0 { print q * N, eye(q); }
+print "end";
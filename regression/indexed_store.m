@@ -0,0 +1,10 @@
+# the same expression in the index and the value of an indexed store
+A = [1, 2; 3, 4];
+i = 0;
+A[i + 1, 0] = i + 1;
+print A;
+B = [1, 2, 3; 4, 5, 6; 7, 8, 9];
+j = 1;
+B[j, j * 2] += j * 2;
+B[j * 2, j * 2] = j * 2 + B[j * 2, 0];
+print B;
@@ -0,0 +1,94 @@
+import glob
+import io
+import itertools
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import ast
+from main import ENGINES, parse
+from Session import Session, optimize
+from Output import Output
+from Arena import flatten
+from Optimizer import Optimizer
+
+# every script here runs on every engine with the optimizer on and off, from the parsed
+# nodes and from the arena, and each run has to print exactly what name.out holds; a
+# difference is a miscompilation. Flattened, with and without the optimizer, its arena
+# may only annotate nodes with plain values: a child node or list kept there holds on
+# to the whole parsed tree
+
+# the statements constant folding has to report removed; an if it only keeps for the
+# frame its taken branch writes into is not one of them
+REMOVED = {
+    'folding.m': 5,
+}
+
+
+def output(text, engine, optimize, arena):
+    stream = io.StringIO()
+    session = Session(engine, optimize, Output(stream))
+    try:
+        program = parse(text)
+        if arena:
+            program = flatten(program).tree()
+        if not session.run(program):
+            return 'type check failed\n'
+    except Exception as e:
+        stream.write('{0}: {1}\n'.format(type(e).__name__, e))
+    return stream.getvalue()
+
+
+def leaked_annotations(text, optimized):
+    tree = parse(text)
+    if optimized:
+        tree = optimize(tree)
+    arena = flatten(tree)
+    return sorted(name for name, values in arena.annotations.items()
+                  if any(isinstance(value, (ast.Node, list)) for value in values))
+
+
+def removed_statements(text):
+    optimizer = Optimizer()
+    optimizer.optimize(parse(text))
+    return optimizer.removed
+
+
+def main():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    names = sys.argv[1:] or sorted(glob.glob(os.path.join(directory, '*.m')))
+    failed = 0
+    for name in names:
+        with open(name) as file:
+            text = file.read()
+        with open(os.path.splitext(name)[0] + '.out') as file:
+            expected = file.read()
+        for engine in ENGINES:
+            for optimize, arena in itertools.product((False, True), repeat=2):
+                actual = output(text, engine, optimize, arena)
+                if actual != expected:
+                    failed += 1
+                    print("FAIL {0} --engine {1}{2}{3}".format(
+                        os.path.basename(name), engine, '' if optimize else ' --no-optimize', ' --arena' if arena else ''))
+                    print("  expected {0!r}\n  got      {1!r}".format(expected, actual))
+        for optimized in (False, True):
+            leaked = leaked_annotations(text, optimized)
+            if leaked:
+                failed += 1
+                print("FAIL {0} --arena{1}: nodes kept as annotations {2}".format(
+                    os.path.basename(name), '' if optimized else ' --no-optimize', ', '.join(leaked)))
+        expected = REMOVED.get(os.path.basename(name))
+        if expected is not None:
+            removed = removed_statements(text)
+            if removed != expected:
+                failed += 1
+                print("FAIL {0}: {1} statements removed, not {2}".format(os.path.basename(name), removed, expected))
+    print("{0} scripts, {1} failed runs".format(len(names), failed))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+# repeated subexpressions, with and without a write to their operands in between
+A = [1, 2; 3, 4];
+B = [5, 6; 7, 8];
+x = A .* B;
+y = A .* B .+ A;
+print x, y;
+if (A .* B == x) { print "same", A .* B; }
+A = B;
+print A .* B;
+k = 0;
+while (k + 1 < 4) {
+    print k + 1, k + 1;
+    k = k + 1;
+}
+m = 3;
+if (m > 2) { m = m + 1; print m * 2; } else { print m * 2; }
+print m * 2, m * 2;
+C = [1, 2, 3; 4, 5, 6; 7, 8, 9];
+n = 1;
+C[n + 1, n + 1] = C[n + 1, n] + n + 1;
+n = 0;
+C[n + 1, n] = n + 1;
+print C;
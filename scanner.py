@@ -1,5 +1,9 @@
+import os
+
 import ply.lex as lex
 
+TABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 class Scanner:
     reserved = {
@@ -13,6 +17,8 @@ class Scanner:
         'eye': 'EYE',
         'zeros': 'ZEROS',
         'ones': 'ONES',
+        'load': 'LOAD',
+        'save': 'SAVE',
         'print': 'PRINT'
     }
 
@@ -56,7 +62,7 @@ class Scanner:
     t_ignore = ' \t\r'
 
     def __init__(self):
-        self.lexer = lex.lex(object=self)
+        self.lexer = lex.lex(object=self, optimize=True, lextab='lextab', outputdir=TABLES_DIR)
 
     def t_ignore_COMMENT(self, t):
         r'\#.*'
@@ -95,5 +101,7 @@ class Scanner:
         return self.lexer.token()
 
     def find_column(self, token):
+        if hasattr(token, 'column'):
+            return token.column
         line_start = self.lexer.lexdata.rfind('\n', 0, token.lexpos) + 1
         return (token.lexpos - line_start) + 1
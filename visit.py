@@ -1,15 +1,15 @@
 # visit.py
 # Updated 2013-06-20 to fix bug on line 38
 
-import inspect
+import sys
 
-__all__ = ['on', 'when']
+__all__ = ['on', 'when', 'method_table']
 
 
 def on(param_name):
     def f(fn):
         dispatcher = Dispatcher(param_name, fn)
-        return dispatcher
+        return dispatcher.dispatch
 
     return f
 
@@ -17,42 +17,68 @@ def on(param_name):
 def when(param_type):
     # f - actual decorator
     # fn - decorated method, i.e. visit
-    # ff - fn gets replaced by ff in the effect of applying @when decorator
-    # dispatcher is an function object
+    # registration happens once, while the class body runs; the name bound
+    # in the class stays the dispatch function created by @on
     def f(fn):
-        frame = inspect.currentframe().f_back
-        dispatcher = frame.f_locals[fn.__name__]
-        if not isinstance(dispatcher, Dispatcher):
-            dispatcher = dispatcher.dispatcher
-        dispatcher.add_target(param_type, fn)
+        dispatch = sys._getframe(1).f_locals[fn.__name__]
+        dispatch.dispatcher.add_target(param_type, fn)
+        return dispatch
 
-        def ff(*args, **kw):
-            return dispatcher(*args, **kw)
+    return f
 
-        ff.dispatcher = dispatcher
-        return ff
 
-    return f
+class DispatchTable(dict):
+    # maps a concrete class to its handler; a miss is resolved once through the MRO
+    def __init__(self, resolve):
+        super(DispatchTable, self).__init__()
+        self.resolve = resolve
+
+    def __missing__(self, typ):
+        handler = self.resolve(typ)
+        self[typ] = handler
+        return handler
 
 
 class Dispatcher(object):
     def __init__(self, param_name, fn):
-        frame = inspect.currentframe().f_back.f_back  # these 2 lines
-        top_level = frame.f_locals == frame.f_globals  # seem redundant
-        self.param_index = inspect.getargspec(fn).args.index(param_name)
+        self.param_index = fn.__code__.co_varnames.index(param_name)
         self.param_name = param_name
+        self.default = fn
         self.targets = {}
+        self.table = DispatchTable(self.resolve)
+        self.dispatch = self.make_dispatch()
+
+    def resolve(self, typ):
+        for klass in typ.__mro__:
+            target = self.targets.get(klass)
+            if target is not None:
+                return target
+        return self.default
 
-    def __call__(self, *args, **kw):
-        typ = args[self.param_index].__class__
-        d = self.targets.get(typ)
-        if d is not None:
-            return d(*args, **kw)
+    def make_dispatch(self):
+        table = self.table
+        index = self.param_index
+        if index == 1:
+            def dispatch(self, node):
+                return table[node.__class__](self, node)
         else:
-            issub = issubclass
-            t = self.targets
-            ks = t.iterkeys()
-            return [t[k](*args, **kw) for k in ks if issub(typ, k)]
+            def dispatch(*args, **kw):
+                return table[args[index].__class__](*args, **kw)
+        dispatch.dispatcher = self
+        return dispatch
 
     def add_target(self, typ, target):
         self.targets[typ] = target
+        self.table.clear()
+
+
+def method_table(cls, prefix, default):
+    # NodeVisitor style: handler for class X is the method named prefix + 'X'
+    def resolve(typ):
+        for klass in typ.__mro__:
+            method = getattr(cls, prefix + klass.__name__, None)
+            if method is not None:
+                return method
+        return default
+
+    return DispatchTable(resolve)